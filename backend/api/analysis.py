@@ -8,10 +8,9 @@ import asyncio
 from ccxt.base.errors import BadSymbol
 from google.api_core.exceptions import ResourceExhausted
 
-from core import agent as core_agent, app_config
+from core import agent as core_agent, app_config, llm_cache
 from tools import (
-    _get_technical_indicators_logic, 
-    get_price_with_cache, 
+    async_exchange,
     _get_unified_symbol,
     get_latest_crypto_news,
     get_twitter_sentiment
@@ -28,14 +27,14 @@ async def perform_new_analysis(request: NewAnalysisRequest):
     unified_symbol = _get_unified_symbol(request.symbol)
     logging.info(f"API: Yeni analiz isteği alındı - Sembol: {unified_symbol}, Zaman Aralığı: {request.timeframe}")
     try:
-        current_price = await asyncio.to_thread(get_price_with_cache, unified_symbol)
+        current_price = await async_exchange.get_price_with_cache(unified_symbol)
         if current_price is None:
             raise HTTPException(status_code=404, detail=f"Fiyat bilgisi alınamadı: {unified_symbol}")
             
         use_news = app_config.settings.get('USE_NEWSAPI', False) or app_config.settings.get('USE_CRYPTOCOMPARE_NEWS', False)
         use_sentiment = app_config.settings.get('PROACTIVE_SCAN_USE_SENTIMENT', False)
 
-        entry_indicators_task = asyncio.to_thread(_get_technical_indicators_logic, unified_symbol, request.timeframe)
+        entry_indicators_task = async_exchange.get_technical_indicators(unified_symbol, request.timeframe)
         news_task = asyncio.to_thread(get_latest_crypto_news, unified_symbol) if use_news else asyncio.sleep(0, result=[])
         sentiment_task = asyncio.to_thread(get_twitter_sentiment, unified_symbol) if use_sentiment else asyncio.sleep(0, result={})
 
@@ -58,20 +57,25 @@ async def perform_new_analysis(request: NewAnalysisRequest):
                 news_headlines=news_headlines,
                 sentiment_score=sentiment_data.get("score", 0.0)
             )
+            fingerprint = llm_cache.fingerprint("holistic", unified_symbol, request.timeframe, entry_indicators_result["data"],
+                                                news_headlines, extra={"sentiment": sentiment_data.get("score", 0.0)})
         else:
             logging.info("Manuel Analiz: Sadece teknik analiz tetiklendi.")
             use_mta = app_config.settings.get('USE_MTA_ANALYSIS', True)
             trend_timeframe = app_config.settings.get('MTA_TREND_TIMEFRAME', '4h')
             
             if use_mta and request.timeframe != trend_timeframe:
-                trend_indicators_result = await asyncio.to_thread(_get_technical_indicators_logic, unified_symbol, trend_timeframe)
+                trend_indicators_result = await async_exchange.get_technical_indicators(unified_symbol, trend_timeframe)
                 if trend_indicators_result.get("status") != "success":
                     raise HTTPException(status_code=400, detail=f"Trend analizi ({trend_timeframe}) için veri alınamadı: {trend_indicators_result.get('message')}")
                 final_prompt = core_agent.create_mta_analysis_prompt(unified_symbol, current_price, request.timeframe, entry_indicators_result["data"], trend_timeframe, trend_indicators_result["data"])
+                fingerprint = llm_cache.fingerprint("mta", unified_symbol, request.timeframe, entry_indicators_result["data"],
+                                                    extra={"trend_timeframe": trend_timeframe, "trend_indicators": trend_indicators_result["data"]})
             else:
                 final_prompt = core_agent.create_final_analysis_prompt(unified_symbol, request.timeframe, current_price, entry_indicators_result["data"])
+                fingerprint = llm_cache.fingerprint("single", unified_symbol, request.timeframe, entry_indicators_result["data"])
         
-        result = await asyncio.to_thread(core_agent.llm_invoke_with_fallback, final_prompt)
+        result = await asyncio.to_thread(core_agent.llm_invoke_with_fallback, final_prompt, fingerprint)
         
         parsed_data = core_agent.parse_agent_response(result.content)
         if not parsed_data:
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import Field
+import asyncio
 import logging
 
 # YENİ: Borsa bağlantısını doğrudan kontrol etmek yerine modülü import ediyoruz
@@ -53,7 +54,9 @@ async def run_backtest(
             preset=preset_data
         )
         
-        results = backtester.run(
+        # Veri çekme ve sinyal üretimi senkron ve CPU yoğundur; olay döngüsünü bekletmemesi için thread'de çalışır.
+        results = await asyncio.to_thread(
+            backtester.run,
             symbol=request_data.symbol,
             interval=request_data.interval,
             start_date=request_data.start_date,
@@ -3,6 +3,7 @@
 # @author: Memba Co.
 # ==============================================================================
 import logging
+import asyncio
 from fastapi import APIRouter, HTTPException, Query
 from datetime import datetime, timedelta
 
@@ -25,8 +26,8 @@ async def get_ohlcv_data(
     """
     logging.info(f"API: OHLCV verisi isteği alındı - Sembol: {symbol}, Zaman Aralığı: {timeframe}")
     try:
-        # ccxt'den veriyi çek
-        bars = exchange_tools.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        # Kapanmış mumlar yerel depodan, eksikler borsadan tamamlanır
+        bars = await asyncio.to_thread(exchange_tools.get_ohlcv_with_store, symbol, timeframe, limit)
         if not bars:
             return []
 
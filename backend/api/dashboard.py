@@ -13,7 +13,8 @@ import pandas as pd
 import numpy as np
 
 import database
-from core import agent as core_agent
+from core import agent as core_agent, cache_manager, concurrency, llm_budget, llm_cache, universe
+from tools import rate_limiter
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -128,3 +129,13 @@ async def get_system_events(limit: int = 50):
     except Exception as e:
         logging.error(f"Sistem olayları alınırken hata: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Loglar alınırken bir hata oluştu.")
+
+@router.get("/cache-stats", summary="Önbellek ve istek limiti istatistiklerini al")
+async def get_cache_stats():
+    """
+    Önbelleğin ad alanı bazında isabet/ıska/atılma sayaçlarını, istek limiti ve LLM bütçesi
+    durumunu, LLM yanıt önbelleğinin prompt türü bazında isabet sayılarını ve eşzamanlılık
+    havuzlarının aktif/bekleyen iş sayılarıyla bekleme sürelerini döndürür.
+    """
+    return {"cache": cache_manager.get_stats(), "rate_limiter": rate_limiter.get_stats(),
+            "llm_budget": llm_budget.get_stats(), "llm_cache": llm_cache.get_stats(), "concurrency": concurrency.get_stats(), "universe": universe.get_stats()}
@@ -9,14 +9,11 @@ import asyncio
 from google.api_core.exceptions import ResourceExhausted
 
 import database
-from tools.exchange import (
-    _get_technical_indicators_logic,
-    get_price_with_cache, 
-    _get_unified_symbol
-)
+from tools import async_exchange
+from tools.exchange import _get_unified_symbol
 from core.trader import open_new_trade, close_existing_trade, TradeException
 from core.position_manager import refresh_single_position_pnl
-from core import agent as core_agent
+from core import agent as core_agent, llm_cache
 
 router = APIRouter(
     prefix="/positions",
@@ -40,11 +37,12 @@ async def get_all_positions():
     try:
         managed_positions = database.get_all_positions()
         updated_positions = []
+        prices = await async_exchange.get_prices([pos["symbol"] for pos in managed_positions])
 
         for pos in managed_positions:
             pos_dict = dict(pos)
             try:
-                current_price = await asyncio.to_thread(get_price_with_cache, pos_dict["symbol"])
+                current_price = prices.get(pos_dict["symbol"])
                 
                 if current_price is not None:
                     pos_dict['current_price'] = current_price
@@ -120,14 +118,14 @@ async def reanalyze_position(symbol: str):
         raise HTTPException(status_code=404, detail=f"Yönetilen pozisyon bulunamadı: {unified_symbol}")
     
     try:
-        current_price = await asyncio.to_thread(get_price_with_cache, unified_symbol)
+        current_price = await async_exchange.get_price_with_cache(unified_symbol)
         if current_price is None:
             raise HTTPException(status_code=503, detail=f"Yeniden analiz için {unified_symbol} fiyatı alınamadı.")
 
         timeframe = position_to_manage.get('timeframe', '15m')
         
         # DÜZELTME: Parametreler artık ayrı ayrı gönderiliyor
-        indicators_result = await asyncio.to_thread(_get_technical_indicators_logic, unified_symbol, timeframe)
+        indicators_result = await async_exchange.get_technical_indicators(unified_symbol, timeframe)
         if indicators_result.get("status") != "success":
             raise HTTPException(status_code=503, detail=f"Yeniden analiz için göstergeler alınamadı: {indicators_result.get('message')}")
         
@@ -137,7 +135,8 @@ async def reanalyze_position(symbol: str):
             indicators=indicators_result['data']
         )
 
-        result = await asyncio.to_thread(core_agent.llm_invoke_with_fallback, reanalysis_prompt)
+        fingerprint = llm_cache.reanalysis_fingerprint(position_to_manage, indicators_result['data'], current_price)
+        result = await asyncio.to_thread(core_agent.llm_invoke_with_fallback, reanalysis_prompt, fingerprint)
         parsed_data = core_agent.parse_agent_response(result.content)
         
         if not parsed_data or "recommendation" not in parsed_data:
@@ -219,17 +218,18 @@ async def reanalyze_all_positions_endpoint():
     async def analyze_task(position):
         try:
             # DÜZELTME: Bu kısımdaki çağrı da güncellenmeli
-            current_price = await asyncio.to_thread(get_price_with_cache, position['symbol'])
+            current_price = await async_exchange.get_price_with_cache(position['symbol'])
             if not current_price:
                  return {"symbol": position['symbol'], "recommendation": "HATA", "reason": "Fiyat alınamadı."}
             
             timeframe = position.get('timeframe', '15m')
-            indicators = await asyncio.to_thread(_get_technical_indicators_logic, position['symbol'], timeframe)
+            indicators = await async_exchange.get_technical_indicators(position['symbol'], timeframe)
             if indicators.get('status') != 'success':
                  return {"symbol": position['symbol'], "recommendation": "HATA", "reason": f"Gösterge alınamadı: {indicators.get('message')}"}
 
             reanalysis_prompt = core_agent.create_reanalysis_prompt(position, current_price, indicators['data'])
-            result = await asyncio.to_thread(core_agent.llm_invoke_with_fallback, reanalysis_prompt)
+            fingerprint = llm_cache.reanalysis_fingerprint(position, indicators['data'], current_price)
+            result = await asyncio.to_thread(core_agent.llm_invoke_with_fallback, reanalysis_prompt, fingerprint)
             parsed_data = core_agent.parse_agent_response(result.content)
             
             if parsed_data:
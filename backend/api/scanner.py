@@ -1,13 +1,15 @@
 # api/scanner.py
 # @author: Memba Co.
 
+import json
+import asyncio
 import logging
 from urllib.parse import unquote
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from core import scanner as core_scanner
 import database
-# DÜZELTME: LangChain aracını değil, doğrudan mantık fonksiyonunu import ediyoruz
-from tools.exchange import _get_technical_indicators_logic
+from tools import async_exchange
 from tools.utils import _get_unified_symbol
 
 router = APIRouter(
@@ -59,6 +61,35 @@ async def run_proactive_scan():
         logging.error(f"Proaktif tarama API'sinde hata: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Proaktif tarama sırasında sunucu hatası: {str(e)}")
 
+# Bağlantının proxy'ler tarafından kapatılmaması için olay yokken gönderilen yorum satırı aralığı (sn).
+STREAM_KEEPALIVE_SECONDS = 15
+
+@router.get("/stream", summary="Stream proactive scan events (SSE)")
+async def stream_scan_events(request: Request):
+    """
+    Proaktif tarama olaylarını Server-Sent Events olarak yayınlar. Manuel veya
+    zamanlanmış her taramada 'scan_started', ön filtreden geçen her aday için
+    'candidate', analizi biten her aday için 'result' ve sonunda özetle birlikte
+    'scan_completed' olayı gönderilir. Böylece ilk fırsat, taramanın tamamı
+    beklenmeden arayüze ulaşır.
+    """
+    queue = core_scanner.subscribe()
+
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['event']}\ndata: {json.dumps(message['data'], default=str)}\n\n"
+        finally:
+            core_scanner.unsubscribe(queue)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @router.post("/candidates/{symbol:path}/refresh", summary="Tek bir adayın verilerini yenile")
 async def refresh_single_candidate(symbol: str):
     """
@@ -79,7 +110,7 @@ async def refresh_single_candidate(symbol: str):
         
         # --- DÜZELTME: Fonksiyon çağrısı artık ayrı parametrelerle yapılıyor ---
         # Bu, 'ValidationError: timeframe Field required' hatasını çözer.
-        indicators_result = _get_technical_indicators_logic(unified_symbol, timeframe)
+        indicators_result = await async_exchange.get_technical_indicators(unified_symbol, timeframe)
 
         if indicators_result.get("status") != "success":
             raise HTTPException(status_code=400, detail=f"{unified_symbol} için göstergeler alınamadı: {indicators_result.get('message')}")
@@ -1,14 +1,17 @@
 # backend/api/settings.py
 # @author: Memba Co.
 
+import os
 import logging
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional, List
 
 import database
-from core import app_config, scanner, agent, position_manager
+from core import app_config, scanner, agent, position_manager, compute_pool, concurrency, universe
 from config_defaults import default_settings
+from tools import price_feed
+from tools.utils import str_to_bool
 
 router = APIRouter(
     prefix="/settings",
@@ -26,6 +29,7 @@ class SettingsUpdate(BaseModel):
     DEFAULT_ORDER_TYPE: Optional[str] = None
     USE_MTA_ANALYSIS: Optional[bool] = None
     MTA_TREND_TIMEFRAME: Optional[str] = None
+    MTA_LOCAL_RESAMPLE_ENABLED: Optional[bool] = None
     LEVERAGE: Optional[float] = None
     RISK_PER_TRADE_PERCENT: Optional[float] = None
     MAX_CONCURRENT_TRADES: Optional[int] = None
@@ -53,11 +57,15 @@ class SettingsUpdate(BaseModel):
     USE_BAILOUT_EXIT: Optional[bool] = None
     BAILOUT_ARM_LOSS_PERCENT: Optional[float] = None
     BAILOUT_RECOVERY_PERCENT: Optional[float] = None
+    USE_WEBSOCKET_PRICE_FEED: Optional[bool] = None
     POSITION_CHECK_INTERVAL_SECONDS: Optional[int] = None
     ORPHAN_ORDER_CHECK_INTERVAL_SECONDS: Optional[int] = None
     POSITION_SYNC_INTERVAL_SECONDS: Optional[int] = None
     PROACTIVE_SCAN_ENABLED: Optional[bool] = None
     PROACTIVE_SCAN_INTERVAL_SECONDS: Optional[int] = None
+    PROACTIVE_SCAN_ALIGN_TO_CANDLE_CLOSE: Optional[bool] = None
+    PROACTIVE_SCAN_CLOSE_DELAY_SECONDS: Optional[int] = None
+    PROACTIVE_SCAN_CLOSE_JITTER_SECONDS: Optional[int] = None
     PROACTIVE_SCAN_AUTO_CONFIRM: Optional[bool] = None
     PROACTIVE_SCAN_IN_LOOP: Optional[bool] = None
     PROACTIVE_SCAN_USE_GAINERS_LOSERS: Optional[bool] = None
@@ -74,7 +82,10 @@ class SettingsUpdate(BaseModel):
     PROACTIVE_SCAN_VOLUME_TIMEFRAME: Optional[str] = None
     PROACTIVE_SCAN_VOLUME_MULTIPLIER: Optional[float] = None
     PROACTIVE_SCAN_VOLUME_PERIOD: Optional[int] = None
+    UNIVERSE_INDEX_ENABLED: Optional[bool] = None
+    UNIVERSE_REFRESH_INTERVAL_SECONDS: Optional[int] = None
     PROACTIVE_SCAN_PREFILTER_ENABLED: Optional[bool] = None
+    PROACTIVE_SCAN_BATCH_PREFILTER: Optional[bool] = None
     PROACTIVE_SCAN_RSI_LOWER: Optional[int] = None
     PROACTIVE_SCAN_RSI_UPPER: Optional[int] = None
     PROACTIVE_SCAN_ADX_THRESHOLD: Optional[int] = None
@@ -86,6 +97,21 @@ class SettingsUpdate(BaseModel):
     PROACTIVE_SCAN_USE_VOLUME_FILTER: Optional[bool] = None
     PROACTIVE_SCAN_VOLUME_AVG_PERIOD: Optional[int] = None
     PROACTIVE_SCAN_VOLUME_CONFIRM_MULTIPLIER: Optional[float] = None
+    PROACTIVE_SCAN_MAX_LLM_CANDIDATES: Optional[int] = None
+    PROACTIVE_SCAN_RANK_ADMIT_SCORE: Optional[float] = None
+    PROACTIVE_SCAN_RANK_WINDOW_SECONDS: Optional[float] = None
+    LLM_CALLS_PER_MINUTE: Optional[int] = None
+    LLM_CALLS_PER_DAY: Optional[int] = None
+    LLM_BUDGET_RESERVE_CALLS: Optional[int] = None
+    LLM_CACHE_ENABLED: Optional[bool] = None
+    LLM_CACHE_TTL_SECONDS: Optional[int] = None
+    CONCURRENCY_EXCHANGE_LIMIT: Optional[int] = None
+    CONCURRENCY_LLM_LIMIT: Optional[int] = None
+    CONCURRENCY_NEWS_LIMIT: Optional[int] = None
+    CONCURRENCY_TWITTER_LIMIT: Optional[int] = None
+    CONCURRENCY_DISCOVERY_LIMIT: Optional[int] = None
+    COMPUTE_PROCESS_POOL_ENABLED: Optional[bool] = None
+    COMPUTE_PROCESS_WORKERS: Optional[int] = None
     INTERACTIVE_SCAN_USE_HOLISTIC_ANALYSIS: Optional[bool] = None
     PROACTIVE_SCAN_USE_SENTIMENT: Optional[bool] = None
     USE_NEWSAPI: Optional[bool] = None
@@ -99,6 +125,21 @@ def reschedule_jobs(scheduler, new_settings: dict):
             agent.initialize_agent()
             logging.info("Gemini modeli veya yedek listesi değişti. AI ajanı yeni ayarlarla yeniden başlatıldı.")
             
+        if any(key.startswith('CONCURRENCY_') for key in new_settings):
+            concurrency.reset()
+
+        if 'COMPUTE_PROCESS_POOL_ENABLED' in new_settings or 'COMPUTE_PROCESS_WORKERS' in new_settings:
+            # Havuz yeni işçi sayısıyla yeniden kurulur; kapatıldıysa hesaplamalar bu süreçte yapılır.
+            compute_pool.shutdown()
+            compute_pool.start()
+
+        if 'USE_WEBSOCKET_PRICE_FEED' in new_settings:
+            if new_settings['USE_WEBSOCKET_PRICE_FEED'] and app_config.settings.get('DEFAULT_MARKET_TYPE') == 'future':
+                price_feed.start(str_to_bool(os.getenv("USE_TESTNET", "False")))
+            else:
+                price_feed.stop()
+            logging.info(f"WebSocket fiyat akışı ayarı güncellendi: {new_settings['USE_WEBSOCKET_PRICE_FEED']}")
+
         if 'POSITION_CHECK_INTERVAL_SECONDS' in new_settings:
             scheduler.reschedule_job(
                 "position_checker_job",
@@ -123,18 +164,18 @@ def reschedule_jobs(scheduler, new_settings: dict):
             )
             logging.info(f"Pozisyon senkronizasyon görevi yeni interval ile yeniden zamanlandı: {new_settings['POSITION_SYNC_INTERVAL_SECONDS']} saniye.")
 
-        if 'PROACTIVE_SCAN_ENABLED' in new_settings or 'PROACTIVE_SCAN_INTERVAL_SECONDS' in new_settings:
+        if any(key in new_settings for key in ('UNIVERSE_INDEX_ENABLED', 'UNIVERSE_REFRESH_INTERVAL_SECONDS', 'PROACTIVE_SCAN_ENABLED')):
+            # Dizin tarayıcıyla birlikte açılıp kapanır.
+            universe.schedule_refresh_job(scheduler)
+
+        scan_schedule_keys = ('PROACTIVE_SCAN_ENABLED', 'PROACTIVE_SCAN_INTERVAL_SECONDS', 'PROACTIVE_SCAN_ENTRY_TIMEFRAME',
+                              'PROACTIVE_SCAN_ALIGN_TO_CANDLE_CLOSE', 'PROACTIVE_SCAN_CLOSE_DELAY_SECONDS', 'PROACTIVE_SCAN_CLOSE_JITTER_SECONDS')
+        if any(key in new_settings for key in scan_schedule_keys):
             scanner_job = scheduler.get_job("scanner_job")
             is_enabled = app_config.settings['PROACTIVE_SCAN_ENABLED']
-            interval = app_config.settings['PROACTIVE_SCAN_INTERVAL_SECONDS']
 
             if is_enabled:
-                if scanner_job:
-                    scheduler.reschedule_job("scanner_job", trigger="interval", seconds=interval)
-                    logging.info(f"Tarayıcı görevi yeni interval ile yeniden zamanlandı: {interval} saniye.")
-                else:
-                    scheduler.add_job(scanner.execute_single_scan_cycle, "interval", seconds=interval, id="scanner_job", max_instances=1)
-                    logging.info("Tarayıcı görevi etkinleştirildi ve zamanlandı.")
+                scanner.schedule_scan_job(scheduler)
             elif scanner_job:
                 scheduler.remove_job("scanner_job")
                 logging.info("Tarayıcı görevi devre dışı bırakıldı ve kaldırıldı.")
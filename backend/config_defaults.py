@@ -20,6 +20,7 @@ default_settings = {
     # === TEMEL STRATEJİ AYARLARI ===
     "USE_MTA_ANALYSIS": True,
     "MTA_TREND_TIMEFRAME": "4h",
+    "MTA_LOCAL_RESAMPLE_ENABLED": True,  # Üst zaman dilimi mumları mümkünse depodaki alt zaman dilimi mumlarından üretilir.
     "DEFAULT_ORDER_TYPE": 'LIMIT',
     "DEFAULT_MARKET_TYPE": 'future',
     "LEVERAGE": 10.0,
@@ -59,11 +60,15 @@ default_settings = {
 
     # (Diğer ayarlarınız burada devam ediyor...)
     # === OTOMASYON & TARAYICI AYARLARI ===
+    "USE_WEBSOCKET_PRICE_FEED": True,           # Anlık fiyatlar Binance WebSocket akışından okunur, REST yedek olarak kalır.
     "POSITION_CHECK_INTERVAL_SECONDS": 60,
     "ORPHAN_ORDER_CHECK_INTERVAL_SECONDS": 300,
     "PROACTIVE_SCAN_ENABLED": False,
     "POSITION_SYNC_INTERVAL_SECONDS": 300,
     "PROACTIVE_SCAN_INTERVAL_SECONDS": 900,
+    "PROACTIVE_SCAN_ALIGN_TO_CANDLE_CLOSE": False,  # Tarama sabit aralık yerine giriş zaman dilimindeki her mum kapanışında çalışır.
+    "PROACTIVE_SCAN_CLOSE_DELAY_SECONDS": 5,        # Mum kapanışından sonra, borsanın mumu yayınlaması için beklenen süre.
+    "PROACTIVE_SCAN_CLOSE_JITTER_SECONDS": 3,       # Gecikmeye eklenen en fazla rastgele süre.
     "PROACTIVE_SCAN_AUTO_CONFIRM": False,
     "PROACTIVE_SCAN_IN_LOOP": True,
     "PROACTIVE_SCAN_USE_GAINERS_LOSERS": True,
@@ -82,8 +87,13 @@ default_settings = {
     "PROACTIVE_SCAN_VOLUME_MULTIPLIER": 5.0,
     "PROACTIVE_SCAN_VOLUME_PERIOD": 24,
 
+    # --- Piyasa Evreni Dizini ---
+    "UNIVERSE_INDEX_ENABLED": True,               # Tarayıcı açıkken aday keşfi ve ön filtre, arka planda güncellenen sembol dizininden okunur.
+    "UNIVERSE_REFRESH_INTERVAL_SECONDS": 60,
+
     # --- AI Öncesi Filtreleme Ayarları ---
     "PROACTIVE_SCAN_PREFILTER_ENABLED": True,
+    "PROACTIVE_SCAN_BATCH_PREFILTER": True,       # Tüm adayların göstergeleri tek bir vektörel geçişte hesaplanır.
     "PROACTIVE_SCAN_RSI_LOWER": 38,
     "PROACTIVE_SCAN_RSI_UPPER": 62,
     "PROACTIVE_SCAN_ADX_THRESHOLD": 18,
@@ -95,6 +105,27 @@ default_settings = {
     "PROACTIVE_SCAN_USE_VOLUME_FILTER": True,     
     "PROACTIVE_SCAN_VOLUME_AVG_PERIOD": 20,       
     "PROACTIVE_SCAN_VOLUME_CONFIRM_MULTIPLIER": 1.2, 
+
+    # --- AI Analizi Bütçesi ---
+    "PROACTIVE_SCAN_MAX_LLM_CANDIDATES": 10,      # Bir döngüde sıralamada en üstte kalan en fazla bu kadar aday AI'a gönderilir.
+    "PROACTIVE_SCAN_RANK_ADMIT_SCORE": 0.75,      # Sıralama puanı bu değeri geçen aday diğer adaylar beklenmeden AI'a gönderilir.
+    "PROACTIVE_SCAN_RANK_WINDOW_SECONDS": 2.0,    # Eşiği geçemeyen adaylar daha iyisi için en fazla bu kadar bekler.
+    "LLM_CALLS_PER_MINUTE": 15,                   # Modelin dakikalık istek kotası.
+    "LLM_CALLS_PER_DAY": 1500,                    # Modelin günlük istek kotası.
+    "LLM_BUDGET_RESERVE_CALLS": 3,                # Pozisyon yönetimi analizleri için tarayıcının kullanmayacağı pay.
+    "LLM_CACHE_ENABLED": True,                    # Aynı mum ve göstergelerle sorulan aynı soru için önbellekteki AI yanıtı kullanılır.
+    "LLM_CACHE_TTL_SECONDS": 900,                 # Önbellekteki AI yanıtının en uzun geçerlilik süresi.
+
+    # --- Eşzamanlılık Havuzları (kaynak başına en fazla eşzamanlı iş) ---
+    "CONCURRENCY_EXCHANGE_LIMIT": 20,             # Borsa REST istekleri (istek ağırlığı ayrıca 'rate_limiter' ile sınırlanır).
+    "CONCURRENCY_LLM_LIMIT": 4,                   # AI modeli çağrıları.
+    "CONCURRENCY_NEWS_LIMIT": 5,                  # NewsAPI / CryptoPanic istekleri.
+    "CONCURRENCY_TWITTER_LIMIT": 3,               # Twitter (X) duyarlılık istekleri.
+    "CONCURRENCY_DISCOVERY_LIMIT": 4,             # TAAPI ve CoinGecko keşif kaynakları.
+
+    # --- Hesaplama Süreç Havuzu ---
+    "COMPUTE_PROCESS_POOL_ENABLED": False,        # Toplu ön filtre göstergeleri ve backtest sinyalleri ayrı süreçlerde hesaplanır.
+    "COMPUTE_PROCESS_WORKERS": 0,                 # İşçi süreç sayısı; 0 ise CPU çekirdek sayısı kadar.
     
     # Harici Keşif Kaynakları Ayarları
     "DISCOVERY_USE_TAAPI_SCANNER": True,       
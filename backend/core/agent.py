@@ -5,10 +5,11 @@ import os
 import json
 import logging
 from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import AIMessage
 from google.api_core.exceptions import ResourceExhausted
 from typing import Any
 
-from core import app_config
+from core import app_config, llm_budget, llm_cache
 
 # --- Global Değişkenler ---
 llm = None
@@ -81,16 +82,34 @@ def initialize_agent():
     os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT") or "Gemini Trading Agent"
     _initialize_model_list_and_llm()
 
-def llm_invoke_with_fallback(prompt: str):
+def llm_invoke_with_fallback(prompt: str, fingerprint: dict | None = None):
     """
     LLM'i çağırır ve kota hatası durumunda otomatik olarak model değiştirip tekrar dener.
+    'fingerprint' verilirse ('llm_cache.fingerprint') aynı soru için önbellekteki yanıt
+    modele gidilmeden döndürülür; geçerli yeni yanıtlar önbelleğe yazılır.
     """
+    if not fingerprint or not llm_cache.is_enabled():
+        return _invoke_with_fallback(prompt)
+
+    with llm_cache.lock_for(fingerprint):
+        cached = llm_cache.get(fingerprint)
+        if cached is not None:
+            logging.info(f"LLM önbelleği isabeti: {fingerprint['symbol']} ({fingerprint['type']})")
+            return AIMessage(content=cached)
+        result = _invoke_with_fallback(prompt)
+        # Ayrıştırılamayan yanıtlar saklanmaz; aynı soru bir sonraki seferde tekrar sorulur.
+        if isinstance(result.content, str) and parse_agent_response(result.content):
+            llm_cache.put(fingerprint, result.content)
+        return result
+
+def _invoke_with_fallback(prompt: str):
     if not llm:
         raise Exception("LLM örneği başlatılamadı. Lütfen yapılandırmayı kontrol edin.")
 
     max_retries = len(model_fallback_list)
     for attempt in range(max_retries):
         try:
+            llm_budget.record_call()
             return llm.invoke(prompt)
         except ResourceExhausted as e:
             logging.warning(f"Kota hatası ({model_fallback_list[current_model_index]}): {e}")
@@ -100,6 +119,7 @@ def llm_invoke_with_fallback(prompt: str):
                     raise Exception("Tüm modellere geçiş denendi ancak LLM başlatılamadı.")
             else:
                 logging.critical("Tüm modellerin kotaları denendi ve hepsi başarısız oldu.")
+                llm_budget.mark_exhausted()
                 raise e
         except Exception as e:
             logging.error(f"LLM çağrısı sırasında beklenmedik hata: {e}", exc_info=True)
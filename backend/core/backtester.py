@@ -3,9 +3,50 @@
 import pandas as pd
 import numpy as np
 import logging
-import time
 import pandas_ta as ta # pandas-ta kütüphanesi eklendi
-from tools import exchange as exchange_tools
+from tools import exchange as exchange_tools, rate_limiter
+from core import compute_pool
+
+def generate_signals(df: pd.DataFrame, preset: dict) -> pd.Series:
+    """
+    Tüm DataFrame için vektörel olarak sinyal üretir. Süreç havuzundaki işçiler de
+    çağırabildiği için sınıftan bağımsızdır.
+    NOT: Bu fonksiyon, scanner'daki tekil sinyal üreten fonksiyonlardan farklıdır.
+    """
+    signals = pd.Series('NEUTRAL', index=df.index, name="signals")
+
+    # Hareketli Ortalama Kesişim Stratejisi
+    if preset.get('ma_short') and preset.get('ma_long'):
+        short_window = preset['ma_short']
+        long_window = preset['ma_long']
+
+        ma_short = df.ta.sma(length=short_window)
+        ma_long = df.ta.sma(length=long_window)
+
+        # Golden Cross (Al Sinyali)
+        buy_signals = (ma_short > ma_long) & (ma_short.shift(1) <= ma_long.shift(1))
+        signals.loc[buy_signals] = 'BUY'
+
+        # Death Cross (Sat Sinyali)
+        sell_signals = (ma_short < ma_long) & (ma_short.shift(1) >= ma_long.shift(1))
+        signals.loc[sell_signals] = 'SELL'
+
+    # RSI Stratejisi (MA sinyallerinin üzerine yazabilir)
+    if preset.get('rsi_period'):
+        rsi_period = preset['rsi_period']
+        rsi_overbought = preset.get('rsi_overbought', 70)
+        rsi_oversold = preset.get('rsi_oversold', 30)
+
+        rsi = df.ta.rsi(length=rsi_period)
+        if rsi is not None:
+            # RSI Aşırı Satım (Al Sinyali)
+            signals.loc[rsi < rsi_oversold] = 'BUY'
+            # RSI Aşırı Alım (Sat Sinyali)
+            signals.loc[rsi > rsi_overbought] = 'SELL'
+
+    # İleriye dönük bakma hatasını (lookahead bias) önlemek için sinyalleri bir bar kaydır.
+    return signals.shift(1).fillna('NEUTRAL')
+
 
 class Backtester:
     def __init__(self, initial_balance: float, preset: dict):
@@ -18,22 +59,17 @@ class Backtester:
         if not self.exchange:
             raise ConnectionError("Backtester başlatılamadı: Borsa bağlantısı mevcut değil. Sunucu başlangıç loglarını kontrol edin.")
 
+    @rate_limiter.with_priority(rate_limiter.PRIORITY_BACKTEST)
     def _fetch_historical_data(self, symbol, interval, start_date, end_date):
         """Tüm tarih aralığını kapsayacak şekilde geçmiş OHLCV verilerini bir döngü içinde çeker."""
         try:
             since = self.exchange.parse8601(f"{start_date}T00:00:00Z")
             end_ts = self.exchange.parse8601(f"{end_date}T23:59:59Z")
-            all_bars = []
             
             logging.info(f"{symbol} için {start_date} ve {end_date} arası geçmiş veriler çekiliyor...")
             
-            while since < end_ts:
-                bars = self.exchange.fetch_ohlcv(symbol, timeframe=interval, since=since, limit=500)
-                if not bars:
-                    break
-                all_bars.extend(bars)
-                since = bars[-1][0] + 1 
-                time.sleep(self.exchange.rateLimit / 1000)
+            # Yerel mum deposunda bulunan kısım diskten okunur, sadece eksik aralıklar borsadan çekilir.
+            all_bars = exchange_tools.get_ohlcv_range(symbol, interval, since, end_ts)
 
             if not all_bars:
                 return None
@@ -69,43 +105,8 @@ class Backtester:
         return final_results
 
     def _generate_signals(self, df: pd.DataFrame) -> pd.Series:
-        """
-        Tüm DataFrame için vektörel olarak sinyal üretir.
-        NOT: Bu fonksiyon, scanner'daki tekil sinyal üreten fonksiyonlardan farklıdır.
-        """
-        signals = pd.Series('NEUTRAL', index=df.index, name="signals")
-
-        # Hareketli Ortalama Kesişim Stratejisi
-        if self.preset.get('ma_short') and self.preset.get('ma_long'):
-            short_window = self.preset['ma_short']
-            long_window = self.preset['ma_long']
-            
-            ma_short = df.ta.sma(length=short_window)
-            ma_long = df.ta.sma(length=long_window)
-            
-            # Golden Cross (Al Sinyali)
-            buy_signals = (ma_short > ma_long) & (ma_short.shift(1) <= ma_long.shift(1))
-            signals.loc[buy_signals] = 'BUY'
-            
-            # Death Cross (Sat Sinyali)
-            sell_signals = (ma_short < ma_long) & (ma_short.shift(1) >= ma_long.shift(1))
-            signals.loc[sell_signals] = 'SELL'
-
-        # RSI Stratejisi (MA sinyallerinin üzerine yazabilir)
-        if self.preset.get('rsi_period'):
-            rsi_period = self.preset['rsi_period']
-            rsi_overbought = self.preset.get('rsi_overbought', 70)
-            rsi_oversold = self.preset.get('rsi_oversold', 30)
-
-            rsi = df.ta.rsi(length=rsi_period)
-            if rsi is not None:
-                # RSI Aşırı Satım (Al Sinyali)
-                signals.loc[rsi < rsi_oversold] = 'BUY'
-                # RSI Aşırı Alım (Sat Sinyali)
-                signals.loc[rsi > rsi_overbought] = 'SELL'
-
-        # İleriye dönük bakma hatasını (lookahead bias) önlemek için sinyalleri bir bar kaydır.
-        return signals.shift(1).fillna('NEUTRAL')
+        """Sinyalleri, etkinse hesaplama süreç havuzunda üretir."""
+        return compute_pool.generate_signals(df, self.preset)
 
 
     def _simulate_trades(self, df: pd.DataFrame, symbol: str) -> dict:
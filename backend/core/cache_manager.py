@@ -2,18 +2,181 @@
 # File: backend/core/cache_manager.py
 # @author: Memba Co.
 # ==============================================================================
-# Bu modül, sık istenen veriler için basit bir bellek-içi (in-memory)
-# önbellekleme mekanizması sağlar. Özellikle teknik analiz verileri gibi
-# sık çekilen ama anlık değişmeyen veriler için API kullanımını azaltır.
+# Bu modül, sık istenen veriler için bellek-içi (in-memory) bir önbellek sağlar.
+# Önbellek boyutu MAX_CACHE_ENTRIES ile sınırlıdır; dolduğunda en uzun süredir
+# kullanılmayan kayıt (LRU) atılır. Süresi dolan kayıtlar sadece okunduklarında
+# değil, okuma ve yazmalarda belirli aralıklarla yapılan bir tarama ile de
+# temizlenir. Tüm işlemler bir kilitle korunur; önbellek thread havuzundaki
+# işçilerden güvenle kullanılabilir.
+#
+# Anahtarın ilk '_' karakterine kadarki kısmı ad alanıdır (örn. 'price_BTC/USDT' ->
+# 'price'). Her ad alanının kendi varsayılan TTL'i ve isabet/ıska/atılma sayaçları
+# vardır; TTL'ler 'get_stats' çıktısındaki gerçek isabet oranlarına göre ayarlanabilir.
+#
+# Bayat-iken-yenile (stale-while-revalidate): 'get_or_refresh' ile okunan bir kaydın
+# süresi dolmuş ama ad alanının tolerans penceresi (NAMESPACE_STALE_GRACE) içindeyse
+# eski değer hemen döndürülür ve arka planda tek bir yenileme başlatılır. Tolerans
+# penceresi tanımlanmamış ad alanları (örn. güvenlik açısından kritik 'price') her
+# zaman katı sürelidir.
+#
+# 'SHARED_CACHE_ENABLED' ortam değişkeni açıksa her yazma ayrıca 'shared_cache'
+# katmanına (süreçler arası paylaşılan SQLite dosyası) yapılır; süreç içi katmanda
+# bulunmayan veya süresi dolan anahtarlar önce oradan aranır. Paylaşılan katmana
+# yazmalar tek bir arka plan işçisinde sırayla yapılır; okumalar olay döngüsü
+# üzerinde hiç yapılmaz ('get_or_refresh_async' okumayı bir thread'de yapar).
+# Çok kısa ömürlü ad alanları (LOCAL_ONLY_NAMESPACES) sadece süreç içinde tutulur.
 # ==============================================================================
 
 import time
+import asyncio
 import logging
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-# Önbellek verilerini, zaman damgalarını ve yaşam sürelerini tutacak olan sözlük.
-_cache = {}
+from core import shared_cache
+
+# Önbellekte tutulacak en fazla kayıt sayısı.
+MAX_CACHE_ENTRIES = 5000
+# Süresi dolmuş kayıtların toplu olarak temizlenme aralığı (sn).
+SWEEP_INTERVAL_SECONDS = 60
 # Varsayılan genel TTL, eğer özel bir süre belirtilmezse kullanılır.
 DEFAULT_CACHE_TTL = 180
+# Ad alanı bazında varsayılan TTL'ler (sn).
+NAMESPACE_TTLS = {
+    "price": 5,
+    "indicators": 180,
+    "sentiment": 600,
+    "screener": 900,
+    "trending": 1800,
+}
+
+# Süresi dolduktan sonra bayat değerin sunulabileceği ek süre (sn). Burada olmayan
+# ad alanları (örn. 'price') katı süreye tabidir.
+NAMESPACE_STALE_GRACE = {
+    "indicators": 300,
+    "sentiment": 1800,
+    "screener": 1800,
+    "trending": 3600,
+}
+
+# Başarısız veya boş sonuçların hata türüne göre önbellekte tutulma süreleri (sn).
+# Bilinen hatalar (listelenmeyen sembol, yetersiz veri, boş yanıt) bu süre boyunca
+# tekrar denenmez; tür belirtilmeyen hatalar için 'error' süresi kullanılır.
+NEGATIVE_TTLS = {
+    "not_listed": 3600,
+    "insufficient_data": 900,
+    "no_data": 300,
+    "empty": 300,
+    "rate_limited": 120,
+    "error": 30,
+}
+NEGATIVE_PREFIX = "negative_"
+
+# Paylaşılan katmana hiç yazılmayan ad alanları; ömürleri SQLite gidiş-dönüşüne değmez.
+LOCAL_ONLY_NAMESPACES = {"price"}
+
+# anahtar -> (değer, son kullanma zamanı, bayat sunulabileceği son zaman).
+# Sıralama, kullanım sırasını (LRU) tutar.
+_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_lock = threading.Lock()
+_last_sweep = time.monotonic()
+_stats: dict[str, dict[str, int]] = {}
+# Arka planda yenilenmekte olan anahtarlar; aynı anahtar için tek yenileme yapılır.
+_refreshing: set = set()
+# Olay döngüsündeki yenileme görevlerinin referansları (çöp toplayıcıya karşı).
+_refresh_tasks: set = set()
+# Paylaşılan katmana yazma/silme işlemleri; tek işçi, sırayı korur.
+_shared_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-cache")
+# Senkron arka plan yenilemeleri; her yenileme için yeni bir thread açılmaz.
+REFRESH_WORKERS = 4
+_refresh_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="cache-refresh")
+
+
+def _namespace(key: str) -> str:
+    return key.split('_', 1)[0]
+
+
+def _count(namespace: str, counter: str, amount: int = 1):
+    counters = _stats.setdefault(namespace, {"hits": 0, "stale_hits": 0, "shared_hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0})
+    counters[counter] += amount
+
+
+def _put_locked(key: str, entry: tuple):
+    _cache[key] = entry
+    _cache.move_to_end(key)
+    while len(_cache) > MAX_CACHE_ENTRIES:
+        evicted_key, _ = _cache.popitem(last=False)
+        _count(_namespace(evicted_key), "evictions")
+
+
+def _uses_shared(key: str) -> bool:
+    return shared_cache.ENABLED and _namespace(key) not in LOCAL_ONLY_NAMESPACES
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _submit_shared(fn, *args):
+    try:
+        _shared_writer.submit(fn, *args)
+    except RuntimeError:
+        # Yorumlayıcı kapanırken havuz yeni iş kabul etmez; paylaşılan katman isteğe bağlıdır.
+        pass
+
+
+def _fill_from_shared(key: str):
+    """
+    Süreç içi kayıt yoksa veya süresi dolmuşsa, paylaşılan katmandaki daha yeni kaydı
+    süreç içi katmana alır. Paylaşılan katmanın zamanları duvar saatine göredir.
+    Olay döngüsü üzerinden çağrıldığında SQLite'a gidilmez; sadece süreç içi katman kullanılır.
+    """
+    if not _uses_shared(key) or _on_event_loop():
+        return
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+    if entry is not None and entry[1] > now:
+        return
+    shared = shared_cache.get(key)
+    if shared is None:
+        return
+    value, expires_at, stale_until = shared
+    offset = now - time.time()
+    shared_entry = (value, expires_at + offset, stale_until + offset)
+    with _lock:
+        current = _cache.get(key)
+        if current is None or current[1] < shared_entry[1]:
+            _put_locked(key, shared_entry)
+            _count(_namespace(key), "shared_hits")
+
+
+def _sweep_locked(now: float):
+    global _last_sweep
+    expired = [key for key, (_, _, stale_until) in _cache.items() if stale_until <= now]
+    for key in expired:
+        del _cache[key]
+        _count(_namespace(key), "expirations")
+    _last_sweep = now
+    if expired:
+        logging.debug(f"Önbellek taraması: {len(expired)} süresi dolmuş kayıt temizlendi.")
+
+
+def _sweep_if_due_locked(now: float):
+    """Son taramadan bu yana SWEEP_INTERVAL_SECONDS geçtiyse tarar; her okuma ve yazmada çağrılır."""
+    if now - _last_sweep < SWEEP_INTERVAL_SECONDS:
+        return
+    _sweep_locked(now)
+    if shared_cache.ENABLED:
+        # Sadece kuyruğa eklenir; SQLite taraması yazma işçisinde yapılır.
+        _submit_shared(shared_cache.sweep)
+
 
 def get(key: str):
     """
@@ -21,35 +184,181 @@ def get(key: str):
     Veri mevcutsa ve yaşam süresi (TTL) dolmamışsa veriyi döndürür.
     Aksi takdirde None döndürür.
     """
-    if key not in _cache:
-        return None
-
-    # --- DÜZELTME BAŞLANGICI ---
-    # Artık her kaydın kendi TTL değerini de saklıyoruz.
-    data, timestamp, ttl = _cache[key]
-    
-    # Her kaydın kendi TTL değerine göre kontrol yapılıyor.
-    if (time.time() - timestamp) > ttl:
-        # Yaşam süresi dolmuş, anahtarı önbellekten temizle
-        logging.debug(f"Önbellek süresi doldu: '{key}'")
-        del _cache[key]
-        return None
-    # --- DÜZELTME SONU ---
-        
+    namespace = _namespace(key)
+    _fill_from_shared(key)
+    with _lock:
+        now = time.monotonic()
+        _sweep_if_due_locked(now)
+        entry = _cache.get(key)
+        if entry is None:
+            _count(namespace, "misses")
+            return None
+
+        value, expires_at, stale_until = entry
+        if expires_at <= now:
+            logging.debug(f"Önbellek süresi doldu: '{key}'")
+            if stale_until <= now:
+                del _cache[key]
+                _count(namespace, "expirations")
+            _count(namespace, "misses")
+            return None
+
+        _cache.move_to_end(key)
+        _count(namespace, "hits")
     logging.debug(f"Önbellekten okundu: '{key}'")
-    return data
+    return value
+
 
 def set(key: str, value: any, ttl: int = None):
     """
-    Bir anahtar/değer çiftini, belirtilen yaşam süresi (ttl) ile birlikte
-    önbelleğe ekler. Eğer ttl belirtilmezse, varsayılan TTL kullanılır.
+    Bir anahtar/değer çiftini önbelleğe ekler. 'ttl' belirtilmezse anahtarın ad alanına
+    ait TTL, o da yoksa varsayılan TTL kullanılır. Önbellek doluysa en eski kayıt atılır.
     """
-    # --- DÜZELTME BAŞLANGICI ---
-    # Fonksiyon artık 'ttl' adında bir argüman kabul ediyor.
-    # Eğer bir ttl sağlanmazsa, varsayılan değeri kullan.
-    effective_ttl = ttl if ttl is not None else DEFAULT_CACHE_TTL
-    
+    namespace = _namespace(key)
+    effective_ttl = ttl if ttl is not None else NAMESPACE_TTLS.get(namespace, DEFAULT_CACHE_TTL)
+    now = time.monotonic()
+
+    grace = NAMESPACE_STALE_GRACE.get(namespace, 0)
+
+    with _lock:
+        _sweep_if_due_locked(now)
+        _put_locked(key, (value, now + effective_ttl, now + effective_ttl + grace))
+        _count(namespace, "sets")
+
+    if _uses_shared(key):
+        wall_now = time.time()
+        _submit_shared(shared_cache.set, key, value, wall_now + effective_ttl, wall_now + effective_ttl + grace)
     logging.debug(f"Önbelleğe yazıldı: '{key}' (TTL: {effective_ttl}s)")
-    # Veriyle birlikte timestamp ve TTL'i de sakla.
-    _cache[key] = (value, time.time(), effective_ttl)
-    # --- DÜZELTME SONU ---
\ No newline at end of file
+
+
+def _lookup_for_refresh(key: str) -> tuple[str, any]:
+    """
+    Kaydın durumunu döndürür: 'fresh', 'stale' (bayat değer sunulur, yenileme zaten
+    sürüyor), 'revalidate' (bayat değer sunulur, yenilemeyi çağıran başlatır) veya 'miss'.
+    """
+    namespace = _namespace(key)
+    _fill_from_shared(key)
+    with _lock:
+        now = time.monotonic()
+        _sweep_if_due_locked(now)
+        entry = _cache.get(key)
+        if entry is not None:
+            value, expires_at, stale_until = entry
+            if expires_at > now:
+                _cache.move_to_end(key)
+                _count(namespace, "hits")
+                return "fresh", value
+            if stale_until > now:
+                _cache.move_to_end(key)
+                _count(namespace, "stale_hits")
+                if key in _refreshing:
+                    return "stale", value
+                _refreshing.add(key)
+                return "revalidate", value
+        _count(namespace, "misses")
+        return "miss", None
+
+
+def _store_result(key: str, value, ttl: int | None, cacheable):
+    if value is not None and (cacheable is None or cacheable(value)):
+        set(key, value, ttl)
+
+
+def _refresh_in_background(key: str, loader, ttl: int | None, cacheable):
+    try:
+        _store_result(key, loader(), ttl, cacheable)
+    except Exception as e:
+        logging.warning(f"Önbellek arka plan yenilemesi başarısız ('{key}'): {e}")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def get_or_refresh(key: str, loader, ttl: int = None, cacheable=None):
+    """
+    Anahtar taze ise değeri döndürür. Süresi dolmuş ama tolerans penceresindeyse eski
+    değeri hemen döndürür ve 'loader' fonksiyonunu arka plandaki yenileme havuzunda bir kez çalıştırır.
+    Kayıt yoksa 'loader' senkron çağrılır. Sonuç, None değilse ve 'cacheable'
+    (verilmişse) True döndürürse önbelleğe yazılır.
+    """
+    state, value = _lookup_for_refresh(key)
+    if state == "revalidate":
+        context = contextvars.copy_context()
+        _refresh_executor.submit(context.run, _refresh_in_background, key, loader, ttl, cacheable)
+    if state != "miss":
+        return value
+    value = loader()
+    _store_result(key, value, ttl, cacheable)
+    return value
+
+
+async def _refresh_in_background_async(key: str, loader, ttl: int | None, cacheable):
+    try:
+        _store_result(key, await loader(), ttl, cacheable)
+    except Exception as e:
+        logging.warning(f"Önbellek arka plan yenilemesi başarısız ('{key}'): {e}")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+async def get_or_refresh_async(key: str, loader, ttl: int = None, cacheable=None):
+    """'get_or_refresh' fonksiyonunun asenkron karşılığı; 'loader' bir coroutine fonksiyonudur."""
+    if _uses_shared(key):
+        await asyncio.to_thread(_fill_from_shared, key)
+    state, value = _lookup_for_refresh(key)
+    if state == "revalidate":
+        task = asyncio.create_task(_refresh_in_background_async(key, loader, ttl, cacheable))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+    if state != "miss":
+        return value
+    value = await loader()
+    _store_result(key, value, ttl, cacheable)
+    return value
+
+
+def get_negative(key: str):
+    """Anahtar için kaydedilmiş bilinen bir hata/boş sonuç varsa onu döndürür."""
+    return get(NEGATIVE_PREFIX + key)
+
+
+def set_negative(key: str, value: any, reason: str):
+    """Başarısız veya boş bir sonucu, hata türüne ait kısa süreyle önbelleğe ekler."""
+    set(NEGATIVE_PREFIX + key, value, ttl=NEGATIVE_TTLS.get(reason, NEGATIVE_TTLS["error"]))
+
+
+def delete(key: str):
+    """Bir anahtarı önbellekten siler."""
+    with _lock:
+        _cache.pop(key, None)
+    if _uses_shared(key):
+        _submit_shared(shared_cache.delete, key)
+
+
+def sweep():
+    """Süresi dolmuş tüm kayıtları hemen temizler."""
+    with _lock:
+        _sweep_locked(time.monotonic())
+    if shared_cache.ENABLED:
+        _submit_shared(shared_cache.sweep)
+
+
+def get_stats() -> dict:
+    """Önbellek doluluğunu ve ad alanı bazında isabet/ıska/atılma sayaçlarını döndürür."""
+    with _lock:
+        sizes: dict[str, int] = {}
+        for key in _cache:
+            namespace = _namespace(key)
+            sizes[namespace] = sizes.get(namespace, 0) + 1
+        namespaces = {}
+        for namespace, counters in _stats.items():
+            lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+            namespaces[namespace] = {
+                **counters,
+                "entries": sizes.get(namespace, 0),
+                "hit_rate": round((counters["hits"] + counters["stale_hits"]) / lookups, 4) if lookups else None,
+                "ttl": NAMESPACE_TTLS.get(namespace, DEFAULT_CACHE_TTL),
+                "stale_grace": NAMESPACE_STALE_GRACE.get(namespace, 0),
+            }
+        return {"entries": len(_cache), "max_entries": MAX_CACHE_ENTRIES, "shared_tier": shared_cache.ENABLED, "namespaces": namespaces}
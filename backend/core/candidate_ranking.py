@@ -0,0 +1,84 @@
+# backend/core/candidate_ranking.py
+# @author: Memba Co.
+# Bu modül, ön filtreden geçen proaktif tarama adaylarını AI analizine gönderilmeden
+# önce puanlar. Puan; gösterge aşırılığı (RSI'ın bant dışına taşması, ADX gücü),
+# hacim patlaması oranı, adayın geldiği kaynağın güvenilirliği ve sembolün ne kadar
+# süredir analiz edilmediği (tazelik) bileşenlerinin ağırlıklı toplamıdır. Her bileşen
+# 0-1 aralığındadır, dolayısıyla toplam puan da 0-1 aralığında kalır.
+
+import time
+
+RANK_WEIGHTS = {
+    "extremity": 0.4,
+    "volume": 0.25,
+    "source": 0.2,
+    "freshness": 0.15,
+}
+
+SOURCE_CONFIDENCE = {
+    "Whitelist": 1.0,
+    "Volume Spike": 0.8,
+    "Gainers/Losers": 0.7,
+    "Technical Screener": 0.6,
+    "Social Trend": 0.4,
+}
+DEFAULT_SOURCE_CONFIDENCE = 0.5
+
+# Hacim/ortalama hacim oranı bu değere ulaştığında hacim bileşeni tam puan alır.
+FULL_VOLUME_RATIO = 5.0
+# ADX bu değere ulaştığında trend gücü bileşeni tam puan alır.
+FULL_ADX = 50.0
+
+# Sembol adına son AI analizinin zamanı ('time.time()'); tazelik bileşeni için kullanılır.
+_last_analyzed: dict[str, float] = {}
+
+
+def _clip(value: float) -> float:
+    return min(max(value, 0.0), 1.0)
+
+
+def _extremity(indicators: dict, config: dict) -> float:
+    rsi, adx = indicators.get("RSI"), indicators.get("ADX")
+    if rsi is None or adx is None:
+        return 0.0
+    rsi_lower = config.get('PROACTIVE_SCAN_RSI_LOWER', 35)
+    rsi_upper = config.get('PROACTIVE_SCAN_RSI_UPPER', 65)
+    if rsi < rsi_lower:
+        rsi_score = (rsi_lower - rsi) / max(rsi_lower, 1)
+    elif rsi > rsi_upper:
+        rsi_score = (rsi - rsi_upper) / max(100 - rsi_upper, 1)
+    else:
+        rsi_score = 0.0
+    return (_clip(rsi_score) + _clip(adx / FULL_ADX)) / 2
+
+
+def _volume(indicators: dict) -> float:
+    volume, average = indicators.get("volume"), indicators.get("VOLUME_EMA")
+    if not volume or not average:
+        return 0.0
+    return _clip((volume / average - 1.0) / (FULL_VOLUME_RATIO - 1.0))
+
+
+def _freshness(symbol: str, config: dict) -> float:
+    last = _last_analyzed.get(symbol)
+    if last is None:
+        return 1.0
+    # Son birkaç döngüde analiz edilmiş bir sembol, yeni bir sembole göre daha az öncelik alır.
+    horizon = config.get('PROACTIVE_SCAN_INTERVAL_SECONDS', 900) * 4
+    return _clip((time.time() - last) / horizon)
+
+
+def score(candidate: dict, config: dict) -> float:
+    """Adayın 0-1 aralığındaki sıralama puanını döndürür. Göstergesi olmayan adaylar sadece kaynak ve tazelikten puan alır."""
+    indicators = candidate.get("indicators") or {}
+    components = {
+        "extremity": _extremity(indicators, config),
+        "volume": _volume(indicators),
+        "source": SOURCE_CONFIDENCE.get(candidate.get("source"), DEFAULT_SOURCE_CONFIDENCE),
+        "freshness": _freshness(candidate["symbol"], config),
+    }
+    return sum(RANK_WEIGHTS[name] * value for name, value in components.items())
+
+
+def mark_analyzed(symbol: str):
+    _last_analyzed[symbol] = time.time()
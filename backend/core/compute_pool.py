@@ -0,0 +1,152 @@
+# backend/core/compute_pool.py
+# @author: Memba Co.
+# Bu modül, CPU yoğun gösterge ve sinyal hesaplamalarını isteğe bağlı olarak ayrı
+# süreçlerde (ProcessPoolExecutor) çalıştırır. numpy/pandas/pandas_ta kodu GIL'i
+# tuttuğundan thread havuzunda çalıştırmak çekirdekleri kullanmaz ve tarama sırasında
+# olay döngüsünü (dolayısıyla API'yi) yavaşlatır.
+#
+# OHLCV verisi işçi süreçlere pickle ile kopyalanmaz; tek bir paylaşılan bellek
+# (shared_memory) bloğuna yazılır ve işçi süreç bu bloğu numpy dizisi olarak okur.
+# İşçilere sadece blok adı ve boyutu gönderilir; geri dönen sonuçlar küçüktür.
+#
+# 'COMPUTE_PROCESS_POOL_ENABLED' kapalıysa veya havuz bozulursa hesaplamalar eskisi
+# gibi aynı süreçte yapılır.
+
+import os
+import asyncio
+import logging
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from core import app_config
+
+_OHLCV_KEYS = ("open", "high", "low", "close", "volume")
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return bool(app_config.settings.get('COMPUTE_PROCESS_POOL_ENABLED', False))
+
+
+def _worker_count() -> int:
+    return app_config.settings.get('COMPUTE_PROCESS_WORKERS') or os.cpu_count() or 1
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = _worker_count()
+            # Ana süreçte çalışan thread'ler (fiyat akışı, zamanlayıcı) nedeniyle 'fork' yerine 'spawn' kullanılır.
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            logging.info(f"Hesaplama süreç havuzu {workers} işçi ile başlatıldı.")
+        return _executor
+
+
+def start():
+    """Havuzu oluşturur ve işçilerin modülleri önceden yüklemesini sağlar."""
+    if not is_enabled():
+        return
+    executor = _get_executor()
+    for _ in range(_worker_count()):
+        executor.submit(_warm_up_worker)
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+            logging.info("Hesaplama süreç havuzu kapatıldı.")
+
+
+def _share(matrix: np.ndarray) -> shared_memory.SharedMemory:
+    """
+    Diziyi yeni bir paylaşılan bellek bloğuna kopyalar. Blok, çağıran tarafından serbest
+    bırakılır: işçiler ana sürecin kaynak takipçisini paylaştığından bloğu sadece kapatır,
+    silme (unlink) ana süreçte yapılır.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    np.ndarray(matrix.shape, dtype=np.float64, buffer=block.buf)[...] = matrix
+    return block
+
+
+def _warm_up_worker():
+    from tools import batch_indicators  # noqa: F401
+    from core import backtester  # noqa: F401
+
+
+def _batch_indicators_worker(name: str, shape: tuple, params: tuple) -> dict:
+    from tools import batch_indicators
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        result = batch_indicators.compute_batch({key: matrix[i] for i, key in enumerate(_OHLCV_KEYS)}, params)
+        # Sonuçtaki bazı diziler paylaşılan bloğa bakan görünümlerdir; blok kapanmadan önce kopyalanır.
+        result = {key: np.array(value) for key, value in result.items()}
+        del matrix
+        return result
+    finally:
+        block.close()
+
+
+def _signals_worker(name: str, shape: tuple, preset: dict) -> np.ndarray:
+    from core import backtester
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        df = pd.DataFrame(matrix[1:].T.copy(), columns=list(_OHLCV_KEYS),
+                          index=pd.to_datetime(matrix[0].astype(np.int64), unit='ms'))
+        del matrix
+        return backtester.generate_signals(df, preset).to_numpy()
+    finally:
+        block.close()
+
+
+async def compute_batch(arrays: dict, params: tuple) -> dict:
+    """'batch_indicators.compute_batch' hesaplamasını süreç havuzunda (kapalıysa bir thread'de) yapar."""
+    from tools import batch_indicators
+    if is_enabled():
+        matrix = np.stack([arrays[key] for key in _OHLCV_KEYS])
+        block = _share(matrix)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                _get_executor(), _batch_indicators_worker, block.name, matrix.shape, params)
+        except BrokenProcessPool as e:
+            logging.error(f"Hesaplama süreç havuzu bozuldu, hesaplama bu süreçte yapılacak: {e}")
+            shutdown()
+        finally:
+            block.close()
+            block.unlink()
+    return await asyncio.to_thread(batch_indicators.compute_batch, arrays, params)
+
+
+def generate_signals(df: pd.DataFrame, preset: dict) -> pd.Series:
+    """
+    Backtest sinyallerini süreç havuzunda (kapalıysa bu süreçte) üretir. Senkron çalışır;
+    olay döngüsünden değil, bir thread'den çağrılmalıdır.
+    """
+    from core import backtester
+    if is_enabled():
+        timestamps = df.index.asi8 // 1_000_000
+        matrix = np.vstack([timestamps.astype(np.float64)] + [df[key].to_numpy(dtype=np.float64) for key in _OHLCV_KEYS])
+        block = _share(matrix)
+        try:
+            values = _get_executor().submit(_signals_worker, block.name, matrix.shape, preset).result()
+            return pd.Series(values, index=df.index, name="signals")
+        except BrokenProcessPool as e:
+            logging.error(f"Hesaplama süreç havuzu bozuldu, sinyaller bu süreçte üretilecek: {e}")
+            shutdown()
+        finally:
+            block.close()
+            block.unlink()
+    return backtester.generate_signals(df, preset)
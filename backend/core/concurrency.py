@@ -0,0 +1,118 @@
+# backend/core/concurrency.py
+# @author: Memba Co.
+# Bu modül, tarayıcının dış kaynaklara yaptığı işleri kaynak sınıfına göre ayrı
+# eşzamanlılık havuzlarında yürütür: borsa REST, LLM, haber, Twitter ve keşif
+# servisleri (TAAPI/CoinGecko). Her havuzun kendi semaforu ve senkron işler için kendi
+# thread havuzu vardır; böylece yavaş bir haber API'si borsa isteklerini veya LLM
+# çağrılarını bekletmez ve her kaynak kendi güvenli üst sınırında çalışır.
+# Havuz başına aktif iş, bekleyen iş (kuyruk derinliği) ve bekleme süreleri tutulur.
+
+import time
+import asyncio
+import logging
+import functools
+import contextvars
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from core import app_config
+
+POOL_EXCHANGE = "exchange"
+POOL_LLM = "llm"
+POOL_NEWS = "news"
+POOL_TWITTER = "twitter"
+POOL_DISCOVERY = "discovery"
+
+# Havuz adı -> (ayar anahtarı, varsayılan eşzamanlılık sınırı)
+POOL_LIMIT_SETTINGS = {
+    POOL_EXCHANGE: ("CONCURRENCY_EXCHANGE_LIMIT", 20),
+    POOL_LLM: ("CONCURRENCY_LLM_LIMIT", 4),
+    POOL_NEWS: ("CONCURRENCY_NEWS_LIMIT", 5),
+    POOL_TWITTER: ("CONCURRENCY_TWITTER_LIMIT", 3),
+    POOL_DISCOVERY: ("CONCURRENCY_DISCOVERY_LIMIT", 4),
+}
+
+
+class _Pool:
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"pool-{name}")
+        self.active = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 1) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+_pools: dict[str, _Pool] = {}
+
+
+def _get_pool(name: str) -> _Pool:
+    pool = _pools.get(name)
+    if pool is None:
+        setting_key, default_limit = POOL_LIMIT_SETTINGS[name]
+        limit = max(int(app_config.settings.get(setting_key, default_limit)), 1)
+        pool = _pools[name] = _Pool(name, limit)
+    return pool
+
+
+@asynccontextmanager
+async def limit(name: str):
+    """Bloğu, adı verilen havuzda bir yer açılana kadar bekleterek çalıştırır."""
+    pool = _get_pool(name)
+    pool.waiting += 1
+    pool.max_waiting = max(pool.max_waiting, pool.waiting)
+    started = time.monotonic()
+    try:
+        await pool.semaphore.acquire()
+    finally:
+        pool.waiting -= 1
+    waited = time.monotonic() - started
+    pool.active += 1
+    try:
+        yield
+    finally:
+        pool.active -= 1
+        pool.completed += 1
+        pool.total_wait += waited
+        pool.max_wait = max(pool.max_wait, waited)
+        pool.semaphore.release()
+
+
+async def run_blocking(name: str, func, *args, **kwargs):
+    """
+    Senkron bir fonksiyonu, havuzun sınırı içinde havuzun kendi thread'lerinde çalıştırır.
+    İstek önceliği gibi bağlam değişkenleri 'asyncio.to_thread' gibi thread'e aktarılır.
+    """
+    async with limit(name):
+        pool = _get_pool(name)
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(pool.executor, call)
+
+
+def reset():
+    """Havuzları siler; bir sonraki kullanımda güncel ayarlardaki sınırlarla yeniden oluşturulurlar."""
+    for pool in list(_pools.values()):
+        # Çalışmakta olan işler eski havuzda tamamlanır.
+        pool.executor.shutdown(wait=False)
+    _pools.clear()
+    logging.info("Eşzamanlılık havuzları yeni sınırlarla yeniden oluşturulacak.")
+
+
+def get_stats() -> dict:
+    return {name: _get_pool(name).stats() for name in POOL_LIMIT_SETTINGS}
@@ -0,0 +1,81 @@
+# backend/core/llm_budget.py
+# @author: Memba Co.
+# Bu modül, LLM çağrılarının kayan pencereli (dakikalık ve günlük) bir sayacını tutar
+# ve kalan kotayı tahmin eder. Proaktif tarayıcı, bir döngüde AI analizine kaç aday
+# gönderebileceğini (K) buradan öğrenir; böylece piyasa ne kadar hareketli olursa
+# olsun LLM maliyeti ve döngü süresi sınırlı kalır. Tüm modellerin kotası dolduğunda
+# bütçe bir bekleme süresi boyunca sıfır kabul edilir.
+
+import time
+import logging
+import threading
+from collections import deque
+
+from core import app_config
+
+# Tüm modellerin kotası dolduğunda yeni çağrı yapılmadan beklenecek süre (sn).
+EXHAUSTED_COOLDOWN_SECONDS = 300
+
+_calls: deque = deque()
+_exhausted_until = 0.0
+_lock = threading.Lock()
+
+
+def _limits() -> tuple[int, int]:
+    settings = app_config.settings
+    return settings.get('LLM_CALLS_PER_MINUTE', 15), settings.get('LLM_CALLS_PER_DAY', 1500)
+
+
+def _prune(now: float):
+    while _calls and now - _calls[0] >= 86400:
+        _calls.popleft()
+
+
+def record_call():
+    """Modele yapılan her istek (yedek modele geçişler dahil) bir çağrı olarak sayılır."""
+    with _lock:
+        now = time.time()
+        _calls.append(now)
+        _prune(now)
+
+
+def mark_exhausted(seconds: float = EXHAUSTED_COOLDOWN_SECONDS):
+    global _exhausted_until
+    with _lock:
+        _exhausted_until = max(_exhausted_until, time.time() + seconds)
+    logging.warning(f"LLM bütçesi: Tüm modellerin kotası doldu, {seconds:.0f} sn boyunca yeni analiz planlanmayacak.")
+
+
+def remaining() -> int:
+    """Dakikalık ve günlük pencerelerde kalan çağrı hakkının küçüğünü döndürür."""
+    per_minute, per_day = _limits()
+    with _lock:
+        now = time.time()
+        if now < _exhausted_until:
+            return 0
+        _prune(now)
+        last_minute = sum(1 for t in _calls if now - t < 60)
+        return max(min(per_minute - last_minute, per_day - len(_calls)), 0)
+
+
+def scan_allowance(config: dict) -> int:
+    """
+    Bir tarama döngüsünde AI analizine gönderilebilecek en fazla aday sayısı (K).
+    Pozisyon yönetiminin yeniden analizleri için ayrılan pay bütçeden düşülür.
+    """
+    reserve = config.get('LLM_BUDGET_RESERVE_CALLS', 3)
+    return max(min(config.get('PROACTIVE_SCAN_MAX_LLM_CANDIDATES', 10), remaining() - reserve), 0)
+
+
+def get_stats() -> dict:
+    per_minute, per_day = _limits()
+    with _lock:
+        now = time.time()
+        _prune(now)
+        return {
+            "calls_last_minute": sum(1 for t in _calls if now - t < 60),
+            "calls_last_day": len(_calls),
+            "calls_per_minute_limit": per_minute,
+            "calls_per_day_limit": per_day,
+            "exhausted_for_seconds": max(round(_exhausted_until - now), 0),
+        }
@@ -0,0 +1,195 @@
+# backend/core/llm_cache.py
+# @author: Memba Co.
+# Bu modül, LLM yanıtlarını girdilerin normalize edilmiş bir parmak izine göre yerel
+# bir SQLite deposunda (data/llm_cache.db) saklar. Parmak izi; prompt türü, sembol,
+# zaman aralığı, son kapanmış mumun açılış zamanı, yuvarlanmış gösterge değerleri,
+# haber başlıklarının özeti ve prompt türüne özgü ek alanlardan oluşur. Anlık fiyat
+# parmak izine girmez; aynı mum içinde aynı göstergelerle sorulan soru aynı kabul edilir.
+# Açık pozisyon analizlerinde ise pozisyonun kâr/zarar yüzdesi yuvarlanarak eklenir.
+#
+# Böylece aynı sembol ve mum, birkaç dakika içinde tarayıcı, '/analysis/new', Telegram
+# '/analiz' ve 'reanalyze-all' tarafından sorulduğunda kota ve bekleme süresi bir kez harcanır.
+# Kayıtlar 'LLM_CACHE_TTL_SECONDS' sonunda veya yeni bir mum kapandığında geçersizleşir.
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from core import app_config
+from database.database import DATA_DIR
+from tools.utils import last_closed_bar_open_ms
+
+LLM_CACHE_DB_FILE = os.path.join(DATA_DIR, "llm_cache.db")
+# Göstergeler bu kadar anlamlı basamağa yuvarlanır; küçük kayan nokta farkları ıskaya yol açmaz.
+SIGNIFICANT_DIGITS = 4
+# Süresi dolan kayıtların silinme sıklığı (sn).
+PRUNE_INTERVAL_SECONDS = 600
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+_last_prune = 0.0
+
+# Aynı parmak izi için eşzamanlı gelen çağrılardan sadece biri modele gider.
+# parmak izi -> [kilit, bekleyen çağrı sayısı]
+_key_locks: dict[str, list] = {}
+_key_locks_guard = threading.Lock()
+
+_stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+_stats_lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Mevcut thread için depo bağlantısını döndürür, gerekirse tabloyu oluşturur."""
+    global _initialized
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(LLM_CACHE_DB_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if not _initialized:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    fingerprint TEXT PRIMARY KEY,
+                    prompt_type TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            conn.commit()
+            _initialized = True
+            logging.info(f"LLM yanıt önbelleği hazır. Yol: {LLM_CACHE_DB_FILE}")
+    _local.conn = conn
+    return conn
+
+
+def is_enabled() -> bool:
+    return app_config.settings.get('LLM_CACHE_ENABLED', True)
+
+
+def _normalize(value):
+    if isinstance(value, float):
+        return float(f"{value:.{SIGNIFICANT_DIGITS}g}") if value == value else None
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _news_digest(news_headlines: list[str] | None) -> str | None:
+    headlines = sorted({" ".join(h.lower().split()) for h in news_headlines or [] if h})
+    if not headlines:
+        return None
+    return hashlib.sha1("\n".join(headlines).encode("utf-8")).hexdigest()
+
+
+def fingerprint(prompt_type: str, symbol: str, timeframe: str, indicators: dict,
+                news_headlines: list[str] | None = None, extra: dict | None = None) -> dict:
+    """
+    Bir LLM sorusunun normalize edilmiş parmak izini oluşturur. Dönen sözlük
+    'agent.llm_invoke_with_fallback' fonksiyonuna 'fingerprint' olarak verilir.
+    """
+    payload = {
+        "type": prompt_type,
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "bar_ts": last_closed_bar_open_ms(timeframe, int(time.time() * 1000)),
+        "indicators": _normalize(indicators),
+        "news": _news_digest(news_headlines),
+        "extra": _normalize(extra or {}),
+    }
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return {"key": digest, "type": prompt_type, "symbol": symbol}
+
+
+def reanalysis_fingerprint(position: dict, indicators: dict, current_price: float) -> dict:
+    """
+    Açık bir pozisyonun yeniden analizi için parmak izi; pozisyonun yönü, girişi, açılış
+    gerekçesi ve 0.1 puana yuvarlanmış kaldıraçlı kâr/zarar yüzdesi dahildir.
+    """
+    entry_price = position.get("entry_price") or 0
+    pnl_percentage = None
+    if entry_price > 0 and current_price:
+        direction = 1 if position.get("side") == "buy" else -1
+        pnl_percentage = round(direction * (current_price - entry_price) / entry_price * 100 * (position.get("leverage") or 1), 1)
+    return fingerprint(
+        "reanalysis", position.get("symbol"), position.get("timeframe", "15m"), indicators,
+        extra={"side": position.get("side"), "entry_price": entry_price, "reason": position.get("reason"),
+               "pnl_percentage": pnl_percentage})
+
+
+def _count(prompt_type: str, field: str):
+    with _stats_lock:
+        _stats[prompt_type][field] += 1
+
+
+def get(fp: dict) -> str | None:
+    """Parmak izine ait süresi dolmamış yanıt metnini döndürür; yoksa None."""
+    row = _get_connection().execute(
+        'SELECT response FROM llm_responses WHERE fingerprint = ? AND expires_at > ?', (fp["key"], time.time())
+    ).fetchone()
+    _count(fp["type"], "hits" if row else "misses")
+    return row[0] if row else None
+
+
+def put(fp: dict, response: str):
+    global _last_prune
+    now = time.time()
+    ttl = app_config.settings.get('LLM_CACHE_TTL_SECONDS', 900)
+    conn = _get_connection()
+    conn.execute(
+        'INSERT OR REPLACE INTO llm_responses (fingerprint, prompt_type, symbol, response, created_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)',
+        (fp["key"], fp["type"], fp["symbol"], response, now, now + ttl),
+    )
+    if now - _last_prune > PRUNE_INTERVAL_SECONDS:
+        _last_prune = now
+        conn.execute('DELETE FROM llm_responses WHERE expires_at <= ?', (now,))
+    conn.commit()
+
+
+@contextmanager
+def lock_for(fp: dict):
+    """Aynı parmak izi için çağrıları sıraya sokar; kilit son çağrı bitince silinir."""
+    with _key_locks_guard:
+        entry = _key_locks.setdefault(fp["key"], [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _key_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                _key_locks.pop(fp["key"], None)
+
+
+def get_stats() -> dict:
+    with _stats_lock:
+        by_type = {name: dict(counts) for name, counts in _stats.items()}
+    hits = sum(c["hits"] for c in by_type.values())
+    total = hits + sum(c["misses"] for c in by_type.values())
+    try:
+        entries = _get_connection().execute('SELECT COUNT(*) FROM llm_responses WHERE expires_at > ?', (time.time(),)).fetchone()[0]
+    except sqlite3.Error:
+        entries = None
+    return {
+        "enabled": is_enabled(),
+        "entries": entries,
+        "hits": hits,
+        "misses": total - hits,
+        "hit_rate": round(hits / total, 3) if total else 0.0,
+        "by_type": by_type,
+    }
@@ -7,16 +7,16 @@ import time # Tenacity için eklendi
 import database
 from core import app_config
 from tools import (
-    get_price_with_cache, update_stop_loss_order, execute_trade_order,
-    get_open_positions_from_exchange, get_atr_value, _get_unified_symbol,
-    fetch_open_orders, cancel_all_open_orders
+    update_stop_loss_order, execute_trade_order,
+    get_atr_value, _get_unified_symbol,
+    cancel_all_open_orders
 )
-from tools import exchange as exchange_tools
+from tools import exchange as exchange_tools, async_exchange, rate_limiter
 from core.trader import close_existing_trade, TradeException
 from notifications import send_telegram_message, format_partial_tp_message
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from core import agent
+from core import agent, llm_cache
 from tools import get_technical_indicators
 
 
@@ -31,8 +31,9 @@ def _ensure_exchange_is_available():
 async def _get_positions_with_retry():
     """Borsadan pozisyonları 3 kez deneme ile çeker."""
     logging.info("Borsadan açık pozisyonlar çekiliyor (deneniyor)...")
-    return await asyncio.to_thread(get_open_positions_from_exchange)
+    return await async_exchange.get_open_positions_from_exchange()
 
+@rate_limiter.with_priority(rate_limiter.PRIORITY_POSITION)
 async def sync_positions_with_exchange():
     """
     Uygulama başlangıcında ve periyodik olarak çalışarak borsadaki açık pozisyonlarla yerel
@@ -44,15 +45,19 @@ async def sync_positions_with_exchange():
         return
     # === GÜNCELLEME SONU ===
 
-    def _blocking_sync():
-        if not _ensure_exchange_is_available():
-            logging.error("Periyodik senkronizasyon atlanıyor: Borsa bağlantısı yok.")
-            return
+    if not _ensure_exchange_is_available():
+        logging.error("Periyodik senkronizasyon atlanıyor: Borsa bağlantısı yok.")
+        return
 
-        logging.info(">>> Pozisyon Senkronizasyonu Başlatılıyor...")
-        try:
-            exchange_positions_raw = asyncio.run(_get_positions_with_retry())
+    logging.info(">>> Pozisyon Senkronizasyonu Başlatılıyor...")
+    try:
+        exchange_positions_raw = await _get_positions_with_retry()
+    except Exception as e:
+        logging.error(f"Pozisyon senkronizasyonu sırasında kritik hata: {e}", exc_info=True)
+        return
 
+    def _blocking_sync():
+        try:
             db_positions = database.get_all_positions()
             exchange_positions_map = {_get_unified_symbol(p['symbol']): p for p in exchange_positions_raw}
             db_symbols_set = {p['symbol'] for p in db_positions}
@@ -84,7 +89,7 @@ async def sync_positions_with_exchange():
                     logging.info(f"Yönetilmeyen Pozisyon Bulundu: '{symbol_unified}'. Sisteme entegre ediliyor...")
                     side = 'buy' if pos_data.get('side') == 'long' else 'sell'
                     timeframe = '15m' # Varsayılan olarak
-                    atr_result = get_atr_value(f"{symbol_unified},{timeframe}")
+                    atr_result = get_atr_value(symbol_unified, timeframe)
                     if atr_result.get("status") != "success":
                         logging.error(f"'{symbol_unified}' için ATR alınamadı, içe aktarılamıyor. Mesaj: {atr_result.get('message')}")
                         continue
@@ -159,7 +164,11 @@ def handle_bailout_exit(position: dict, current_price: float, pnl_percentage: fl
                     return False
 
                 prompt = agent.create_bailout_reanalysis_prompt(position, current_price, pnl_percentage, indicators['data'])
-                result = agent.llm_invoke_with_fallback(prompt)
+                fingerprint = llm_cache.fingerprint(
+                    "bailout", position['symbol'], position['timeframe'], indicators['data'],
+                    extra={"side": position['side'], "entry_price": position['entry_price'],
+                           "extremum_price": position.get('extremum_price'), "pnl_percentage": round(pnl_percentage, 1)})
+                result = agent.llm_invoke_with_fallback(prompt, fingerprint)
                 parsed_data = agent.parse_agent_response(result.content)
 
                 if parsed_data and parsed_data.get('recommendation') == 'KAPAT':
@@ -178,6 +187,7 @@ def handle_bailout_exit(position: dict, current_price: float, pnl_percentage: fl
 
     return False
 
+@rate_limiter.with_priority(rate_limiter.PRIORITY_POSITION)
 async def check_all_managed_positions():
     """
     Tüm yönetilen pozisyonları periyodik olarak kontrol eder.
@@ -186,9 +196,7 @@ async def check_all_managed_positions():
     def _blocking_check():
         if not _ensure_exchange_is_available(): return
 
-        app_config.load_config()
         logging.info("Aktif pozisyonlar kontrol ediliyor...")
-        active_positions = database.get_all_positions()
 
         # Yeni ayarları döngü dışında bir kere al
         use_scalp_exit = app_config.settings.get('USE_SCALP_EXIT', False)
@@ -196,7 +204,7 @@ async def check_all_managed_positions():
 
         for position in active_positions:
             try:
-                current_price = get_price_with_cache(position["symbol"])
+                current_price = prices.get(position["symbol"])
                 if current_price is None:
                     logging.warning(f"Fiyat alınamadığı için {position['symbol']} pozisyonu kontrol edilemedi.")
                     continue
@@ -240,8 +248,14 @@ async def check_all_managed_positions():
             except Exception as e:
                 logging.error(f"Pozisyon yönetimi sırasında beklenmedik hata ({position['symbol']}): {e}", exc_info=True)
 
+    if not _ensure_exchange_is_available(): return
+    app_config.load_config()
+    active_positions = database.get_all_positions()
+    # Fiyatlar olay döngüsünde eşzamanlı olarak alınır; emir gönderebilen kontrol mantığı thread'de çalışır.
+    prices = await async_exchange.get_prices([p["symbol"] for p in active_positions])
     await asyncio.to_thread(_blocking_check)
 
+@rate_limiter.with_priority(rate_limiter.PRIORITY_POSITION)
 async def check_for_orphaned_orders():
     """
     Borsadaki açık emirleri kontrol eder ve pozisyonu olmayanları iptal eder.
@@ -250,19 +264,19 @@ async def check_for_orphaned_orders():
     if not app_config.settings.get('LIVE_TRADING'):
         return
 
-    def _blocking_check():
-        if not _ensure_exchange_is_available(): return
-        if exchange_tools.exchange.options.get('defaultType') != 'future':
-            return
+    if not _ensure_exchange_is_available(): return
+    if exchange_tools.exchange.options.get('defaultType') != 'future':
+        return
 
-        logging.info("Yetim Emir Kontrolü (Orphan Order Check) başlatılıyor...")
-        try:
-            open_orders = fetch_open_orders()
-            if not open_orders:
-                logging.info("Yetim Emir Kontrolü: Kontrol edilecek açık emir bulunamadı.")
-                return
+    logging.info("Yetim Emir Kontrolü (Orphan Order Check) başlatılıyor...")
+    open_orders = await async_exchange.fetch_open_orders()
+    if not open_orders:
+        logging.info("Yetim Emir Kontrolü: Kontrol edilecek açık emir bulunamadı.")
+        return
+    exchange_positions = await async_exchange.get_open_positions_from_exchange()
 
-            exchange_positions = get_open_positions_from_exchange()
+    def _blocking_check():
+        try:
             active_position_symbols = {_get_unified_symbol(p['symbol']) for p in exchange_positions}
             orphaned_orders_found = 0
             for order in open_orders:
@@ -286,11 +300,12 @@ async def check_for_orphaned_orders():
 
     await asyncio.to_thread(_blocking_check)
 
+@rate_limiter.with_priority(rate_limiter.PRIORITY_POSITION)
 async def refresh_single_position_pnl(symbol: str):
     if not _ensure_exchange_is_available(): return
     position = database.get_position_by_symbol(symbol)
     if not position: return
-    current_price = get_price_with_cache(position["symbol"])
+    current_price = await async_exchange.get_price_with_cache(position["symbol"])
     if current_price is None:
         database.update_position_pnl(position['symbol'], 0, 0)
         return
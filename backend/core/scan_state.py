@@ -0,0 +1,65 @@
+# backend/core/scan_state.py
+# @author: Memba Co.
+# Bu modül, proaktif tarayıcının sembol başına son sonuçlarını, giriş zaman dilimindeki
+# son kapanmış mumun açılış zamanına göre saklar. Aynı mum için tekrar yapılan
+# taramalarda (tarama aralığı mum süresinden kısa olduğunda veya tarama elle
+# tetiklendiğinde) ön filtre sonucu ve AI kararı yeniden hesaplanmaz; böylece aynı
+# girdiler için LLM'e tekrar sorulmaz. Yeni bir mum kapandığında kayıt geçersizleşir.
+#
+# Kayıtlar, ön filtre eşikleri ve gösterge periyotlarından oluşan bir imza ile birlikte
+# tutulur; ayarlar değiştiğinde eski sonuçlar kullanılmaz.
+
+import time
+
+from tools.utils import last_closed_bar_open_ms
+
+# Ön filtre sonucunu etkileyen ayarlar ve gösterge periyotları.
+_SIGNATURE_KEYS = (
+    "PROACTIVE_SCAN_PREFILTER_ENABLED", "PROACTIVE_SCAN_RSI_PERIOD", "PROACTIVE_SCAN_ADX_PERIOD",
+    "PROACTIVE_SCAN_RSI_LOWER", "PROACTIVE_SCAN_RSI_UPPER", "PROACTIVE_SCAN_ADX_THRESHOLD", "PROACTIVE_SCAN_USE_VOLATILITY_FILTER", "PROACTIVE_SCAN_ATR_PERIOD",
+    "PROACTIVE_SCAN_ATR_THRESHOLD_PERCENT", "PROACTIVE_SCAN_USE_VOLUME_FILTER", "PROACTIVE_SCAN_VOLUME_AVG_PERIOD",
+    "PROACTIVE_SCAN_VOLUME_CONFIRM_MULTIPLIER",
+)
+
+# (sembol, zaman dilimi) -> {"bar_ts", "signature", "passed", "candidate", "verdict"}
+_states: dict[tuple[str, str], dict] = {}
+
+
+def current_bar(timeframe: str) -> int:
+    return last_closed_bar_open_ms(timeframe, int(time.time() * 1000))
+
+
+def signature(config: dict) -> tuple:
+    return tuple(repr(config.get(key)) for key in _SIGNATURE_KEYS)
+
+
+def get(symbol: str, timeframe: str, bar_ts: int, config_signature: tuple) -> dict | None:
+    """Sembolün aynı mum ve aynı ayarlarla üretilmiş kaydını döndürür; yoksa None."""
+    state = _states.get((symbol, timeframe))
+    if state and state["bar_ts"] == bar_ts and state["signature"] == config_signature:
+        return state
+    return None
+
+
+def record_prefilter(symbol: str, timeframe: str, bar_ts: int, config_signature: tuple, candidate: dict | None):
+    """Ön filtre sonucunu kaydeder. 'candidate' None ise sembol bu mumda filtreyi geçememiştir."""
+    _states[(symbol, timeframe)] = {
+        "bar_ts": bar_ts,
+        "signature": config_signature,
+        "passed": candidate is not None,
+        "candidate": candidate,
+        "verdict": None,
+    }
+
+
+def record_verdict(symbol: str, timeframe: str, bar_ts: int, verdict: dict):
+    """AI kararını, aynı mum için kaydedilmiş ön filtre sonucunun yanına ekler."""
+    state = _states.get((symbol, timeframe))
+    if state and state["bar_ts"] == bar_ts:
+        state["verdict"] = verdict
+
+
+def prune(timeframe: str, bar_ts: int):
+    """Son kapanmış mumdan eski kayıtları siler."""
+    for key in [key for key, state in _states.items() if key[1] == timeframe and state["bar_ts"] < bar_ts]:
+        del _states[key]
@@ -1,104 +1,316 @@
 # backend/core/scanner.py
 # @author: MembaCo.
 
-import pandas as pd
 import logging
 import asyncio
-from datetime import datetime
+import uuid
+import heapq
+import itertools
+import time
+import numpy as np
+from datetime import datetime, timezone
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from google.api_core.exceptions import ResourceExhausted
 
 import database
-from core import app_config, agent
+from core import app_config, agent, cache_manager, candidate_ranking, compute_pool, concurrency, llm_budget, llm_cache, scan_state, universe
 from core.trader import open_new_trade, TradeException
 from tools import (
-    get_top_gainers_losers,
-    get_volume_spikes,
-    _get_technical_indicators_logic,
-    get_price_with_cache,
     get_latest_crypto_news,
     get_twitter_sentiment,
     # YENİ: Yeni piyasa keşif fonksiyonları import ediliyor
     get_technical_screener_results,
     get_socially_trending_coins
 )
-from tools.utils import _get_unified_symbol
-from tools import exchange as exchange_tools
+from tools.utils import _get_unified_symbol, timeframe_to_ms, current_bar_open_ms
+from tools import async_exchange, batch_indicators, indicator_engine, rate_limiter, symbol_registry
 
+# Veri toplama ve AI analizi aşamalarının işçi sayısı. Dış kaynaklara yapılan işler
+# ayrıca 'core.concurrency' havuzlarıyla (borsa, LLM, haber, Twitter, keşif) sınırlanır.
 CONCURRENCY_LIMIT = 10
-semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 
-async def _fetch_candidates_from_sources(config: dict) -> list[dict]:
+def scan_job_trigger(config: dict):
     """
-    Tüm kaynaklardan (Whitelist, Gainers/Losers, Volume Spike, Screener, Social)
-    potansiyel işlem adaylarını toplar ve blacklist ile filtreler.
+    Tarayıcı görevinin tetikleyicisini döndürür. 'PROACTIVE_SCAN_ALIGN_TO_CANDLE_CLOSE' açıksa
+    görev, giriş zaman dilimindeki her mum kapanışından 'PROACTIVE_SCAN_CLOSE_DELAY_SECONDS'
+    saniye sonra (en fazla 'PROACTIVE_SCAN_CLOSE_JITTER_SECONDS' saniyelik rastgele gecikmeyle)
+    çalışır; kapalıysa sabit 'PROACTIVE_SCAN_INTERVAL_SECONDS' aralığı kullanılır.
     """
-    all_symbols_with_source = {}
+    if not config.get('PROACTIVE_SCAN_ALIGN_TO_CANDLE_CLOSE'):
+        return IntervalTrigger(seconds=config.get('PROACTIVE_SCAN_INTERVAL_SECONDS', 900))
+    timeframe = config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')
+    delay = config.get('PROACTIVE_SCAN_CLOSE_DELAY_SECONDS', 5)
+    jitter = config.get('PROACTIVE_SCAN_CLOSE_JITTER_SECONDS', 3) or None
+    if timeframe.endswith('M'):
+        return CronTrigger(day=1, hour=0, minute=0, second=delay, timezone=timezone.utc, jitter=jitter)
+    # Binance mumları epoch'a (haftalık mumlar Pazartesiye) hizalı olduğundan, mevcut mumun
+    # açılışından başlayan mum süresi aralığı tüm kapanışlara denk gelir.
+    bar_open = current_bar_open_ms(timeframe, int(time.time() * 1000))
+    start = datetime.fromtimestamp(bar_open / 1000 + delay, tz=timezone.utc)
+    return IntervalTrigger(seconds=timeframe_to_ms(timeframe) // 1000, start_date=start, timezone=timezone.utc, jitter=jitter)
+
+
+def schedule_scan_job(scheduler):
+    """Tarayıcı görevini güncel ayarlardaki tetikleyiciyle ekler veya değiştirir."""
+    config = app_config.settings
+    trigger = scan_job_trigger(config)
+    if config.get('PROACTIVE_SCAN_ALIGN_TO_CANDLE_CLOSE'):
+        # Kaçırılan çalıştırmalar (uygulama meşgul veya kapalıyken) tek bir çalıştırmada birleştirilir;
+        # mumun yarısı geçtiyse atlanır ve bir sonraki kapanış beklenir.
+        misfire_grace_time = max(timeframe_to_ms(config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')) // 2000, 1)
+    else:
+        misfire_grace_time = None
+    scheduler.add_job(execute_single_scan_cycle, trigger, id="scanner_job", max_instances=1, coalesce=True,
+                      misfire_grace_time=misfire_grace_time, replace_existing=True)
+    logging.info(f"Tarayıcı görevi zamanlandı: {trigger}")
+
+
+async def _on_exchange(coro):
+    """Asenkron bir borsa çağrısını borsa havuzunun sınırı içinde bekler."""
+    async with concurrency.limit(concurrency.POOL_EXCHANGE):
+        return await coro
+
+
+# Ön filtre aşaması kaynak başına bir aday grubu alır; kaynak sayısı az olduğundan birkaç işçi yeterlidir.
+PREFILTER_WORKERS = 4
+# Ön filtre sonucunda adaya eklenen ve sıralama puanında kullanılan göstergeler.
+RANKING_INDICATORS = ("RSI", "ADX", "ATR_PERCENT", "volume", "VOLUME_EMA")
+# Aşamalar arasındaki kuyruklarda "bu aşamaya başka öğe gelmeyecek" işareti.
+_STAGE_DONE = object()
+
+# Tarama olaylarını dinleyen istemcilerin (SSE) kuyrukları. Yavaş bir istemcinin
+# belleği doldurmaması için kuyruklar sınırlıdır; dolu kuyruğa gelen olaylar atılır.
+SUBSCRIBER_QUEUE_SIZE = 500
+_subscribers: set[asyncio.Queue] = set()
+
+
+def subscribe() -> asyncio.Queue:
+    """Tarama olaylarını ({'event': ..., 'data': {...}}) alacak yeni bir kuyruk kaydeder."""
+    queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    _subscribers.add(queue)
+    return queue
+
+
+def unsubscribe(queue: asyncio.Queue):
+    _subscribers.discard(queue)
+
+
+def _publish(event: str, data: dict):
+    for queue in list(_subscribers):
+        try:
+            queue.put_nowait({"event": event, "data": data})
+        except asyncio.QueueFull:
+            logging.debug(f"Tarama olayı yavaş bir dinleyici için atlandı: {event}")
+
+
+async def _run_stage(inbox: asyncio.Queue, outbox: asyncio.Queue | None, handler, workers: int):
+    """
+    'inbox' kuyruğundaki öğeleri 'workers' adet eşzamanlı işçiyle işler. 'handler' bir
+    liste döndürür; listedeki öğeler beklemeden 'outbox' kuyruğuna, yani bir sonraki
+    aşamaya aktarılır. Girdi bittiğinde veya aşama hata ile sonlandığında sonraki aşamaya
+    da bitiş işareti gönderilir; böylece sonraki aşamalar sonsuza kadar beklemez.
+    """
+    async def worker():
+        while (item := await inbox.get()) is not _STAGE_DONE:
+            try:
+                outputs = await handler(item)
+            except Exception as e:
+                logging.error(f"PROAKTİF TARAYICI: Tarama aşamasında beklenmeyen hata: {e}", exc_info=True)
+                continue
+            if outbox is not None:
+                for output in outputs:
+                    await outbox.put(output)
+        # Bitiş işareti diğer işçilerin de görmesi için kuyruğa geri bırakılır.
+        await inbox.put(_STAGE_DONE)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+    finally:
+        if outbox is not None:
+            outbox.put_nowait(_STAGE_DONE)
+
 
-    # --- Mevcut Kaynaklar ---
-    whitelist = config.get('PROACTIVE_SCAN_WHITELIST', [])
-    for symbol in whitelist:
-        unified_symbol = _get_unified_symbol(symbol)
-        all_symbols_with_source[unified_symbol] = {"symbol": unified_symbol, "source": "Whitelist"}
+def _indexed_candidate_sources(config: dict) -> list[tuple[str, callable]]:
+    """'_candidate_sources' ile aynı kaynakları, arka planda güncellenen piyasa evreni üzerinde bellek içi sorgular olarak döndürür."""
+    min_volume_usdt = config.get('PROACTIVE_SCAN_MIN_VOLUME_USDT', 1000000)
 
     async def fetch_gainers_losers():
-        if config.get('PROACTIVE_SCAN_USE_GAINERS_LOSERS'):
-            top_n = config.get('PROACTIVE_SCAN_TOP_N', 10)
-            min_volume_usdt = config.get('PROACTIVE_SCAN_MIN_VOLUME_USDT', 1000000)
-            async with semaphore:
-                return await asyncio.to_thread(get_top_gainers_losers, top_n, min_volume_usdt)
-        return []
+        return universe.top_gainers_losers(config.get('PROACTIVE_SCAN_TOP_N', 10), min_volume_usdt)
 
     async def fetch_volume_spikes():
-        if config.get('PROACTIVE_SCAN_USE_VOLUME_SPIKE'):
-            volume_timeframe = config.get('PROACTIVE_SCAN_VOLUME_TIMEFRAME', '1h')
-            volume_period = config.get('PROACTIVE_SCAN_VOLUME_PERIOD', 24)
-            volume_multiplier = config.get('PROACTIVE_SCAN_VOLUME_MULTIPLIER', 5.0)
-            min_volume_usdt = config.get('PROACTIVE_SCAN_MIN_VOLUME_USDT', 1000000)
-            async with semaphore:
-                return await asyncio.to_thread(get_volume_spikes, volume_timeframe, volume_period, volume_multiplier, min_volume_usdt)
-        return []
+        return universe.volume_spikes(config.get('PROACTIVE_SCAN_VOLUME_MULTIPLIER', 5.0), min_volume_usdt)
 
-    # --- YENİ: Yeni Kaynakları Çeken Fonksiyonlar ---
     async def fetch_screener_results():
-        async with semaphore:
-            return await asyncio.to_thread(get_technical_screener_results)
+        return universe.source_symbols("Technical Screener")
 
     async def fetch_social_trends():
-        async with semaphore:
-            return await asyncio.to_thread(get_socially_trending_coins)
-
-    # --- Tüm kaynakları paralel olarak çalıştır ---
-    results = await asyncio.gather(
-        fetch_gainers_losers(),
-        fetch_volume_spikes(),
-        fetch_screener_results(),
-        fetch_social_trends()
-    )
-    gainers_losers_results, volume_spikes_results, screener_results, social_results = results
-
-    # --- Sonuçları tek bir listede birleştir ---
-    for item in gainers_losers_results:
-        if item['symbol'] not in all_symbols_with_source:
-            all_symbols_with_source[item['symbol']] = {"symbol": item['symbol'], "source": "Gainers/Losers"}
-    for item in volume_spikes_results:
-        if item['symbol'] not in all_symbols_with_source:
-            all_symbols_with_source[item['symbol']] = {"symbol": item['symbol'], "source": "Volume Spike"}
-    for symbol in screener_results:
-        unified_symbol = _get_unified_symbol(symbol)
-        if unified_symbol not in all_symbols_with_source:
-            all_symbols_with_source[unified_symbol] = {"symbol": unified_symbol, "source": "Technical Screener"}
-    for symbol in social_results:
-        unified_symbol = _get_unified_symbol(symbol)
-        if unified_symbol not in all_symbols_with_source:
-            all_symbols_with_source[unified_symbol] = {"symbol": unified_symbol, "source": "Social Trend"}
+        return universe.source_symbols("Social Trend")
+
+    sources = []
+    if config.get('PROACTIVE_SCAN_USE_GAINERS_LOSERS'):
+        sources.append(("Gainers/Losers", fetch_gainers_losers))
+    if config.get('PROACTIVE_SCAN_USE_VOLUME_SPIKE'):
+        sources.append(("Volume Spike", fetch_volume_spikes))
+    sources.append(("Technical Screener", fetch_screener_results))
+    sources.append(("Social Trend", fetch_social_trends))
+    return sources
+
+
+def _candidate_sources(config: dict) -> list[tuple[str, callable]]:
+    """Ayarlarda etkin olan aday kaynaklarını (kaynak adı, sembol listesi döndüren coroutine fonksiyonu) olarak döndürür."""
+    if universe.is_ready():
+        return _indexed_candidate_sources(config)
 
+    async def fetch_gainers_losers():
+        top_n = config.get('PROACTIVE_SCAN_TOP_N', 10)
+        min_volume_usdt = config.get('PROACTIVE_SCAN_MIN_VOLUME_USDT', 1000000)
+        return [item['symbol'] for item in await _on_exchange(async_exchange.get_top_gainers_losers(top_n, min_volume_usdt))]
+
+    async def fetch_volume_spikes():
+        volume_timeframe = config.get('PROACTIVE_SCAN_VOLUME_TIMEFRAME', '1h')
+        volume_period = config.get('PROACTIVE_SCAN_VOLUME_PERIOD', 24)
+        volume_multiplier = config.get('PROACTIVE_SCAN_VOLUME_MULTIPLIER', 5.0)
+        min_volume_usdt = config.get('PROACTIVE_SCAN_MIN_VOLUME_USDT', 1000000)
+        spikes = await _on_exchange(async_exchange.get_volume_spikes(volume_timeframe, volume_period, volume_multiplier, min_volume_usdt))
+        return [item['symbol'] for item in spikes]
 
+    async def fetch_screener_results():
+        return await concurrency.run_blocking(concurrency.POOL_DISCOVERY, get_technical_screener_results)
+
+    async def fetch_social_trends():
+        return await concurrency.run_blocking(concurrency.POOL_DISCOVERY, get_socially_trending_coins)
+
+    sources = []
+    if config.get('PROACTIVE_SCAN_USE_GAINERS_LOSERS'):
+        sources.append(("Gainers/Losers", fetch_gainers_losers))
+    if config.get('PROACTIVE_SCAN_USE_VOLUME_SPIKE'):
+        sources.append(("Volume Spike", fetch_volume_spikes))
+    sources.append(("Technical Screener", fetch_screener_results))
+    sources.append(("Social Trend", fetch_social_trends))
+    return sources
+
+
+async def _discover_candidates(config: dict, on_batch):
+    """
+    Tüm kaynaklardan (Whitelist, Gainers/Losers, Volume Spike, Screener, Social)
+    potansiyel işlem adaylarını toplar. Kaynaklar paralel çalışır ve her kaynak
+    tamamlandığında, daha önce görülmemiş, blacklist'te olmayan ve borsada listelenen
+    adaylar beklemeden 'on_batch(list[dict])' ile bir sonraki aşamaya iletilir.
+    Bulunan toplam aday sayısını döndürür.
+    """
     blacklist = {s.upper().strip() for s in config.get('PROACTIVE_SCAN_BLACKLIST', [])}
-    final_candidates = [ data for symbol, data in all_symbols_with_source.items() if symbol.split('/')[0] not in blacklist ]
-    return final_candidates
+    seen = set()
+    dropped_count = 0
+
+    def accept(symbols, source):
+        nonlocal dropped_count
+        batch = []
+        for symbol in symbols:
+            unified_symbol = _get_unified_symbol(symbol)
+            if unified_symbol in seen or unified_symbol.split('/')[0] in blacklist:
+                continue
+            seen.add(unified_symbol)
+            # Borsada listelenmeyen semboller (örn. sosyal trendlerden gelenler) ağ isteği yapılmadan elenir.
+            if not symbol_registry.is_listed(unified_symbol):
+                dropped_count += 1
+                continue
+            batch.append({"symbol": unified_symbol, "source": source})
+        return batch
+
+    async def run_source(source, fetch):
+        try:
+            return source, await fetch()
+        except Exception as e:
+            logging.error(f"PROAKTİF TARAYICI: '{source}' kaynağından aday alınamadı: {e}")
+            return source, []
+
+    total = 0
+    whitelist_batch = accept(config.get('PROACTIVE_SCAN_WHITELIST', []), "Whitelist")
+    if whitelist_batch:
+        total += len(whitelist_batch)
+        await on_batch(whitelist_batch)
+
+    for finished in asyncio.as_completed([run_source(source, fetch) for source, fetch in _candidate_sources(config)]):
+        source, symbols = await finished
+        batch = accept(symbols or [], source)
+        if batch:
+            total += len(batch)
+            await on_batch(batch)
+
+    if dropped_count:
+        logging.info(f"PROAKTİF TARAYICI: Borsada listelenmeyen {dropped_count} aday ağ isteği yapılmadan elendi.")
+    return total
+
+
+async def _fetch_candidates_from_sources(config: dict) -> list[dict]:
+    """Tüm kaynaklar tamamlandığında adayların tamamını tek bir liste olarak döndürür."""
+    candidates = []
+
+    async def collect(batch):
+        candidates.extend(batch)
 
+    await _discover_candidates(config, collect)
+    return candidates
 
+
+async def _batch_pre_filter(candidates: list[dict], config: dict) -> tuple[list[dict], set]:
+    """
+    Ön filtrenin toplu hali: tüm adayların kapanmış mumları eşzamanlı okunur, göstergeler
+    (N, T) dizileri üzerinde tek bir vektörel geçişte hesaplanır ve eşikler maske olarak uygulanır.
+    Göstergeleri piyasa evreninde hazır olan adaylar için mum okunmaz.
+    (filtreyi geçen adaylar, mum verisi okunup değerlendirilebilen semboller) döner.
+    """
+    entry_timeframe = config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')
+    # Yakın zamanda yetersiz veri veya listelenmeme nedeniyle başarısız olan semboller tekrar okunmaz.
+    candidates = [c for c in candidates if not cache_manager.get_negative(f"indicators_{_get_unified_symbol(c['symbol'])}_{entry_timeframe}")]
+    if not candidates:
+        return [], set()
+    params = indicator_engine.params_from_config(config)
+
+    # Göstergeleri piyasa evreninde son kapanmış mum için hazır olan semboller için mum okunmaz.
+    indexed = {c['symbol']: data for c in candidates if (data := universe.indicators(c['symbol'], entry_timeframe, params))}
+    symbols_to_load = [c['symbol'] for c in candidates if c['symbol'] not in indexed]
+    length = indicator_engine.HISTORY_BARS
+    if symbols_to_load:
+        bars_by_symbol, last_closed_open = await _on_exchange(async_exchange.get_closed_bars(symbols_to_load, entry_timeframe, length))
+    else:
+        bars_by_symbol, last_closed_open = {}, 0
+
+    symbols, arrays = await asyncio.to_thread(
+        batch_indicators.stack_bars, bars_by_symbol, last_closed_open, timeframe_to_ms(entry_timeframe), length)
+    # Vektörel gösterge hesabı, etkinse ayrı bir süreçte yapılır; olay döngüsü ve GIL serbest kalır.
+    indicators = await compute_pool.compute_batch(arrays, params)
+    # Evrenden gelen değerler, hesaplananların arkasına eklenerek aynı maskeden geçirilir.
+    for symbol, data in indexed.items():
+        symbols.append(symbol)
+        for key in universe.INDICATOR_FIELDS:
+            indicators[key] = np.append(indicators[key], data[key])
+        indicators["bar_count"] = np.append(indicators["bar_count"], indicator_engine.MIN_BARS)
+    mask = batch_indicators.prefilter_mask(indicators, config)
+    row_of = {symbol: row for row, symbol in enumerate(symbols)}
+    for symbol, bar_count in zip(symbols, indicators["bar_count"]):
+        # Boş liste okuma hatası olabileceğinden sadece gerçekten az mumu olan semboller işaretlenir.
+        if bars_by_symbol.get(symbol) and bar_count < indicator_engine.MIN_BARS:
+            message = f"Teknik analiz için yetersiz veri: {int(bar_count)}/{indicator_engine.MIN_BARS} mum çubuğu bulundu."
+            cache_manager.set_negative(f"indicators_{_get_unified_symbol(symbol)}_{entry_timeframe}",
+                                       {"status": "error", "reason": "insufficient_data", "message": message}, "insufficient_data")
+    passed = []
+    for candidate in candidates:
+        row = row_of[candidate['symbol']]
+        if not mask[row]:
+            continue
+        rsi, adx, atr = indicators["RSI"][row], indicators["ADX"][row], indicators["ATR_PERCENT"][row]
+        log_message = f"Ön Filtre BAŞARILI: {candidate['symbol']} (RSI:{rsi:.1f}, ADX:{adx:.1f}, ATR:{atr:.2f}%)"
+        logging.info(log_message)
+        database.log_event("INFO", "Scanner", log_message)
+        # Sıralama aşaması adayları bu göstergelerle puanlar.
+        passed.append({**candidate, "indicators": {key: float(indicators[key][row]) for key in RANKING_INDICATORS}})
+    return passed, {symbol for symbol in symbols if symbol in indexed or bars_by_symbol.get(symbol)}
+
+
+@rate_limiter.with_priority(rate_limiter.PRIORITY_SCANNER)
 async def get_interactive_scan_candidates() -> list[dict]:
     """İnteraktif tarayıcı için göstergeleriyle birlikte adayları çeker."""
     logging.info("İNTERAKTİF TARAYICI: Aday listesi oluşturuluyor...")
@@ -107,8 +319,12 @@ async def get_interactive_scan_candidates() -> list[dict]:
     entry_timeframe = config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')
     
     async def fetch_indicators(cand):
-        async with semaphore:
-            indicators_result = await asyncio.to_thread(_get_technical_indicators_logic, cand['symbol'], entry_timeframe)
+        # Piyasa evreninde aynı parametrelerle hazır olan göstergeler borsaya gidilmeden kullanılır.
+        indexed = universe.indicators(cand['symbol'], entry_timeframe, indicator_engine.DEFAULT_PARAMS)
+        if indexed:
+            indicators_result = {"status": "success", "data": {key: indexed[key] for key in indicator_engine.PROMPT_INDICATOR_KEYS}}
+        else:
+            indicators_result = await _on_exchange(async_exchange.get_technical_indicators(cand['symbol'], entry_timeframe))
         if indicators_result.get("status") == "success":
             cand['indicators'] = indicators_result['data']
             cand['timeframe'] = entry_timeframe
@@ -125,193 +341,332 @@ async def get_interactive_scan_candidates() -> list[dict]:
     return final_candidates
 
 
+@rate_limiter.with_priority(rate_limiter.PRIORITY_SCANNER)
 async def execute_single_scan_cycle():
     """
-    Tam bir proaktif tarama döngüsü yürütür. Adayları bulur, ön filtreden geçirir,
-    kalanlar üzerinde AI analizi çalıştırır ve ayarlara göre işlem açar.
+    Tam bir proaktif tarama döngüsü yürütür. Adaylar kuyruklarla bağlanmış aşamalardan
+    (keşif -> ön filtre -> sıralama -> veri toplama -> AI analizi) geçer; her aday bir aşamayı
+    bitirdiği anda bir sonrakine aktarılır ve sonuçlar tamamlandıkça yayınlanır.
+    Ayarlara göre işlem açar ve tüm sonuçların özetini döndürür.
     """
     logging.info("PROAKTİF TARAYICI: Tam tarama döngüsü başlatılıyor...")
     database.log_event("INFO", "Scanner", "Proaktif tarama döngüsü başlatıldı.")
     
     config = app_config.settings
-    initial_candidates = await _fetch_candidates_from_sources(config)
-    logging.info(f"PROAKTİF TARAYICI: {len(initial_candidates)} adet potansiyel aday bulundu.")
-    database.log_event("INFO", "Scanner", f"{len(initial_candidates)} potansiyel aday ile tarama başladı.")
+    entry_timeframe = config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')
+    scan_id = uuid.uuid4().hex[:12]
+    # Aynı mum için daha önce üretilmiş ön filtre sonuçları ve AI kararları yeniden kullanılır.
+    bar_ts = scan_state.current_bar(entry_timeframe)
+    config_signature = scan_state.signature(config)
+    scan_state.prune(entry_timeframe, bar_ts)
+    _publish("scan_started", {"scan_id": scan_id, "started_at": datetime.now().isoformat()})
+
+    prefilter_enabled = config.get("PROACTIVE_SCAN_PREFILTER_ENABLED", True)
+    batch_prefilter = config.get("PROACTIVE_SCAN_BATCH_PREFILTER", True)
+    if prefilter_enabled:
+        logging.info("PROAKTİF TARAYICI: AI öncesi teknik filtreleme başlatılıyor...")
+    else:
+        logging.info("PROAKTİF TARAYICI: Ön filtreleme kapalı, tüm adaylar AI analizine gönderilecek.")
 
-    final_candidates_to_analyze = []
+    candidate_queue = asyncio.Queue()
+    ranking_queue = asyncio.Queue()
+    enrichment_queue = asyncio.Queue()
+    analysis_queue = asyncio.Queue()
+    analysis_results = []
+    passed_count = 0
+    selected_count = 0
+    reused_count = 0
     
+    def record_result(result):
+        analysis_results.append(result)
+        _publish("result", {"scan_id": scan_id, **result})
+
     async def pre_filter_candidate(candidate):
         symbol = candidate['symbol']
-        async with semaphore:
-            try:
-                entry_timeframe = config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')
-                bars = await asyncio.to_thread(exchange_tools.exchange.fetch_ohlcv, symbol, timeframe=entry_timeframe, limit=100)
-                if not bars or len(bars) < 50:
-                    logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): Yetersiz mum verisi.")
-                    return None
-                
-                df = pd.DataFrame(bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                
-                # İndikatörleri hesapla
-                rsi_period = config.get('PROACTIVE_SCAN_RSI_PERIOD', 14)
-                adx_period = config.get('PROACTIVE_SCAN_ADX_PERIOD', 14)
-                atr_period = config.get('PROACTIVE_SCAN_ATR_PERIOD', 14)
-                volume_avg_period = config.get('PROACTIVE_SCAN_VOLUME_AVG_PERIOD', 20)
-
-                df.ta.rsi(length=rsi_period, append=True)
-                df.ta.adx(length=adx_period, append=True)
-                df.ta.atr(length=atr_period, append=True)
-                df['volume_ema'] = df['volume'].ewm(span=volume_avg_period, adjust=False).mean()
-
-                df.dropna(inplace=True)
-                if df.empty:
-                    logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): Gösterge hesaplaması sonrası veri kalmadı.")
-                    return None
+        try:
+            # Göstergeler, son kapanmış mum için bir kez hesaplanır; AI analizi ve pozisyon
+            # boyutlandırma aynı sonucu gösterge motorunun hafızasından okur.
+            indicators_result = await _on_exchange(async_exchange.get_indicator_set(symbol, entry_timeframe, indicator_engine.params_from_config(config)))
+            if indicators_result.get("status") != "success":
+                logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): {indicators_result.get('message')}")
+                return None
 
-                last = df.iloc[-1]
-                rsi = last.get(f"RSI_{rsi_period}")
-                adx = last.get(f"ADX_{adx_period}")
-                atr = last.get(f"ATRr_{atr_period}")
-                
-                if rsi is None or adx is None or atr is None:
-                    logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): Gösterge değeri (RSI/ADX/ATR) hesaplanamadı.")
-                    return None
+            indicators = indicators_result["data"]
+            rsi, adx, atr = indicators["RSI"], indicators["ADX"], indicators["ATR_PERCENT"]
 
-                # Filtreleme Mantığı
-                rsi_lower = config.get('PROACTIVE_SCAN_RSI_LOWER', 35)
-                rsi_upper = config.get('PROACTIVE_SCAN_RSI_UPPER', 65)
-                adx_threshold = config.get('PROACTIVE_SCAN_ADX_THRESHOLD', 20)
+            # Filtreleme Mantığı
+            rsi_lower = config.get('PROACTIVE_SCAN_RSI_LOWER', 35)
+            rsi_upper = config.get('PROACTIVE_SCAN_RSI_UPPER', 65)
+            adx_threshold = config.get('PROACTIVE_SCAN_ADX_THRESHOLD', 20)
                 
-                if not ((rsi < rsi_lower or rsi > rsi_upper) and adx > adx_threshold):
-                    logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): RSI ({rsi:.1f}) veya ADX ({adx:.1f}) kriterini geçemedi.")
-                    return None
+            if not ((rsi < rsi_lower or rsi > rsi_upper) and adx > adx_threshold):
+                logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): RSI ({rsi:.1f}) veya ADX ({adx:.1f}) kriterini geçemedi.")
+                return None
 
-                if config.get('PROACTIVE_SCAN_USE_VOLATILITY_FILTER', True):
-                    atr_threshold = config.get('PROACTIVE_SCAN_ATR_THRESHOLD_PERCENT', 0.5)
-                    # pandas-ta ATRr, sonucu 100 ile çarparak yüzde olarak verir.
-                    if atr < atr_threshold:
-                        logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): Yetersiz volatilite (ATR: {atr:.2f}% < {atr_threshold}%)")
-                        return None
+            if config.get('PROACTIVE_SCAN_USE_VOLATILITY_FILTER', True):
+                atr_threshold = config.get('PROACTIVE_SCAN_ATR_THRESHOLD_PERCENT', 0.5)
+                # ATR fiyat biriminde olduğundan eşik, kapanış fiyatına oranlanmış ATR_PERCENT ile karşılaştırılır.
+                if atr < atr_threshold:
+                    logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): Yetersiz volatilite (ATR: {atr:.2f}% < {atr_threshold}%)")
+                    return None
                 
-                if config.get('PROACTIVE_SCAN_USE_VOLUME_FILTER', True):
-                    volume_multiplier = config.get('PROACTIVE_SCAN_VOLUME_CONFIRM_MULTIPLIER', 1.2)
-                    if last['volume'] < last['volume_ema'] * volume_multiplier:
-                        logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): Yetersiz hacim onayı (Son Hacim: {last['volume']:.0f} < Ort. Hacim: {last['volume_ema']:.0f} * {volume_multiplier})")
-                        return None
+            if config.get('PROACTIVE_SCAN_USE_VOLUME_FILTER', True):
+                volume_multiplier = config.get('PROACTIVE_SCAN_VOLUME_CONFIRM_MULTIPLIER', 1.2)
+                if indicators['volume'] < indicators['VOLUME_EMA'] * volume_multiplier:
+                    logging.debug(f"Ön Filtre BAŞARISIZ ({symbol}): Yetersiz hacim onayı (Son Hacim: {indicators['volume']:.0f} < Ort. Hacim: {indicators['VOLUME_EMA']:.0f} * {volume_multiplier})")
+                    return None
                 
-                log_message = f"Ön Filtre BAŞARILI: {symbol} (RSI:{rsi:.1f}, ADX:{adx:.1f}, ATR:{atr:.2f}%)"
-                logging.info(log_message)
-                database.log_event("INFO", "Scanner", log_message)
-                return candidate
+            log_message = f"Ön Filtre BAŞARILI: {symbol} (RSI:{rsi:.1f}, ADX:{adx:.1f}, ATR:{atr:.2f}%)"
+            logging.info(log_message)
+            database.log_event("INFO", "Scanner", log_message)
+            return {**candidate, "indicators": {key: indicators[key] for key in RANKING_INDICATORS}}
 
-            except Exception as e:
-                logging.error(f"Ön filtreleme sırasında {symbol} için hata: {e}")
-                return None
-
-    if config.get("PROACTIVE_SCAN_PREFILTER_ENABLED", True):
-        logging.info("PROAKTİF TARAYICI: AI öncesi teknik filtreleme başlatılıyor...")
-        filter_tasks = [pre_filter_candidate(c) for c in initial_candidates]
-        results = await asyncio.gather(*filter_tasks)
-        final_candidates_to_analyze = [res for res in results if res is not None]
-        log_msg = f"{len(initial_candidates)} adaydan {len(final_candidates_to_analyze)} tanesi ön filtreden geçti."
-        logging.info(f"PROAKTİF TARAYICI: {log_msg}")
-        database.log_event("INFO", "Scanner", log_msg)
-    else:
-        final_candidates_to_analyze = initial_candidates
-        logging.info("PROAKTİF TARAYICI: Ön filtreleme kapalı, tüm adaylar AI analizine gönderilecek.")
-    
-    if not final_candidates_to_analyze:
-        logging.info("PROAKTİF TARAYICI: AI ile analiz edilecek aday bulunamadı. Döngü sonlandırılıyor.")
-        database.log_event("INFO", "Scanner", "AI analizi için kriterlere uyan aday bulunamadı.")
-        return {"summary": {"total_scanned": len(initial_candidates), "pre_filtered_count": 0, "ai_analyzed": 0, "opportunities_found": 0, "auto_trades_opened": 0, "data_errors": 0}, "details": []}
-
-    opportunities_found = []
-    auto_trades_opened = []
-    data_errors = 0
-    
-    entry_timeframe = config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')
+        except Exception as e:
+            logging.error(f"Ön filtreleme sırasında {symbol} için hata: {e}")
+            return None
 
-    async def analyze_symbol(candidate):
+    async def pre_filter_batch(batch):
+        """
+        Bir kaynaktan gelen aday grubunu ön filtreden geçirir; geçenleri sıralama aşamasına
+        aktarır. Son kapanmış mumdan beri sonucu bilinen semboller yeniden değerlendirilmez:
+        filtreyi geçememiş olanlar elenir, AI kararı olanların kararı doğrudan sonuçlara eklenir.
+        """
+        nonlocal passed_count, reused_count
+        passed, unknown = [], []
+        for candidate in batch:
+            state = scan_state.get(candidate['symbol'], entry_timeframe, bar_ts, config_signature)
+            if state is None:
+                unknown.append(candidate)
+            elif state["passed"] and state["verdict"]:
+                passed_count += 1
+                reused_count += 1
+                record_result({**state["verdict"], "reused": True})
+            elif state["passed"]:
+                passed.append(state["candidate"])
+
+        if unknown:
+            if not prefilter_enabled:
+                newly_passed = unknown
+            elif batch_prefilter:
+                newly_passed, evaluated = await _batch_pre_filter(unknown, config)
+                passed_symbols = {c['symbol'] for c in newly_passed}
+                for symbol in evaluated - passed_symbols:
+                    scan_state.record_prefilter(symbol, entry_timeframe, bar_ts, config_signature, None)
+            else:
+                # Tekil ön filtrede göstergeler zaten mum bazında hafızada tutulduğundan sadece geçenler kaydedilir.
+                results = await asyncio.gather(*(pre_filter_candidate(c) for c in unknown))
+                newly_passed = [res for res in results if res is not None]
+            for candidate in newly_passed:
+                scan_state.record_prefilter(candidate['symbol'], entry_timeframe, bar_ts, config_signature, candidate)
+            passed.extend(newly_passed)
+
+        passed_count += len(passed)
+        for candidate in passed:
+            _publish("candidate", {"scan_id": scan_id, **candidate})
+        return passed
+
+    async def enrich_candidate(candidate):
+        """Fiyat, gösterge, haber ve duyarlılık verilerini toplayıp AI aşaması için bağlam hazırlar."""
         symbol = candidate['symbol']
-        async with semaphore:
-            try:
-                # --- TÜM VERİLERİ ASENKRON OLARAK ÇEK ---
-                price_task = asyncio.to_thread(get_price_with_cache, symbol)
-                indicators_task = asyncio.to_thread(_get_technical_indicators_logic, symbol, entry_timeframe)
-                news_task = asyncio.to_thread(get_latest_crypto_news, symbol)
-                sentiment_task = asyncio.to_thread(get_twitter_sentiment, symbol)
-
-                current_price_val, indicators_result, news_headlines, sentiment_data = await asyncio.gather(
-                    price_task, indicators_task, news_task, sentiment_task
-                )
-                # --- VERİ ÇEKME SONU ---
-
-                if not current_price_val:
-                    return {"type": "error", "symbol": symbol, "message": "Fiyat bilgisi alınamadı."}
-                if indicators_result.get("status") != "success":
-                    return {"type": "error", "symbol": symbol, "message": f"Teknik veri hatası: {indicators_result.get('message')}"}
-
-                # --- YENİ BÜTÜNCÜL PROMPT'U KULLAN ---
-                final_prompt = agent.create_holistic_analysis_prompt(
-                    symbol=symbol,
-                    price=current_price_val,
-                    timeframe=entry_timeframe,
-                    indicators=indicators_result["data"],
-                    news_headlines=news_headlines,
-                    sentiment_score=sentiment_data.get("score", 0.0)
-                )
+        try:
+            # --- TÜM VERİLERİ ASENKRON OLARAK ÇEK ---
+            # Her kaynak kendi havuzunda beklediğinden yavaş bir haber servisi borsa isteklerini tutmaz.
+            price_task = _on_exchange(async_exchange.get_price_with_cache(symbol))
+            indicators_task = _on_exchange(async_exchange.get_technical_indicators(symbol, entry_timeframe))
+            news_task = concurrency.run_blocking(concurrency.POOL_NEWS, get_latest_crypto_news, symbol)
+            sentiment_task = concurrency.run_blocking(concurrency.POOL_TWITTER, get_twitter_sentiment, symbol)
+
+            current_price_val, indicators_result, news_headlines, sentiment_data = await asyncio.gather(
+                price_task, indicators_task, news_task, sentiment_task
+            )
+            # --- VERİ ÇEKME SONU ---
+
+            if not current_price_val:
+                record_result({"type": "error", "symbol": symbol, "message": "Fiyat bilgisi alınamadı."})
+                return []
+            if indicators_result.get("status") != "success":
+                record_result({"type": "error", "symbol": symbol, "message": f"Teknik veri hatası: {indicators_result.get('message')}"})
+                return []
+
+            return [{
+                "symbol": symbol,
+                "price": current_price_val,
+                "indicators": indicators_result["data"],
+                "news_headlines": news_headlines,
+                "sentiment_score": sentiment_data.get("score", 0.0),
+            }]
+        except Exception as e:
+            logging.error(f"Proaktif tarama sırasında {symbol} verileri toplanırken hata: {e}", exc_info=True)
+            record_result({"type": "critical", "symbol": symbol, "message": f"Analiz sırasında kritik hata: {str(e)}"})
+            return []
+
+    async def analyze_symbol(context):
+        symbol = context['symbol']
+        try:
+            # --- YENİ BÜTÜNCÜL PROMPT'U KULLAN ---
+            final_prompt = agent.create_holistic_analysis_prompt(
+                symbol=symbol,
+                price=context['price'],
+                timeframe=entry_timeframe,
+                indicators=context['indicators'],
+                news_headlines=context['news_headlines'],
+                sentiment_score=context['sentiment_score']
+            )
                 
-                llm_result = await asyncio.to_thread(agent.llm_invoke_with_fallback, final_prompt)
-                parsed_data = agent.parse_agent_response(llm_result.content)
-
-                if not parsed_data:
-                    return {"type": "error", "symbol": symbol, "message": "Yapay zekadan geçersiz yanıt."}
-
-                if parsed_data.get('recommendation') in ['AL', 'SAT']:
-                    if config.get('PROACTIVE_SCAN_AUTO_CONFIRM'):
-                        try:
-                            open_new_trade(
-                                symbol=symbol, 
-                                recommendation=parsed_data['recommendation'], 
-                                timeframe=entry_timeframe, 
-                                current_price=current_price_val,
-                                reason=parsed_data.get('reason', 'Otomatik Tarayıcı')
-                            )
-                            return {"type": "success", "symbol": symbol, "message": f"Otomatik pozisyon açıldı: {parsed_data['recommendation']}", "data": parsed_data}
-                        except TradeException as e:
-                             logging.error(f"Otomatik işlem açılırken hata ({symbol}): {e}")
-                             return {"type": "error", "symbol": symbol, "message": f"Otomatik işlem hatası: {e}"}
-                    else:
-                        return {"type": "opportunity", "data": parsed_data}
+            fingerprint = llm_cache.fingerprint(
+                "holistic", symbol, entry_timeframe, context['indicators'], context['news_headlines'],
+                extra={"sentiment": context['sentiment_score']})
+            llm_result = await concurrency.run_blocking(concurrency.POOL_LLM, agent.llm_invoke_with_fallback, final_prompt, fingerprint)
+            parsed_data = agent.parse_agent_response(llm_result.content)
+
+            if not parsed_data:
+                return {"type": "error", "symbol": symbol, "message": "Yapay zekadan geçersiz yanıt."}
+
+            if parsed_data.get('recommendation') in ['AL', 'SAT']:
+                if config.get('PROACTIVE_SCAN_AUTO_CONFIRM'):
+                    try:
+                        await concurrency.run_blocking(
+                            concurrency.POOL_EXCHANGE,
+                            open_new_trade,
+                            symbol=symbol, 
+                            recommendation=parsed_data['recommendation'], 
+                            timeframe=entry_timeframe, 
+                            current_price=context['price'],
+                            reason=parsed_data.get('reason', 'Otomatik Tarayıcı')
+                        )
+                        return {"type": "success", "symbol": symbol, "message": f"Otomatik pozisyon açıldı: {parsed_data['recommendation']}", "data": parsed_data}
+                    except TradeException as e:
+                         logging.error(f"Otomatik işlem açılırken hata ({symbol}): {e}")
+                         return {"type": "error", "symbol": symbol, "message": f"Otomatik işlem hatası: {e}"}
+                else:
+                    return {"type": "opportunity", "data": parsed_data}
                 
-                return {"type": "neutral", "data": parsed_data}
+            return {"type": "neutral", "data": parsed_data}
+
+        except ResourceExhausted:
+            logging.critical(f"Proaktif tarama döngüsü, tüm modellerin kotası dolduğu için durduruldu. Sembol: {symbol}")
+            return {"type": "critical", "symbol": symbol, "message": f"Tüm AI modellerinin kotası doldu."}
+        except Exception as e:
+            logging.error(f"Proaktif tarama sırasında {symbol} analiz edilirken hata: {e}", exc_info=True)
+            return {"type": "critical", "symbol": symbol, "message": f"Analiz sırasında kritik hata: {str(e)}"}
+
+    async def rank_stage():
+        """
+        Ön filtreden geçen adayları puanlar ve LLM bütçesi elverdiği sürece veri toplama
+        aşamasına aktarır. Tüm adaylar beklenmez; puanı 'PROACTIVE_SCAN_RANK_ADMIT_SCORE'
+        eşiğini geçen aday hemen gönderilir, diğerleri bir öncelik kuyruğunda daha iyi bir
+        aday için en fazla 'PROACTIVE_SCAN_RANK_WINDOW_SECONDS' bekler. Süre dolduğunda
+        bekleyenlerin en iyisi gönderilir. Girdi bittiğinde kalan bütçe en yüksek puanlılara
+        verilir; bütçeye sığmayanlar bu döngüde analiz edilmez.
+        """
+        ranked, order = [], itertools.count()
+        allowance = llm_budget.scan_allowance(config)
+        admit_score = config.get('PROACTIVE_SCAN_RANK_ADMIT_SCORE', 0.75)
+        window_seconds = config.get('PROACTIVE_SCAN_RANK_WINDOW_SECONDS', 2.0)
+        loop = asyncio.get_running_loop()
+        window_ends = None
+
+        def dispatch(candidate):
+            nonlocal selected_count
+            selected_count += 1
+            enrichment_queue.put_nowait(candidate)
+
+        try:
+            while True:
+                timeout = None if window_ends is None else max(window_ends - loop.time(), 0)
+                try:
+                    candidate = await asyncio.wait_for(ranking_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    if selected_count < allowance:
+                        dispatch(heapq.heappop(ranked)[2])
+                    window_ends = loop.time() + window_seconds if ranked and selected_count < allowance else None
+                    continue
+                if candidate is _STAGE_DONE:
+                    break
+
+                rank_score = candidate_ranking.score(candidate, config)
+                candidate = {**candidate, "score": round(rank_score, 4)}
+                if rank_score >= admit_score and selected_count < allowance:
+                    dispatch(candidate)
+                    continue
+                heapq.heappush(ranked, (-rank_score, next(order), candidate))
+                if window_ends is None and selected_count < allowance:
+                    window_ends = loop.time() + window_seconds
+
+            while ranked and selected_count < allowance:
+                dispatch(heapq.heappop(ranked)[2])
+        finally:
+            enrichment_queue.put_nowait(_STAGE_DONE)
+
+        if ranked:
+            skipped = [candidate['symbol'] for _, _, candidate in sorted(ranked)]
+            log_msg = f"LLM bütçesi ({allowance} analiz) nedeniyle {len(skipped)} aday bu döngüde analiz edilmedi: {', '.join(skipped)}"
+            logging.info(f"PROAKTİF TARAYICI: {log_msg}")
+            database.log_event("INFO", "Scanner", log_msg)
+
+    async def analysis_stage(context):
+        symbol = context['symbol']
+        candidate_ranking.mark_analyzed(symbol)
+        result = await analyze_symbol(context)
+        record_result(result)
+        # Başarılı kararlar mum kapanana kadar yeniden kullanılır. Açılmış bir işlem tekrar
+        # açılmaması için sonraki taramalarda nötr karar olarak raporlanır.
+        if result.get('type') in ('opportunity', 'neutral'):
+            scan_state.record_verdict(symbol, entry_timeframe, bar_ts, result)
+        elif result.get('type') == 'success':
+            scan_state.record_verdict(symbol, entry_timeframe, bar_ts, {"type": "neutral", "data": result['data']})
+        return []
 
-            except ResourceExhausted:
-                logging.critical(f"Proaktif tarama döngüsü, tüm modellerin kotası dolduğu için durduruldu. Sembol: {symbol}")
-                return {"type": "critical", "symbol": symbol, "message": f"Tüm AI modellerinin kotası doldu."}
-            except Exception as e:
-                logging.error(f"Proaktif tarama sırasında {symbol} analiz edilirken hata: {e}", exc_info=True)
-                return {"type": "critical", "symbol": symbol, "message": f"Analiz sırasında kritik hata: {str(e)}"}
+    async def discover():
+        try:
+            return await _discover_candidates(config, candidate_queue.put)
+        finally:
+            candidate_queue.put_nowait(_STAGE_DONE)
+
+    # Hata ile sonlanan bir aşama, bitiş işaretini yine de gönderdiğinden sonraki aşamalar
+    # ellerindeki işi bitirip kapanır; döngü hatayı kaydedip eldeki sonuçlarla tamamlanır.
+    stage_results = await asyncio.gather(
+        discover(),
+        _run_stage(candidate_queue, ranking_queue, pre_filter_batch, PREFILTER_WORKERS),
+        rank_stage(),
+        _run_stage(enrichment_queue, analysis_queue, enrich_candidate, CONCURRENCY_LIMIT),
+        _run_stage(analysis_queue, None, analysis_stage, CONCURRENCY_LIMIT),
+        return_exceptions=True,
+    )
+    for error in (res for res in stage_results if isinstance(res, BaseException)):
+        logging.error(f"PROAKTİF TARAYICI: Bir tarama aşaması hata ile sonlandı: {error}", exc_info=error)
+        database.log_event("ERROR", "Scanner", f"Tarama aşaması hata ile sonlandı: {error}")
+    total_scanned = stage_results[0] if not isinstance(stage_results[0], BaseException) else 0
+    logging.info(f"PROAKTİF TARAYICI: {total_scanned} adet potansiyel aday bulundu.")
+    if prefilter_enabled:
+        log_msg = f"{total_scanned} adaydan {passed_count} tanesi ön filtreden geçti."
+        logging.info(f"PROAKTİF TARAYICI: {log_msg}")
+        database.log_event("INFO", "Scanner", log_msg)
 
-    analysis_tasks = [analyze_symbol(c) for c in final_candidates_to_analyze]
-    analysis_results = await asyncio.gather(*analysis_tasks)
+    if not passed_count:
+        logging.info("PROAKTİF TARAYICI: AI ile analiz edilecek aday bulunamadı. Döngü sonlandırılıyor.")
+        database.log_event("INFO", "Scanner", "AI analizi için kriterlere uyan aday bulunamadı.")
+        summary = {"total_scanned": total_scanned, "pre_filtered_count": 0, "ai_analyzed": 0, "reused_verdicts": 0, "skipped_by_budget": 0, "opportunities_found": 0, "auto_trades_opened": 0, "data_errors": 0}
+        _publish("scan_completed", {"scan_id": scan_id, "summary": summary})
+        return {"summary": summary, "details": []}
     
     final_opportunities = [res['data'] for res in analysis_results if res and res.get('type') == 'opportunity']
     final_auto_trades = [res['data'] for res in analysis_results if res and res.get('type') == 'success']
     final_errors = [res for res in analysis_results if res and res.get('type') in ['error', 'critical']]
     
     summary_msg = f"Tarama tamamlandı. Onay bekleyen: {len(final_opportunities)}, Otomatik açılan: {len(final_auto_trades)}, Hata: {len(final_errors)}"
-    logging.info(f"PROAKTİF TARAYICI DÖNGÜSÜ TAMAMLANDI. Taranan: {len(initial_candidates)}, Ön Filtreden Geçen: {len(final_candidates_to_analyze)}, AI Analizi Yapılan: {len(analysis_tasks)}, {summary_msg}")
+    logging.info(f"PROAKTİF TARAYICI DÖNGÜSÜ TAMAMLANDI. Taranan: {total_scanned}, Ön Filtreden Geçen: {passed_count}, AI Analizi Yapılan: {selected_count}, Önceki Karar Kullanılan: {reused_count}, {summary_msg}")
     database.log_event("INFO", "Scanner", summary_msg)
 
-    return {
-        "summary": {
-            "total_scanned": len(initial_candidates), 
-            "pre_filtered_count": len(final_candidates_to_analyze), 
-            "ai_analyzed": len(analysis_tasks), 
-            "opportunities_found": len(final_opportunities), 
-            "auto_trades_opened": len(final_auto_trades), 
-            "data_errors": len(final_errors)
-        },
-        "details": analysis_results
-    }
\ No newline at end of file
+    summary = {
+        "total_scanned": total_scanned, 
+        "pre_filtered_count": passed_count, 
+        "ai_analyzed": selected_count, 
+        "reused_verdicts": reused_count,
+        "skipped_by_budget": passed_count - reused_count - selected_count,
+        "opportunities_found": len(final_opportunities), 
+        "auto_trades_opened": len(final_auto_trades), 
+        "data_errors": len(final_errors)
+    }
+    _publish("scan_completed", {"scan_id": scan_id, "summary": summary})
+    return {"summary": summary, "details": analysis_results}
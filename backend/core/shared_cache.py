@@ -0,0 +1,101 @@
+# backend/core/shared_cache.py
+# @author: Memba Co.
+# Bu modül, 'cache_manager' için isteğe bağlı ikinci bir önbellek katmanı sağlar.
+# Kayıtlar aynı makinedeki tüm süreçlerin (birden fazla uvicorn işçisi, ayrı
+# çalışan zamanlayıcı vb.) erişebildiği, WAL modunda bir SQLite dosyasında
+# (data/shared_cache.db) tutulur. Böylece bir sürecin borsadan veya harici
+# servislerden aldığı sonuç diğer süreçler tarafından tekrar kullanılır.
+#
+# 'SHARED_CACHE_ENABLED=true' ortam değişkeni ile etkinleştirilir. Değerler JSON
+# olarak saklanır; JSON'a çevrilemeyen değerler sadece süreç içi katmanda kalır.
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+from database.database import DATA_DIR
+
+ENABLED = os.getenv("SHARED_CACHE_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on")
+SHARED_CACHE_DB_FILE = os.path.join(DATA_DIR, "shared_cache.db")
+
+# Her thread kendi bağlantısını kullanır; SQLite bağlantıları thread'ler arasında paylaşılamaz.
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _get_connection() -> sqlite3.Connection:
+    global _initialized
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(SHARED_CACHE_DB_FILE, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if not _initialized:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    stale_until REAL NOT NULL
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_stale_until ON cache (stale_until)")
+            conn.commit()
+            _initialized = True
+    _local.conn = conn
+    return conn
+
+
+def get(key: str) -> tuple | None:
+    """(değer, son kullanma zamanı, bayat sunulabileceği son zaman) döndürür; zamanlar 'time.time()' cinsindendir."""
+    try:
+        row = _get_connection().execute(
+            "SELECT value, expires_at, stale_until FROM cache WHERE key = ? AND stale_until > ?", (key, time.time())
+        ).fetchone()
+    except sqlite3.Error as e:
+        logging.debug(f"Paylaşılan önbellek okunamadı ('{key}'): {e}")
+        return None
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1], row[2]
+
+
+def set(key: str, value, expires_at: float, stale_until: float):
+    try:
+        payload = json.dumps(value)
+    except (TypeError, ValueError):
+        return
+    try:
+        conn = _get_connection()
+        conn.execute("INSERT OR REPLACE INTO cache (key, value, expires_at, stale_until) VALUES (?, ?, ?, ?)",
+                     (key, payload, expires_at, stale_until))
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.debug(f"Paylaşılan önbelleğe yazılamadı ('{key}'): {e}")
+
+
+def delete(key: str):
+    try:
+        conn = _get_connection()
+        conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.debug(f"Paylaşılan önbellekten silinemedi ('{key}'): {e}")
+
+
+def sweep():
+    """Bayat sunulma süresi de geçmiş kayıtları siler."""
+    try:
+        conn = _get_connection()
+        conn.execute("DELETE FROM cache WHERE stale_until <= ?", (time.time(),))
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.debug(f"Paylaşılan önbellek taraması başarısız: {e}")
@@ -27,7 +27,7 @@ def open_new_trade(symbol: str, recommendation: str, timeframe: str, current_pri
     
     # ATR periyodunu dinamik risk ayarından veya varsayılan SL/TP ayarından al
     atr_period = app_config.settings.get('DYNAMIC_RISK_ATR_PERIOD', 14) if app_config.settings.get('USE_DYNAMIC_RISK') else 14
-    atr_result = get_atr_value(symbol, timeframe) # timeframe parametresini düzelt
+    atr_result = get_atr_value(symbol, timeframe, atr_period)
     if atr_result.get("status") != "success":
         raise TradeException(f"ATR değeri alınamadı: {atr_result.get('message')}")
     
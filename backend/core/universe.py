@@ -0,0 +1,202 @@
+# backend/core/universe.py
+# @author: Memba Co.
+# Bu modül, borsadaki tüm aktif USDT vadeli paritelerinin arka planda güncel tutulan
+# bir dizinini (piyasa evreni) sağlar. Dizinde her sembol için 24 saatlik hacim ve
+# fiyat değişimi, giriş zaman dilimindeki RSI/ADX/ATR/ATR% ve hacim EMA değerleri ile
+# hacim patlaması oranı bulunur; harici keşif kaynaklarının (TAAPI, CoinGecko)
+# son sonuçları da burada tutulur.
+#
+# Yenileme artımlıdır: 24s verisi tek bir toplu ticker isteğinden gelir, göstergeler
+# sadece yeni bir mum kapandığında ve sadece yeni mumlar okunarak akış halindeki
+# gösterge motorunda ilerletilir. Tarayıcının aday üretimi ve ön filtresi bu dizin
+# üzerinde bellek içi sorgulara dönüşür; dizin hazır değilse eski yola dönülür.
+
+import time
+import asyncio
+import logging
+from datetime import datetime
+
+from core import app_config, concurrency
+from tools import (
+    async_exchange,
+    indicator_engine,
+    rate_limiter,
+    symbol_registry,
+    get_technical_screener_results,
+    get_socially_trending_coins,
+)
+from tools.utils import _get_unified_symbol, last_closed_bar_open_ms
+
+# Dizinde tutulan gösterge alanları.
+INDICATOR_FIELDS = ("RSI", "ADX", "ATR", "ATR_PERCENT", "VOLUME_EMA", "close", "volume")
+# Son yenilemesi bu kadar yenileme aralığından eski olan dizin kullanılmaz.
+MAX_STALE_INTERVALS = 3
+
+_index: dict[str, dict] = {}
+_sources: dict[str, list[str]] = {}
+_meta: dict = {}
+
+
+def _entry_from_ticker(symbol: str, ticker: dict, previous: dict | None) -> dict:
+    entry = {key: (previous or {}).get(key) for key in INDICATOR_FIELDS + ("indicator_key", "volume_spike_ratio")}
+    entry.update({
+        "symbol": symbol,
+        "quote_volume": float(ticker.get('quoteVolume') or 0),
+        "price_change_percent": float(ticker.get('priceChangePercent') or 0),
+        "last_price": float(ticker.get('lastPrice') or 0),
+    })
+    return entry
+
+
+async def _refresh_indicators(entries: dict, symbols: list[str], timeframe: str, params: tuple, bar_ts: int):
+    """Göstergesi son kapanmış muma ait olmayan sembolleri gösterge motorunda ilerletir."""
+    indicator_key = (timeframe, params, bar_ts)
+
+    async def refresh_symbol(symbol):
+        async with concurrency.limit(concurrency.POOL_EXCHANGE):
+            result = await async_exchange.get_indicator_set(symbol, timeframe, params)
+        data = result.get("data") if result.get("status") == "success" else {}
+        entries[symbol].update({key: data.get(key) for key in INDICATOR_FIELDS})
+        # Başarısız semboller de işaretlenir; aynı mum içinde tekrar denenmez.
+        entries[symbol]["indicator_key"] = indicator_key
+
+    stale = [s for s in symbols if entries[s].get("indicator_key") != indicator_key]
+    await asyncio.gather(*(refresh_symbol(s) for s in stale))
+    return len(stale)
+
+
+async def _refresh_sources(config: dict) -> dict[str, list[str]]:
+    async def fetch(source, func):
+        try:
+            return source, [_get_unified_symbol(s) for s in await concurrency.run_blocking(concurrency.POOL_DISCOVERY, func)]
+        except Exception as e:
+            # Kaynak geçici olarak okunamazsa önceki sonucu korunur.
+            logging.warning(f"Piyasa evreni: '{source}' kaynağı okunamadı: {e}")
+            return source, _sources.get(source, [])
+
+    results = await asyncio.gather(fetch("Technical Screener", get_technical_screener_results),
+                                   fetch("Social Trend", get_socially_trending_coins))
+    return dict(results)
+
+
+@rate_limiter.with_priority(rate_limiter.PRIORITY_SCANNER)
+async def refresh():
+    """Dizini yeniler. Zamanlayıcı tarafından 'UNIVERSE_REFRESH_INTERVAL_SECONDS' aralıklarla çağrılır."""
+    global _index, _sources, _meta
+    config = app_config.settings
+    if config.get('DEFAULT_MARKET_TYPE') != 'future' or not symbol_registry.is_ready():
+        return
+    started = time.monotonic()
+
+    tickers = await async_exchange.get_ticker_24h_index()
+    if not tickers:
+        logging.warning("Piyasa evreni: 24s ticker verisi alınamadı, dizin yenilenmedi.")
+        return
+    entries = {}
+    for symbol in symbol_registry.listed_symbols():
+        ticker = tickers.get(symbol_registry.exchange_id(symbol))
+        if ticker:
+            entries[symbol] = _entry_from_ticker(symbol, ticker, _index.get(symbol))
+
+    # Göstergeler sadece tarayıcının hacim eşiğini geçen ve whitelist'teki semboller için tutulur.
+    timeframe = config.get('PROACTIVE_SCAN_ENTRY_TIMEFRAME', '15m')
+    params = indicator_engine.params_from_config(config)
+    bar_ts = last_closed_bar_open_ms(timeframe, int(time.time() * 1000))
+    min_volume = config.get('PROACTIVE_SCAN_MIN_VOLUME_USDT', 1000000)
+    whitelist = {_get_unified_symbol(s) for s in config.get('PROACTIVE_SCAN_WHITELIST', [])}
+    tracked = [s for s, e in entries.items() if e["quote_volume"] >= min_volume or s in whitelist]
+    updated = await _refresh_indicators(entries, tracked, timeframe, params, bar_ts)
+
+    if config.get('PROACTIVE_SCAN_USE_VOLUME_SPIKE'):
+        async with concurrency.limit(concurrency.POOL_EXCHANGE):
+            spikes = await async_exchange.get_volume_spikes(
+                config.get('PROACTIVE_SCAN_VOLUME_TIMEFRAME', '1h'), config.get('PROACTIVE_SCAN_VOLUME_PERIOD', 24),
+                config.get('PROACTIVE_SCAN_VOLUME_MULTIPLIER', 5.0), min_volume)
+        spike_ratios = {spike['symbol']: spike['spike_ratio'] for spike in spikes}
+        for symbol, entry in entries.items():
+            entry["volume_spike_ratio"] = spike_ratios.get(symbol)
+
+    sources = await _refresh_sources(config)
+
+    _index, _sources = entries, sources
+    _meta = {"refreshed_at": time.time(), "timeframe": timeframe, "params": params, "bar_ts": bar_ts}
+    logging.info(f"Piyasa evreni yenilendi: {len(entries)} parite, {len(tracked)} göstergeli, "
+                 f"{updated} gösterge güncellendi ({time.monotonic() - started:.2f} sn).")
+
+
+def is_enabled(config: dict) -> bool:
+    """Dizin sadece proaktif tarayıcı açıkken tutulur; tarama yapmayan kurulum borsa bütçesi harcamaz."""
+    return bool(config.get('PROACTIVE_SCAN_ENABLED')) and config.get('UNIVERSE_INDEX_ENABLED', True)
+
+
+def schedule_refresh_job(scheduler):
+    """
+    Dizin yenileme görevini ayarlara göre ekler, aralığını günceller veya kaldırır.
+    İlk yenileme hemen yapılır; dizin hazır olana kadar tarayıcı kaynaklara doğrudan gider.
+    """
+    job = scheduler.get_job("universe_refresh_job")
+    if not is_enabled(app_config.settings):
+        if job:
+            scheduler.remove_job("universe_refresh_job")
+            clear()
+            logging.info("Piyasa evreni yenileme görevi devre dışı bırakıldı.")
+        return
+    interval = app_config.settings.get('UNIVERSE_REFRESH_INTERVAL_SECONDS', 60)
+    if job:
+        scheduler.reschedule_job("universe_refresh_job", trigger="interval", seconds=interval)
+    else:
+        scheduler.add_job(refresh, "interval", seconds=interval, id="universe_refresh_job", max_instances=1, next_run_time=datetime.now())
+    logging.info(f"Piyasa evreni yenileme görevi {interval} saniye aralıkla zamanlandı.")
+
+
+def is_ready() -> bool:
+    refreshed_at = _meta.get("refreshed_at")
+    if not refreshed_at:
+        return False
+    interval = app_config.settings.get('UNIVERSE_REFRESH_INTERVAL_SECONDS', 60)
+    return time.time() - refreshed_at < interval * MAX_STALE_INTERVALS
+
+
+def top_gainers_losers(top_n: int, min_volume_usdt: float) -> list[str]:
+    """24 saatte en çok yükselen ve düşen 'top_n' sembolü hacim eşiğiyle birlikte döndürür."""
+    liquid = sorted((e for e in _index.values() if e["quote_volume"] > min_volume_usdt),
+                    key=lambda e: e["price_change_percent"], reverse=True)
+    return [e["symbol"] for e in liquid[:top_n] + liquid[-top_n:]]
+
+
+def volume_spikes(multiplier: float, min_volume_usdt: float) -> list[str]:
+    spiking = [e for e in _index.values()
+               if e["quote_volume"] > min_volume_usdt and (e.get("volume_spike_ratio") or 0) > multiplier]
+    return [e["symbol"] for e in sorted(spiking, key=lambda e: e["volume_spike_ratio"], reverse=True)]
+
+
+def source_symbols(source: str) -> list[str]:
+    """Dizinde saklanan harici keşif kaynağı sonucunu ('Technical Screener', 'Social Trend') döndürür."""
+    return list(_sources.get(source, []))
+
+
+def indicators(symbol: str, timeframe: str, params: tuple) -> dict | None:
+    """Sembolün son kapanmış muma ait göstergelerini döndürür; dizinde güncel değilse None."""
+    entry = _index.get(symbol)
+    if not entry or entry.get("RSI") is None:
+        return None
+    bar_ts = last_closed_bar_open_ms(timeframe, int(time.time() * 1000))
+    if entry.get("indicator_key") != (timeframe, params, bar_ts):
+        return None
+    return {key: entry[key] for key in INDICATOR_FIELDS}
+
+
+def clear():
+    """Dizini boşaltır; tarayıcı, dizin yeniden oluşturulana kadar kaynaklara doğrudan gider."""
+    global _index, _sources, _meta
+    _index, _sources, _meta = {}, {}, {}
+
+
+def get_stats() -> dict:
+    return {
+        "ready": is_ready(),
+        "symbols": len(_index),
+        "with_indicators": sum(1 for e in _index.values() if e.get("RSI") is not None),
+        "refreshed_at": _meta.get("refreshed_at"),
+        "bar_ts": _meta.get("bar_ts"),
+    }
@@ -13,8 +13,9 @@ from starlette.responses import FileResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 import database
-from tools import exchange as exchange_tools
-from core import agent, scanner, position_manager, app_config
+from tools import exchange as exchange_tools, async_exchange, market_cache, price_feed
+from tools.utils import str_to_bool
+from core import agent, scanner, position_manager, app_config, compute_pool, universe
 from core.security import get_current_user
 from api import (
     analysis_router,
@@ -67,7 +68,13 @@ async def lifespan(app: FastAPI):
         database.log_event("CRITICAL", "Application", f"Uygulama başlatılamadı: Borsa bağlantı hatası - {e}")
         raise e
 
+    await async_exchange.initialize_async_exchange(app_config.settings.get('DEFAULT_MARKET_TYPE'))
+
+    if app_config.settings.get('USE_WEBSOCKET_PRICE_FEED', True) and app_config.settings.get('DEFAULT_MARKET_TYPE') == 'future':
+        price_feed.start(str_to_bool(os.getenv("USE_TESTNET", "False")))
+
     agent.initialize_agent()
+    compute_pool.start()
     
     try:
         database.log_event("INFO", "Sync", "Başlangıçta pozisyon senkronizasyonu başlatıldı.")
@@ -90,8 +97,10 @@ async def lifespan(app: FastAPI):
     scheduler.add_job(position_manager.sync_positions_with_exchange, "interval", seconds=app_config.settings.get('POSITION_SYNC_INTERVAL_SECONDS', 300), id="position_sync_job", max_instances=1)
     scheduler.add_job(position_manager.check_all_managed_positions, "interval", seconds=app_config.settings.get('POSITION_CHECK_INTERVAL_SECONDS', 60), id="position_checker_job", max_instances=1)
     scheduler.add_job(position_manager.check_for_orphaned_orders, "interval", seconds=app_config.settings.get('ORPHAN_ORDER_CHECK_INTERVAL_SECONDS', 300), id="orphan_order_job", max_instances=1)
+    scheduler.add_job(exchange_tools.refresh_markets, "interval", seconds=market_cache.MARKET_CACHE_TTL_SECONDS, id="market_refresh_job", max_instances=1)
+    universe.schedule_refresh_job(scheduler)
     if app_config.settings.get('PROACTIVE_SCAN_ENABLED'):
-        scheduler.add_job(scanner.execute_single_scan_cycle, "interval", seconds=app_config.settings.get('PROACTIVE_SCAN_INTERVAL_SECONDS', 900), id="scanner_job", max_instances=1)
+        scanner.schedule_scan_job(scheduler)
     
     scheduler.start()
     logging.info("Uygulama başlangıcı tamamlandı. API kullanıma hazır.")
@@ -110,6 +119,10 @@ async def lifespan(app: FastAPI):
     scheduler.shutdown()
     logging.info("Arka plan görevleri (Scheduler) kapatıldı.")
 
+    price_feed.stop()
+    compute_pool.shutdown()
+    await async_exchange.close_async_exchange()
+
 # GÜNCELLENDİ: FastAPI uygulaması artık versiyonu dinamik olarak alıyor
 app = FastAPI(title="Gemini Trading Agent API", version=APP_VERSION, lifespan=lifespan)
 
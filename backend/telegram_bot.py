@@ -17,9 +17,10 @@ from io import BytesIO
 import matplotlib.pyplot as plt
 import mplfinance as mpf
 import pandas as pd
+import pandas_ta as ta  # noqa: F401  (df.ta erişimcisini kaydeder)
 import json
 
-from core import app_config, trader, agent as core_agent
+from core import app_config, trader, agent as core_agent, llm_cache
 from tools import (
     _get_unified_symbol, get_price_with_cache, get_technical_indicators,
     exchange as exchange_tools
@@ -144,7 +145,7 @@ async def chart_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         symbol_input, timeframe = context.args[0], context.args[1]
         symbol = _get_unified_symbol(symbol_input)
         await update.message.reply_text(f"`{symbol} - {timeframe}` için grafik oluşturuluyor...")
-        bars = exchange_tools.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=100)
+        bars = exchange_tools.get_ohlcv_with_store(symbol, timeframe, limit=100)
         df = pd.DataFrame(bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
         df.set_index('timestamp', inplace=True)
@@ -209,9 +210,12 @@ async def analyze_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             trend_indicators_result = get_technical_indicators(f"{symbol},{trend_timeframe}")
             if trend_indicators_result.get("status") != "success": raise ValueError(f"Trend verisi alınamadı: {trend_indicators_result.get('message')}")
             final_prompt = core_agent.create_mta_analysis_prompt(symbol, current_price, entry_timeframe, entry_indicators_result["data"], trend_timeframe, trend_indicators_result["data"])
+            fingerprint = llm_cache.fingerprint("mta", symbol, entry_timeframe, entry_indicators_result["data"],
+                                                extra={"trend_timeframe": trend_timeframe, "trend_indicators": trend_indicators_result["data"]})
         else:
             final_prompt = core_agent.create_final_analysis_prompt(symbol, entry_timeframe, current_price, entry_indicators_result["data"])
-        result = core_agent.llm_invoke_with_fallback(final_prompt)
+            fingerprint = llm_cache.fingerprint("single", symbol, entry_timeframe, entry_indicators_result["data"])
+        result = core_agent.llm_invoke_with_fallback(final_prompt, fingerprint)
         parsed_data = core_agent.parse_agent_response(result.content)
         if not parsed_data:
             await update.message.reply_text(f'`{symbol}` için yapay zekadan geçerli bir analiz yanıtı alınamadı.')
@@ -245,7 +249,8 @@ async def button_callback_handler(update: Update, context: ContextTypes.DEFAULT_
                 await query.edit_message_text(text=f"Hata: Göstergeler alınamadı: {indicators_result.get('message')}", parse_mode=ParseMode.MARKDOWN)
                 return
             reanalysis_prompt = core_agent.create_reanalysis_prompt(position=position_to_manage, current_price=current_price, indicators=indicators_result['data'])
-            result = core_agent.llm_invoke_with_fallback(reanalysis_prompt)
+            fingerprint = llm_cache.reanalysis_fingerprint(position_to_manage, indicators_result['data'], current_price)
+            result = core_agent.llm_invoke_with_fallback(reanalysis_prompt, fingerprint)
             parsed_data = core_agent.parse_agent_response(result.content)
             if not parsed_data or "recommendation" not in parsed_data:
                 await query.edit_message_text(text=f"`{symbol}` için AI'dan geçerli yanıt alınamadı.", parse_mode=ParseMode.MARKDOWN)
@@ -0,0 +1,57 @@
+# backend/tests/conftest.py
+# @author: Memba Co.
+# Testler 'backend' dizininden çalıştırılır: python -m pytest
+# Uygulama paketleri (tools, core) requirements.txt'deki tüm bağımlılıkları içe aktarır;
+# bunlar kurulu değilse testler toplanmaz ve nedeni rapor başlığında gösterilir.
+
+import os
+import sys
+import threading
+from collections import defaultdict
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+try:
+    import tools  # noqa: F401
+    _missing_dependency = None
+except ModuleNotFoundError as e:
+    _missing_dependency = e.name
+    collect_ignore_glob = ["test_*.py"]
+
+
+def pytest_report_header(config):
+    if _missing_dependency:
+        return f"Uygulama bağımlılığı eksik ({_missing_dependency}); testler toplanmadı. 'pip install -r requirements.txt' çalıştırın."
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """Her test boş bir ayar sözlüğüyle başlar; test ihtiyaç duyduğu ayarları yazar."""
+    from core import app_config
+    monkeypatch.setattr(app_config, "settings", {})
+    return app_config.settings
+
+
+@pytest.fixture
+def candle_db(tmp_path, monkeypatch):
+    """Mum deposunu geçici bir dosyaya yönlendirir."""
+    from tools import candle_store
+    monkeypatch.setattr(candle_store, "CANDLE_DB_FILE", str(tmp_path / "candles.db"))
+    monkeypatch.setattr(candle_store, "_local", threading.local())
+    monkeypatch.setattr(candle_store, "_initialized", False)
+    return candle_store
+
+
+@pytest.fixture
+def llm_cache_db(tmp_path, monkeypatch):
+    """LLM yanıt önbelleğini geçici bir dosyaya yönlendirir."""
+    from core import llm_cache
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DB_FILE", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "_local", threading.local())
+    monkeypatch.setattr(llm_cache, "_initialized", False)
+    monkeypatch.setattr(llm_cache, "_stats", defaultdict(lambda: {"hits": 0, "misses": 0}))
+    return llm_cache
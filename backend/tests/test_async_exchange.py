@@ -0,0 +1,69 @@
+# backend/tests/test_async_exchange.py
+# @author: Memba Co.
+
+import asyncio
+import threading
+
+import pytest
+
+from tools import async_exchange, candle_store
+
+TF_MS = 3_600_000
+NOW = 1_700_000_000_000 // TF_MS * TF_MS + 1_000
+
+
+class FakeAsyncExchange:
+    id = "binance"
+    options = {"defaultType": "spot"}
+
+    def milliseconds(self):
+        return NOW
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=500):
+        current_open = NOW // TF_MS * TF_MS
+        return [[ts, 1.0, 2.0, 0.5, 1.5, 10.0] for ts in range(current_open - (limit - 1) * TF_MS, current_open + 1, TF_MS)]
+
+
+@pytest.fixture
+def store_threads(monkeypatch, candle_db, settings):
+    """Mum deposu fonksiyonlarının çağrıldığı thread'leri kaydeder."""
+    monkeypatch.setattr(async_exchange, "exchange", FakeAsyncExchange())
+    threads = set()
+    for name in ("get_bars", "upsert_bars", "get_first_timestamp", "get_last_timestamp"):
+        original = getattr(candle_store, name)
+
+        def recorder(*args, _original=original, **kwargs):
+            threads.add(threading.get_ident())
+            return _original(*args, **kwargs)
+        monkeypatch.setattr(candle_store, name, recorder)
+    return threads
+
+
+def test_store_access_runs_off_the_event_loop(store_threads):
+    async def scenario():
+        loop_thread = threading.get_ident()
+        last_closed_open = NOW // TF_MS * TF_MS - TF_MS
+        bars = await async_exchange._load_closed_bars("BTC/USDT", "1h", 20, last_closed_open)
+        return loop_thread, bars
+
+    loop_thread, bars = asyncio.run(scenario())
+
+    assert len(bars) == 19 and bars[-1][0] == NOW // TF_MS * TF_MS - TF_MS
+    assert store_threads and loop_thread not in store_threads
+
+
+def test_volume_spike_precheck_runs_off_the_event_loop(store_threads, settings, monkeypatch):
+    settings["DEFAULT_MARKET_TYPE"] = "future"
+
+    async def ticker_index():
+        return {s: {"symbol": s, "quoteVolume": "5000000", "volume": "1000"} for s in ("BTCUSDT", "ETHUSDT")}
+    monkeypatch.setattr(async_exchange, "get_ticker_24h_index", ticker_index)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        await async_exchange.get_volume_spikes("1h", 5, 3.0, 1_000_000)
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+
+    assert store_threads and loop_thread not in store_threads
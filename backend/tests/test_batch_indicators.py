@@ -0,0 +1,100 @@
+# backend/tests/test_batch_indicators.py
+# @author: Memba Co.
+# Toplu (vektörel) gösterge hesabının artımlı motorla aynı sonucu verdiğini ve ön filtre
+# eşiklerinin maske olarak doğru uygulandığını doğrular.
+
+import math
+
+import numpy as np
+import pytest
+
+from tools.batch_indicators import compute_batch, prefilter_mask, stack_bars
+from tools.indicator_engine import MIN_BARS
+from tools.streaming_indicators import IndicatorState
+
+from test_streaming_indicators import PARAMS, synthetic_bars
+
+TF_MS = 60_000
+LENGTH = 300
+TOLERANCE = 1e-9
+
+
+def streamed_snapshot(bars: list) -> dict:
+    state = IndicatorState(PARAMS)
+    for bar in bars:
+        state.update(bar)
+    return {"RSI": state.rsi.value, "ADX": state.adx.value, "ATR": state.atr.value, "VOLUME_EMA": state.volume_ema.value}
+
+
+def test_batch_matches_streaming_for_unequal_histories():
+    # Geçmiş uzunlukları farklı ama hepsi aynı mumla biten semboller; biri pencereden uzun.
+    histories = {"LONG": 450, "FULL": LENGTH, "SHORT": 120, "TINY": 20}
+    bars_by_symbol = {}
+    for seed, (symbol, count) in enumerate(histories.items()):
+        bars = synthetic_bars(count, seed=seed)
+        shift = (LENGTH - count) * TF_MS
+        bars_by_symbol[symbol] = [[b[0] + shift, *b[1:]] for b in bars]
+    last_closed_open = bars_by_symbol["FULL"][-1][0]
+
+    symbols, arrays = stack_bars(bars_by_symbol, last_closed_open, TF_MS, LENGTH)
+    result = compute_batch(arrays, PARAMS)
+
+    for row, symbol in enumerate(symbols):
+        window = bars_by_symbol[symbol][-LENGTH:]
+        assert result["bar_count"][row] == len(window)
+        for key, expected in streamed_snapshot(window).items():
+            actual = result[key][row]
+            assert math.isnan(actual) == math.isnan(expected), f"{symbol} {key}: hazır olma durumu farklı"
+            if not math.isnan(expected):
+                assert actual == pytest.approx(expected, rel=TOLERANCE, abs=TOLERANCE), f"{symbol} {key}"
+
+
+def test_window_with_missing_bar_is_masked():
+    bars = synthetic_bars(LENGTH)
+    gapped = bars[:150] + bars[151:]
+    symbols, arrays = stack_bars({"OK": bars, "GAP": gapped}, bars[-1][0], TF_MS, LENGTH)
+
+    result = compute_batch(arrays, PARAMS)
+
+    assert symbols == ["OK", "GAP"]
+    assert not math.isnan(result["RSI"][0])
+    for key in ("RSI", "ADX", "ATR", "ATR_PERCENT", "VOLUME_EMA"):
+        assert math.isnan(result[key][1])
+    assert result["bar_count"][1] == LENGTH - 1
+    assert not prefilter_mask(result, {})[1]
+
+
+CONFIG = {
+    'PROACTIVE_SCAN_RSI_LOWER': 35,
+    'PROACTIVE_SCAN_RSI_UPPER': 65,
+    'PROACTIVE_SCAN_ADX_THRESHOLD': 20,
+    'PROACTIVE_SCAN_ATR_THRESHOLD_PERCENT': 0.5,
+    'PROACTIVE_SCAN_VOLUME_CONFIRM_MULTIPLIER': 1.2,
+}
+PASSING = {"RSI": 30.0, "ADX": 25.0, "ATR_PERCENT": 1.0, "VOLUME_EMA": 100.0, "close": 10.0, "volume": 150.0, "bar_count": MIN_BARS}
+
+
+def indicator_rows(*overrides: dict) -> dict:
+    rows = [{**PASSING, **override} for override in overrides]
+    return {key: np.array([row[key] for row in rows], dtype=float) for key in PASSING}
+
+
+@pytest.mark.parametrize("override", [
+    {"RSI": 50.0},
+    {"ADX": 20.0},
+    {"ATR_PERCENT": 0.4},
+    {"volume": 119.0},
+    {"bar_count": MIN_BARS - 1},
+    {"RSI": float("nan")},
+    {"close": float("nan")},
+])
+def test_each_threshold_rejects_on_its_own(override):
+    assert prefilter_mask(indicator_rows({}, {"RSI": 70.0}, override), CONFIG).tolist() == [True, True, False]
+
+
+@pytest.mark.parametrize("flag, override", [
+    ('PROACTIVE_SCAN_USE_VOLATILITY_FILTER', {"ATR_PERCENT": 0.1}),
+    ('PROACTIVE_SCAN_USE_VOLUME_FILTER', {"volume": 10.0}),
+])
+def test_disabled_filters_are_skipped(flag, override):
+    assert prefilter_mask(indicator_rows(override), {**CONFIG, flag: False}).tolist() == [True]
@@ -0,0 +1,230 @@
+# backend/tests/test_cache_manager.py
+# @author: Memba Co.
+
+import asyncio
+import threading
+from collections import OrderedDict
+
+import pytest
+
+from core import cache_manager, shared_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.wall_offset = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now + self.wall_offset
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_manager, "time", clock)
+    monkeypatch.setattr(cache_manager, "_cache", OrderedDict())
+    monkeypatch.setattr(cache_manager, "_stats", {})
+    monkeypatch.setattr(cache_manager, "_refreshing", set())
+    monkeypatch.setattr(cache_manager, "_last_sweep", clock.now)
+    monkeypatch.setattr(shared_cache, "ENABLED", False)
+    return clock
+
+
+@pytest.fixture
+def shared_tier(clock, monkeypatch, tmp_path):
+    """Paylaşılan katmanı geçici bir dosyayla açar; duvar saati monotonik saatten farklıdır."""
+    clock.wall_offset = 1_700_000_000.0
+    monkeypatch.setattr(shared_cache, "time", clock)
+    monkeypatch.setattr(shared_cache, "ENABLED", True)
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_DB_FILE", str(tmp_path / "shared_cache.db"))
+    monkeypatch.setattr(shared_cache, "_local", threading.local())
+    monkeypatch.setattr(shared_cache, "_initialized", False)
+    return clock
+
+
+def flush_shared_writes():
+    cache_manager._shared_writer.submit(lambda: None).result()
+
+
+def test_entries_expire_after_namespace_ttl(clock):
+    cache_manager.set("price_BTC/USDT", 100.0)
+    cache_manager.set("custom_key", "değer", ttl=30)
+
+    clock.now += cache_manager.NAMESPACE_TTLS["price"] - 1
+    assert cache_manager.get("price_BTC/USDT") == 100.0
+    clock.now += 2
+    assert cache_manager.get("price_BTC/USDT") is None
+    assert cache_manager.get("custom_key") == "değer"
+
+    stats = cache_manager.get_stats()["namespaces"]["price"]
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 1, 1, 0)
+
+
+def test_least_recently_used_entry_is_evicted(clock, monkeypatch):
+    monkeypatch.setattr(cache_manager, "MAX_CACHE_ENTRIES", 2)
+    cache_manager.set("price_A", 1)
+    cache_manager.set("price_B", 2)
+    cache_manager.get("price_A")
+
+    cache_manager.set("price_C", 3)
+
+    assert cache_manager.get("price_B") is None
+    assert cache_manager.get("price_A") == 1 and cache_manager.get("price_C") == 3
+    assert cache_manager.get_stats()["namespaces"]["price"]["evictions"] == 1
+
+
+def test_periodic_sweep_removes_unread_expired_entries(clock):
+    cache_manager.set("price_A", 1)
+    clock.now += cache_manager.SWEEP_INTERVAL_SECONDS
+
+    cache_manager.set("price_B", 2)
+
+    assert list(cache_manager._cache) == ["price_B"]
+    assert cache_manager.get_stats()["namespaces"]["price"]["expirations"] == 1
+
+
+@pytest.mark.parametrize("read", [cache_manager.get, lambda key: cache_manager.get_or_refresh(key, lambda: None)])
+def test_reads_also_trigger_periodic_sweep(clock, read):
+    cache_manager.set("price_A", 1)
+    clock.now += cache_manager.SWEEP_INTERVAL_SECONDS
+
+    read("sentiment_B")
+
+    assert list(cache_manager._cache) == []
+    assert cache_manager._last_sweep == clock.now
+
+
+def test_stale_value_is_served_while_one_refresh_runs(clock, monkeypatch):
+    submitted = []
+
+    class ManualExecutor:
+        """Arka plan yenilemesini test sırasında elle çalıştırmak için bekleten sahte havuz."""
+        def submit(self, fn, *args):
+            submitted.append((fn, args))
+    monkeypatch.setattr(cache_manager, "_refresh_executor", ManualExecutor())
+
+    cache_manager.set("indicators_BTC", "eski")
+    clock.now += cache_manager.NAMESPACE_TTLS["indicators"] + 1
+
+    assert cache_manager.get_or_refresh("indicators_BTC", lambda: "yeni") == "eski"
+    assert cache_manager.get_or_refresh("indicators_BTC", lambda: "yeni") == "eski"
+    assert len(submitted) == 1
+
+    fn, args = submitted[0]
+    fn(*args)
+    assert cache_manager.get_or_refresh("indicators_BTC", lambda: "başka") == "yeni"
+    assert cache_manager._refreshing == set()
+    assert cache_manager.get_stats()["namespaces"]["indicators"]["stale_hits"] == 2
+
+
+def test_strict_namespace_and_expired_grace_load_synchronously(clock):
+    cache_manager.set("price_BTC", 1.0)
+    cache_manager.set("indicators_BTC", "eski")
+    clock.now += cache_manager.NAMESPACE_TTLS["indicators"] + cache_manager.NAMESPACE_STALE_GRACE["indicators"] + 1
+
+    assert cache_manager.get_or_refresh("price_BTC", lambda: 2.0) == 2.0
+    assert cache_manager.get_or_refresh("indicators_BTC", lambda: "yeni") == "yeni"
+
+
+def test_async_refresh_updates_entry_in_background(clock):
+    async def loader():
+        return "yeni"
+
+    async def scenario():
+        cache_manager.set("sentiment_BTC", "eski")
+        clock.now += cache_manager.NAMESPACE_TTLS["sentiment"] + 1
+        stale = await cache_manager.get_or_refresh_async("sentiment_BTC", loader)
+        await asyncio.gather(*cache_manager._refresh_tasks)
+        return stale, cache_manager.get("sentiment_BTC")
+
+    assert asyncio.run(scenario()) == ("eski", "yeni")
+
+
+def test_uncacheable_result_is_not_stored(clock):
+    assert cache_manager.get_or_refresh("screener_x", lambda: [], cacheable=bool) == []
+    assert cache_manager.get("screener_x") is None
+
+
+def test_negative_results_use_reason_ttl(clock):
+    failure = {"status": "error", "reason": "not_listed"}
+    cache_manager.set_negative("indicators_XYZ/USDT_15m", failure, "not_listed")
+    cache_manager.set_negative("indicators_ABC/USDT_15m", failure, "bilinmeyen")
+
+    clock.now += cache_manager.NEGATIVE_TTLS["error"] + 1
+    assert cache_manager.get_negative("indicators_XYZ/USDT_15m") == failure
+    assert cache_manager.get_negative("indicators_ABC/USDT_15m") is None
+
+
+def test_shared_entry_times_are_converted_to_monotonic(shared_tier):
+    wall_now = shared_tier.time()
+    shared_cache.set("indicators_BTC", {"rsi": 55.0}, wall_now + 10, wall_now + 40)
+
+    assert cache_manager.get("indicators_BTC") == {"rsi": 55.0}
+    assert cache_manager._cache["indicators_BTC"] == ({"rsi": 55.0}, shared_tier.now + 10, shared_tier.now + 40)
+    assert cache_manager.get_stats()["namespaces"]["indicators"]["shared_hits"] == 1
+
+
+def test_in_process_miss_is_filled_from_shared_tier(shared_tier):
+    cache_manager.set("sentiment_BTC", "olumlu")
+    flush_shared_writes()
+    # Başka bir sürecin boş süreç içi katmanı.
+    cache_manager._cache.clear()
+
+    assert cache_manager.get_or_refresh("sentiment_BTC", lambda: "yeni") == "olumlu"
+    assert cache_manager.get_stats()["namespaces"]["sentiment"]["shared_hits"] == 1
+
+
+def test_unencodable_values_stay_in_process(shared_tier):
+    value = object()
+    cache_manager.set("screener_obj", value)
+    flush_shared_writes()
+
+    assert shared_cache.get("screener_obj") is None
+    assert cache_manager.get("screener_obj") is value
+
+
+def test_delete_and_sweep_reach_shared_tier(shared_tier):
+    cache_manager.set("trending_a", [1])
+    cache_manager.set("screener_b", [2])
+    cache_manager.delete("trending_a")
+    shared_tier.now += cache_manager.NAMESPACE_TTLS["screener"] + cache_manager.NAMESPACE_STALE_GRACE["screener"]
+    cache_manager.sweep()
+    flush_shared_writes()
+
+    assert cache_manager._cache == OrderedDict()
+    shared_tier.now -= 1
+    assert shared_cache.get("trending_a") is None and shared_cache.get("screener_b") is None
+
+
+def test_price_keys_never_touch_shared_tier(shared_tier):
+    cache_manager.set("price_BTC/USDT", 100.0)
+    flush_shared_writes()
+
+    assert shared_cache.get("price_BTC/USDT") is None
+
+
+def test_async_lookup_does_no_shared_io_on_event_loop(shared_tier, monkeypatch):
+    threads = []
+    original_get = shared_cache.get
+
+    def recording_get(key):
+        threads.append(threading.current_thread())
+        return original_get(key)
+    monkeypatch.setattr(shared_cache, "get", recording_get)
+    wall_now = shared_tier.time()
+    shared_cache.set("sentiment_BTC", "olumlu", wall_now + 10, wall_now + 20)
+
+    async def loader():
+        return "yeni"
+
+    async def scenario():
+        value = await cache_manager.get_or_refresh_async("sentiment_BTC", loader)
+        # Olay döngüsünden doğrudan okuma sadece süreç içi katmana bakar.
+        return value, cache_manager.get("sentiment_XRP")
+
+    assert asyncio.run(scenario()) == ("olumlu", None)
+    assert threads and threading.main_thread() not in threads
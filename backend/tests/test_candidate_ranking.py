@@ -0,0 +1,39 @@
+# backend/tests/test_candidate_ranking.py
+# @author: Memba Co.
+
+import pytest
+
+from core import candidate_ranking
+
+NEUTRAL = {"RSI": 50, "ADX": 0, "volume": 1, "VOLUME_EMA": 1}
+
+
+@pytest.fixture(autouse=True)
+def fresh_history(monkeypatch):
+    monkeypatch.setattr(candidate_ranking, "_last_analyzed", {})
+
+
+def _score(symbol="BTC/USDT", source="Volume Spike", **indicators):
+    return candidate_ranking.score({"symbol": symbol, "source": source, "indicators": {**NEUTRAL, **indicators}}, {})
+
+
+def test_score_stays_within_unit_range():
+    assert _score(RSI=0, ADX=100, volume=100, source="Whitelist") == pytest.approx(1.0)
+    assert 0.0 <= _score(source="Social Trend") <= 1.0
+
+
+def test_extreme_indicators_and_volume_rank_higher():
+    assert _score(RSI=15) > _score(RSI=30) > _score(RSI=50)
+    assert _score(RSI=90) > _score(RSI=70)
+    assert _score(ADX=40) > _score(ADX=20)
+    assert _score(volume=3) > _score(volume=1.5)
+
+
+def test_trusted_source_ranks_higher():
+    assert _score(source="Whitelist") > _score(source="Gainers/Losers") > _score(source="Social Trend")
+
+
+def test_recently_analyzed_symbol_loses_freshness():
+    candidate_ranking.mark_analyzed("BTC/USDT")
+
+    assert _score("BTC/USDT") == pytest.approx(_score("ETH/USDT") - candidate_ranking.RANK_WEIGHTS["freshness"], abs=1e-3)
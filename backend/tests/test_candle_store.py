@@ -0,0 +1,84 @@
+# backend/tests/test_candle_store.py
+# @author: Memba Co.
+
+import pytest
+
+from tools import exchange as exchange_tools
+
+TF = "1h"
+TF_MS = 3_600_000
+NOW = 1_700_000_000_000 // TF_MS * TF_MS + 1_000  # Oluşmakta olan mumun içinde bir an.
+
+
+def _bar(ts):
+    return [ts, 1.0, 2.0, 0.5, 1.5, 10.0]
+
+
+class FakeExchange:
+    """Her saat başı için bir mumu olan, çağrıları kaydeden sahte spot borsa."""
+    id = "binance"
+    options = {"defaultType": "spot"}
+
+    def __init__(self):
+        self.requests = []
+
+    def milliseconds(self):
+        return NOW
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=500):
+        self.requests.append((since, limit))
+        current_open = NOW // TF_MS * TF_MS
+        if since is None:
+            start = current_open - (limit - 1) * TF_MS
+        else:
+            start = -(-since // TF_MS) * TF_MS
+        return [_bar(ts) for ts in range(start, min(start + limit * TF_MS, current_open + 1), TF_MS)]
+
+
+@pytest.fixture
+def fake_exchange(monkeypatch, candle_db):
+    fake = FakeExchange()
+    monkeypatch.setattr(exchange_tools, "exchange", fake)
+    return fake
+
+
+def _store(candle_db, timestamps):
+    candle_db.upsert_bars("BTC/USDT", TF, [_bar(ts) for ts in timestamps])
+
+
+def test_range_fetches_only_missing_segments(fake_exchange, candle_db):
+    since = NOW // TF_MS * TF_MS - 100 * TF_MS
+    until = since + 49 * TF_MS
+    # Baş, orta ve son kısımlarda boşluk bırakılır.
+    stored = [since + i * TF_MS for i in range(5, 50) if not 20 <= i < 30]
+    _store(candle_db, stored)
+
+    bars = exchange_tools.get_ohlcv_range("BTC/USDT", TF, since, until)
+
+    assert [b[0] for b in bars] == [since + i * TF_MS for i in range(50)]
+    assert [r[0] for r in fake_exchange.requests] == [since, since + 20 * TF_MS]
+    # Tamamlanan aralık artık tamamen yerelden okunur.
+    fake_exchange.requests.clear()
+    exchange_tools.get_ohlcv_range("BTC/USDT", TF, since, until)
+    assert fake_exchange.requests == []
+
+
+def test_incremental_fetch_when_store_is_contiguous(fake_exchange, candle_db):
+    current_open = NOW // TF_MS * TF_MS
+    _store(candle_db, [current_open - i * TF_MS for i in range(3, 60)])
+
+    bars = exchange_tools.get_ohlcv_with_store("BTC/USDT", TF, limit=50)
+
+    assert fake_exchange.requests == [(current_open - 3 * TF_MS + 1, 4)]
+    assert len(bars) == 50 and bars[-1][0] == current_open
+
+
+def test_full_fetch_when_store_window_has_gap(fake_exchange, candle_db):
+    current_open = NOW // TF_MS * TF_MS
+    _store(candle_db, [current_open - i * TF_MS for i in range(1, 60) if i != 10])
+
+    bars = exchange_tools.get_ohlcv_with_store("BTC/USDT", TF, limit=50)
+
+    assert fake_exchange.requests == [(None, 50)]
+    assert [b[0] for b in bars] == [current_open - i * TF_MS for i in range(49, -1, -1)]
+    assert candle_db.get_bars("BTC/USDT", TF, since=current_open - 10 * TF_MS, until=current_open - 10 * TF_MS)
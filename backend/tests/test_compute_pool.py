@@ -0,0 +1,44 @@
+# backend/tests/test_compute_pool.py
+# @author: Memba Co.
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from core import compute_pool
+from tools.batch_indicators import stack_bars
+
+from test_streaming_indicators import PARAMS, synthetic_bars
+
+TF_MS = 60_000
+LENGTH = 200
+
+
+@pytest.fixture
+def process_pool(settings, monkeypatch):
+    settings.update({"COMPUTE_PROCESS_POOL_ENABLED": True, "COMPUTE_PROCESS_WORKERS": 2})
+    monkeypatch.setattr(compute_pool, "_executor", None)
+    yield settings
+    executor = compute_pool._executor
+    compute_pool.shutdown()
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def test_process_pool_matches_in_process_result(process_pool):
+    bars_by_symbol = {f"SYM{seed}": synthetic_bars(LENGTH - seed * 30, seed=seed) for seed in range(4)}
+    # Tüm semboller aynı mumla biter.
+    last_open = max(bars[-1][0] for bars in bars_by_symbol.values())
+    bars_by_symbol = {symbol: [[b[0] + last_open - bars[-1][0], *b[1:]] for b in bars] for symbol, bars in bars_by_symbol.items()}
+    _, arrays = stack_bars(bars_by_symbol, last_open, TF_MS, LENGTH)
+
+    pooled = asyncio.run(compute_pool.compute_batch(arrays, PARAMS))
+    assert compute_pool._executor is not None and compute_pool._executor._max_workers == 2
+
+    process_pool["COMPUTE_PROCESS_POOL_ENABLED"] = False
+    in_process = asyncio.run(compute_pool.compute_batch(arrays, PARAMS))
+
+    assert pooled.keys() == in_process.keys()
+    for key, values in in_process.items():
+        np.testing.assert_array_equal(pooled[key], values, err_msg=key)
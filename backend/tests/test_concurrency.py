@@ -0,0 +1,111 @@
+# backend/tests/test_concurrency.py
+# @author: Memba Co.
+
+import asyncio
+import threading
+
+import pytest
+
+from core import concurrency
+from tools import rate_limiter
+
+
+class FakeClock:
+    """'time' modülü yerine kullanılan, elle ileri alınan sahte saat."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def pools(monkeypatch, settings):
+    monkeypatch.setattr(concurrency, "_pools", {})
+    yield settings
+    # Her test kendi olay döngüsünü kullandığından havuzlar testler arasında paylaşılmaz.
+    concurrency.reset()
+
+
+def test_each_pool_enforces_its_own_limit(pools):
+    pools["CONCURRENCY_LLM_LIMIT"] = 2
+    running, peak = [0], [0]
+
+    async def llm_call(gate):
+        async with concurrency.limit(concurrency.POOL_LLM):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await gate.wait()
+            running[0] -= 1
+
+    async def scenario():
+        gate = asyncio.Event()
+        tasks = [asyncio.create_task(llm_call(gate)) for _ in range(5)]
+        await asyncio.sleep(0)
+        # LLM havuzu doluyken borsa havuzu beklemeden çalışır.
+        async with concurrency.limit(concurrency.POOL_EXCHANGE):
+            exchange_stats = concurrency.get_stats()[concurrency.POOL_EXCHANGE]
+        gate.set()
+        await asyncio.gather(*tasks)
+        return exchange_stats
+
+    exchange_stats = asyncio.run(scenario())
+
+    assert peak[0] == 2
+    assert exchange_stats["active"] == 1 and exchange_stats["waiting"] == 0
+    llm_stats = concurrency.get_stats()[concurrency.POOL_LLM]
+    assert (llm_stats["limit"], llm_stats["max_waiting"], llm_stats["completed"], llm_stats["active"]) == (2, 3, 5, 0)
+
+
+def test_wait_times_are_recorded(pools, monkeypatch):
+    pools["CONCURRENCY_NEWS_LIMIT"] = 1
+    clock = FakeClock()
+    monkeypatch.setattr(concurrency, "time", clock)
+
+    async def holder(started):
+        async with concurrency.limit(concurrency.POOL_NEWS):
+            started.set()
+            await asyncio.sleep(0)
+            clock.now += 2.0
+
+    async def scenario():
+        started = asyncio.Event()
+        first = asyncio.create_task(holder(started))
+        await started.wait()
+        async with concurrency.limit(concurrency.POOL_NEWS):
+            pass
+        await first
+
+    asyncio.run(scenario())
+
+    stats = concurrency.get_stats()[concurrency.POOL_NEWS]
+    assert (stats["completed"], stats["avg_wait_ms"], stats["max_wait_ms"]) == (2, 1000.0, 2000.0)
+
+
+def test_run_blocking_keeps_request_priority(pools):
+    def blocking_call():
+        return rate_limiter._current_priority.get(), threading.current_thread().name
+
+    async def scenario():
+        with rate_limiter.priority(rate_limiter.PRIORITY_BACKTEST):
+            return await concurrency.run_blocking(concurrency.POOL_EXCHANGE, blocking_call)
+
+    priority, thread_name = asyncio.run(scenario())
+
+    assert priority == rate_limiter.PRIORITY_BACKTEST
+    assert thread_name.startswith("pool-exchange")
+
+
+def test_reset_rebuilds_pools_with_new_limits(pools):
+    pools["CONCURRENCY_TWITTER_LIMIT"] = 1
+    old_pool = concurrency._get_pool(concurrency.POOL_TWITTER)
+
+    pools["CONCURRENCY_TWITTER_LIMIT"] = 6
+    concurrency.reset()
+    new_pool = concurrency._get_pool(concurrency.POOL_TWITTER)
+
+    assert new_pool is not old_pool and new_pool.limit == 6
+    assert new_pool.executor._max_workers == 6
+    with pytest.raises(RuntimeError):
+        old_pool.executor.submit(print)
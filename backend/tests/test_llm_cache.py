@@ -0,0 +1,42 @@
+# backend/tests/test_llm_cache.py
+# @author: Memba Co.
+
+import time
+
+from core import llm_cache
+
+POSITION = {"symbol": "BTC/USDT", "timeframe": "15m", "side": "buy", "entry_price": 100.0, "leverage": 10, "reason": "Trend"}
+INDICATORS = {"RSI": 55.123456, "ADX": 21.5}
+
+
+def test_fingerprint_ignores_small_float_noise():
+    first = llm_cache.fingerprint("holistic", "BTC/USDT", "15m", INDICATORS, ["Haber A", "Haber B"])
+    second = llm_cache.fingerprint("holistic", "BTC/USDT", "15m", {"ADX": 21.5, "RSI": 55.1234999}, ["haber b", "Haber  A"])
+
+    assert first["key"] == second["key"]
+    assert first["key"] != llm_cache.fingerprint("holistic", "BTC/USDT", "15m", {**INDICATORS, "RSI": 56.0})["key"]
+
+
+def test_reanalysis_fingerprint_follows_position_pnl():
+    base = llm_cache.reanalysis_fingerprint(POSITION, INDICATORS, 101.0)
+
+    # Kaldıraçlı kâr/zarar 0.1 puanlık dilimde kaldıkça aynı yanıt kullanılır.
+    assert llm_cache.reanalysis_fingerprint(POSITION, INDICATORS, 101.001)["key"] == base["key"]
+    assert llm_cache.reanalysis_fingerprint(POSITION, INDICATORS, 99.0)["key"] != base["key"]
+    # Aynı fiyat hareketi short pozisyon için zarardır.
+    short = {**POSITION, "side": "sell"}
+    assert llm_cache.reanalysis_fingerprint(short, INDICATORS, 101.0)["key"] != base["key"]
+
+
+def test_cached_response_expires_after_ttl(llm_cache_db, settings, monkeypatch):
+    settings["LLM_CACHE_TTL_SECONDS"] = 60
+    fp = llm_cache_db.fingerprint("holistic", "BTC/USDT", "15m", INDICATORS)
+
+    assert llm_cache_db.get(fp) is None
+    llm_cache_db.put(fp, "yanıt")
+    assert llm_cache_db.get(fp) == "yanıt"
+
+    now = time.time()
+    monkeypatch.setattr(llm_cache_db.time, "time", lambda: now + 61)
+    assert llm_cache_db.get(fp) is None
+    assert llm_cache_db.get_stats()["by_type"]["holistic"] == {"hits": 1, "misses": 2}
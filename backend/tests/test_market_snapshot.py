@@ -0,0 +1,65 @@
+# backend/tests/test_market_snapshot.py
+# @author: Memba Co.
+
+import pytest
+
+from tools import exchange as exchange_tools
+
+
+class FakeExchange:
+    id = "binance"
+    options = {"defaultType": "future"}
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def fapiPublicGetTickerPrice(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("bağlantı yok")
+        return [{"symbol": "BTCUSDT", "price": "100.5"}]
+
+
+@pytest.fixture
+def fake_exchange(monkeypatch):
+    fake = FakeExchange()
+    monkeypatch.setattr(exchange_tools, "exchange", fake)
+    monkeypatch.setattr(exchange_tools, "_market_snapshot", {
+        "tickers": {}, "tickers_ts": 0.0, "tickers_retry_at": 0.0,
+        "prices": {}, "prices_ts": 0.0, "prices_retry_at": 0.0,
+    })
+    return fake
+
+
+def _age_prices(seconds):
+    snapshot = exchange_tools._market_snapshot
+    snapshot["prices_ts"] -= seconds
+
+
+def test_failed_refresh_keeps_recent_snapshot_and_backs_off(fake_exchange):
+    assert exchange_tools.get_snapshot_price("BTC/USDT") == 100.5
+    fake_exchange.fail = True
+    _age_prices(exchange_tools.MARKET_SNAPSHOT_PRICE_TTL + 1)
+
+    assert exchange_tools.get_snapshot_price("BTC/USDT") == 100.5
+    assert exchange_tools.get_snapshot_price("BTC/USDT") == 100.5
+    # İlk hatadan sonra bekleme süresi dolana kadar borsaya tekrar gidilmez.
+    assert fake_exchange.calls == 2
+
+
+def test_snapshot_older_than_max_age_is_not_used(fake_exchange):
+    exchange_tools.get_price_index()
+    fake_exchange.fail = True
+    _age_prices(exchange_tools.MARKET_SNAPSHOT_PRICE_TTL * exchange_tools.MARKET_SNAPSHOT_MAX_AGE_FACTOR + 1)
+
+    assert exchange_tools.get_snapshot_price("BTC/USDT") is None
+
+
+def test_refresh_resumes_after_backoff(fake_exchange):
+    fake_exchange.fail = True
+    assert exchange_tools.get_price_index() == {}
+    fake_exchange.fail = False
+    exchange_tools._market_snapshot["prices_retry_at"] = 0.0
+
+    assert exchange_tools.get_price_index() == {"BTCUSDT": 100.5}
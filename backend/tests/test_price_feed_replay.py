@@ -0,0 +1,87 @@
+# backend/tests/test_price_feed_replay.py
+# @author: Memba Co.
+
+import asyncio
+import json
+
+import websockets
+
+from tools import price_feed
+from tools.price_feed_replay import ReplayServer
+
+
+async def _serve(server):
+    return await websockets.serve(server.handler, "127.0.0.1", 0)
+
+
+def _url(ws_server) -> str:
+    return f"ws://127.0.0.1:{ws_server.sockets[0].getsockname()[1]}/stream"
+
+
+def test_price_feed_reads_prices_from_replay(monkeypatch):
+    async def scenario():
+        ws_server = await _serve(ReplayServer(symbols=["BTCUSDT"], interval=0.01))
+        monkeypatch.setenv("BINANCE_FUTURES_WS_URL", _url(ws_server))
+        price_feed.start()
+        try:
+            for _ in range(100):
+                if price := price_feed.get_price("BTC/USDT"):
+                    return price
+                await asyncio.sleep(0.05)
+        finally:
+            await asyncio.to_thread(price_feed.stop)
+            ws_server.close()
+            await ws_server.wait_closed()
+
+    price = asyncio.run(scenario())
+
+    assert price is not None and 99 < price < 101
+
+
+def test_replay_waits_instead_of_spinning_without_matching_subscription():
+    server = ReplayServer(frames=[{"stream": "btcusdt@ticker", "data": {"e": "24hrTicker", "s": "BTCUSDT", "c": "1"}}], interval=0.01)
+    produced = 0
+    frame_source = server._frame_source
+
+    def counting_source():
+        nonlocal produced
+        for frame in frame_source():
+            produced += 1
+            yield frame
+    server._frame_source = counting_source
+
+    async def scenario():
+        ws_server = await _serve(server)
+        try:
+            async with websockets.connect(_url(ws_server)) as ws:
+                await ws.send(json.dumps({"method": "SUBSCRIBE", "params": ["ethusdt@ticker"], "id": 1}))
+                assert json.loads(await ws.recv())["id"] == 1
+                await asyncio.sleep(0.3)
+                idle_count = produced
+                # Abonelik değişince akış yeniden başlar.
+                await ws.send(json.dumps({"method": "SUBSCRIBE", "params": ["btcusdt@ticker"], "id": 2}))
+                messages = [json.loads(await asyncio.wait_for(ws.recv(), 2)) for _ in range(2)]
+                return idle_count, messages
+        finally:
+            ws_server.close()
+            await ws_server.wait_closed()
+
+    idle_count, messages = asyncio.run(scenario())
+
+    assert idle_count <= 3
+    assert messages[0] == {"result": None, "id": 2}
+    assert messages[1]["data"]["c"] == "1"
+
+
+def test_replay_with_empty_recording_keeps_answering_commands():
+    async def scenario():
+        ws_server = await _serve(ReplayServer(frames=[]))
+        try:
+            async with websockets.connect(_url(ws_server)) as ws:
+                await ws.send(json.dumps({"method": "SUBSCRIBE", "params": ["btcusdt@ticker"], "id": 7}))
+                return json.loads(await asyncio.wait_for(ws.recv(), 2))
+        finally:
+            ws_server.close()
+            await ws_server.wait_closed()
+
+    assert asyncio.run(scenario()) == {"result": None, "id": 7}
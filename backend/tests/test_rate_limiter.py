@@ -0,0 +1,84 @@
+# backend/tests/test_rate_limiter.py
+# @author: Memba Co.
+
+import pytest
+
+from tools import rate_limiter
+
+
+class FakeClock:
+    """'time' modülü yerine kullanılan, 'sleep' ile ileri alınan sahte saat."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(rate_limiter, "_tokens", rate_limiter._capacity)
+    monkeypatch.setattr(rate_limiter, "_last_refill", clock.now)
+    monkeypatch.setattr(rate_limiter, "_paused_until", 0.0)
+    monkeypatch.setattr(rate_limiter, "_stats", {
+        "last_used_weight_header": None,
+        "throttled_waits": {p: 0 for p in rate_limiter.PRIORITY_RESERVE_RATIO},
+        "rate_limit_responses": 0,
+    })
+    return clock
+
+
+def test_low_priority_waits_while_reserve_is_kept_for_positions(clock):
+    capacity = rate_limiter._capacity
+    # Tarayıcı kovanın %25'ini ayrılmış bıraktığı için bu noktada beklemeye başlar.
+    rate_limiter.acquire(capacity * 0.75, rate_limiter.PRIORITY_SCANNER)
+    assert clock.slept == []
+
+    rate_limiter.acquire(1, rate_limiter.PRIORITY_SCANNER)
+    assert clock.slept == [pytest.approx(1 / rate_limiter._refill_per_second)]
+    assert rate_limiter.get_stats()["throttled_waits"][rate_limiter.PRIORITY_SCANNER] == 1
+
+    # Pozisyon yönetimi rezervi kullanabilir.
+    clock.slept.clear()
+    rate_limiter.acquire(capacity * 0.25 - 1, rate_limiter.PRIORITY_POSITION)
+    assert clock.slept == []
+
+
+def test_used_weight_header_lowers_the_local_budget(clock):
+    rate_limiter.record_response(200, {"x-mbx-used-weight-1m": "2000"})
+
+    stats = rate_limiter.get_stats()
+    assert stats["last_used_weight_header"] == 2000
+    assert stats["available_weight"] == pytest.approx(rate_limiter._capacity - 2000)
+
+
+def test_rate_limit_response_pauses_every_priority(clock):
+    rate_limiter.record_response(429, {"Retry-After": "30"})
+
+    rate_limiter.acquire(1, rate_limiter.PRIORITY_POSITION)
+    assert clock.slept[0] == pytest.approx(30)
+    assert rate_limiter.get_stats()["rate_limit_responses"] == 1
+
+
+def test_priority_context_sets_the_default_level(clock):
+    rate_limiter.acquire(rate_limiter._capacity * 0.5, rate_limiter.PRIORITY_POSITION)
+    with rate_limiter.priority(rate_limiter.PRIORITY_BACKTEST):
+        rate_limiter.acquire(rate_limiter._capacity * 0.1 + 1)
+
+    assert rate_limiter.get_stats()["throttled_waits"][rate_limiter.PRIORITY_BACKTEST] == 1
+
+
+def test_request_heavier_than_the_unreserved_budget_eventually_passes(clock):
+    rate_limiter.acquire(rate_limiter._capacity * 0.1, rate_limiter.PRIORITY_POSITION)
+
+    rate_limiter.acquire(rate_limiter._capacity * 0.8, rate_limiter.PRIORITY_BACKTEST)
+
+    assert sum(clock.slept) == pytest.approx(60 * 0.1)
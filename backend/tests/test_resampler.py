@@ -0,0 +1,81 @@
+# backend/tests/test_resampler.py
+# @author: Memba Co.
+
+from datetime import datetime, timezone
+
+import pytest
+
+from tools import resampler
+
+HOUR_MS = 3_600_000
+DAY_MS = resampler.DAY_MS
+
+
+def ms(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def bars_every(start: int, count: int, step_ms: int) -> list:
+    # Her mumun değerleri sırasıyla artar; kova toplamları kolayca kontrol edilir.
+    return [[start + i * step_ms, float(i), float(i) + 2, float(i) - 1, float(i) + 1, 1.0] for i in range(count)]
+
+
+def test_four_hour_buckets_are_epoch_aligned():
+    # 01:00'den başlayan saatlik mumların ilk (eksik) kovası atlanır.
+    bars = bars_every(ms(2024, 1, 1, 1), 11, HOUR_MS)
+
+    result = resampler.resample(bars, "1h", "4h")
+
+    assert [b[0] for b in result] == [ms(2024, 1, 1, 4), ms(2024, 1, 1, 8)]
+    assert result[0] == [ms(2024, 1, 1, 4), 3.0, 8.0, 2.0, 7.0, 4.0]
+
+
+def test_weekly_buckets_start_on_monday():
+    # 28 Aralık 2023 Perşembe; 1 ve 8 Ocak 2024 Pazartesi.
+    bars = bars_every(ms(2023, 12, 28), 18, DAY_MS)
+
+    result = resampler.resample(bars, "1d", "1w")
+
+    assert [b[0] for b in result] == [ms(2024, 1, 1), ms(2024, 1, 8)]
+    assert all(datetime.fromtimestamp(b[0] / 1000, tz=timezone.utc).weekday() == 0 for b in result)
+    assert result[0][5] == 7.0
+
+
+def test_monthly_buckets_follow_calendar_months():
+    bars = bars_every(ms(2023, 12, 15), 17 + 31 + 29, DAY_MS)
+
+    result = resampler.resample(bars, "1d", "1M")
+
+    assert [(b[0], b[5]) for b in result] == [(ms(2024, 1, 1), 31.0), (ms(2024, 2, 1), 29.0)]
+
+
+def test_bucket_with_missing_source_bar_is_dropped():
+    bars = bars_every(ms(2024, 1, 1), 12, HOUR_MS)
+    del bars[5]
+
+    result = resampler.resample(bars, "1h", "4h")
+
+    assert [b[0] for b in result] == [ms(2024, 1, 1), ms(2024, 1, 1, 8)]
+
+
+@pytest.fixture
+def stored_hours(candle_db, settings):
+    # 1 Ocak 00:00 - 2 Ocak 23:00 arası saatlik mumlar.
+    candle_db.upsert_bars("BTC/USDT", "1h", bars_every(ms(2024, 1, 1), 48, HOUR_MS))
+    return candle_db
+
+
+def test_local_closed_bars_resamples_stored_history(stored_hours):
+    bars = resampler.local_closed_bars("BTC/USDT", "4h", 3, ms(2024, 1, 2, 20))
+
+    assert [b[0] for b in bars] == [ms(2024, 1, 2, 12), ms(2024, 1, 2, 16), ms(2024, 1, 2, 20)]
+
+
+@pytest.mark.parametrize("limit, last_closed_open", [
+    # Depodaki geçmiş istenen 20 kovaya yetmez.
+    (20, ms(2024, 1, 2, 20)),
+    # Depo, son kapanmış 4 saatlik mumun alt mumlarını henüz içermez.
+    (3, ms(2024, 1, 3, 0)),
+])
+def test_local_closed_bars_returns_none_without_enough_history(stored_hours, limit, last_closed_open):
+    assert resampler.local_closed_bars("BTC/USDT", "4h", limit, last_closed_open) is None
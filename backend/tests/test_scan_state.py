@@ -0,0 +1,58 @@
+# backend/tests/test_scan_state.py
+# @author: Memba Co.
+
+import pytest
+
+from core import scan_state
+
+TF = "15m"
+BAR = 1_700_000_100_000
+
+
+@pytest.fixture(autouse=True)
+def states(monkeypatch):
+    monkeypatch.setattr(scan_state, "_states", {})
+
+
+def test_state_is_reused_for_same_bar_and_signature():
+    signature = scan_state.signature({"PROACTIVE_SCAN_RSI_LOWER": 30})
+    candidate = {"symbol": "BTC/USDT", "indicators": {"RSI": 25}}
+    scan_state.record_prefilter("BTC/USDT", TF, BAR, signature, candidate)
+    scan_state.record_verdict("BTC/USDT", TF, BAR, {"type": "neutral"})
+
+    state = scan_state.get("BTC/USDT", TF, BAR, scan_state.signature({"PROACTIVE_SCAN_RSI_LOWER": 30}))
+
+    assert state["passed"] and state["candidate"] == candidate and state["verdict"] == {"type": "neutral"}
+
+
+def test_failed_prefilter_is_remembered():
+    signature = scan_state.signature({})
+    scan_state.record_prefilter("ETH/USDT", TF, BAR, signature, None)
+
+    state = scan_state.get("ETH/USDT", TF, BAR, signature)
+
+    assert not state["passed"] and state["verdict"] is None
+
+
+def test_new_bar_invalidates_state():
+    signature = scan_state.signature({})
+    scan_state.record_prefilter("BTC/USDT", TF, BAR, signature, {"symbol": "BTC/USDT"})
+    next_bar = BAR + 15 * 60_000
+
+    assert scan_state.get("BTC/USDT", TF, next_bar, signature) is None
+    # Eski mum için gelen karar, yeni mumun kaydına yazılmaz.
+    scan_state.record_prefilter("BTC/USDT", TF, next_bar, signature, {"symbol": "BTC/USDT"})
+    scan_state.record_verdict("BTC/USDT", TF, BAR, {"type": "neutral"})
+    assert scan_state.get("BTC/USDT", TF, next_bar, signature)["verdict"] is None
+
+    scan_state.record_prefilter("ETH/USDT", TF, BAR, signature, None)
+    scan_state.prune(TF, next_bar)
+    assert list(scan_state._states) == [("BTC/USDT", TF)]
+
+
+def test_signature_change_invalidates_state():
+    scan_state.record_prefilter("BTC/USDT", TF, BAR, scan_state.signature({"PROACTIVE_SCAN_ADX_THRESHOLD": 20}), None)
+
+    assert scan_state.get("BTC/USDT", TF, BAR, scan_state.signature({"PROACTIVE_SCAN_ADX_THRESHOLD": 25})) is None
+    # İmzaya girmeyen ayarlar kaydı geçersizleştirmez.
+    assert scan_state.get("BTC/USDT", TF, BAR, scan_state.signature({"PROACTIVE_SCAN_ADX_THRESHOLD": 20, "OTHER": 1})) is not None
@@ -0,0 +1,165 @@
+# backend/tests/test_scanner_pipeline.py
+# @author: Memba Co.
+
+import asyncio
+
+import pytest
+
+import database
+from core import agent, candidate_ranking, concurrency, scan_state, scanner
+from tools import async_exchange, symbol_registry
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+@pytest.fixture
+def scan(monkeypatch, settings):
+    """Borsa, haber ve LLM çağrıları sahte fonksiyonlarla değiştirilmiş bir tarama ortamı."""
+    settings.update({"PROACTIVE_SCAN_MAX_LLM_CANDIDATES": 10, "PROACTIVE_SCAN_WHITELIST": ["AAA", "BBB", "CCC"]})
+    monkeypatch.setattr(scan_state, "_states", {})
+    monkeypatch.setattr(candidate_ranking, "_last_analyzed", {})
+    monkeypatch.setattr(scanner, "_candidate_sources", lambda config: [])
+    monkeypatch.setattr(symbol_registry, "is_listed", lambda symbol: True)
+    monkeypatch.setattr(database, "log_event", lambda *args: None)
+    monkeypatch.setattr(scanner, "get_latest_crypto_news", lambda symbol: [])
+    monkeypatch.setattr(scanner, "get_twitter_sentiment", lambda symbol: {"score": 0.0})
+    concurrency.reset()
+
+    async def batch_pre_filter(candidates, config):
+        passed = [{**c, "indicators": {"RSI": 20, "ADX": 30, "ATR_PERCENT": 1.0, "volume": 2, "VOLUME_EMA": 1}} for c in candidates]
+        return passed, {c["symbol"] for c in candidates}
+
+    async def price(symbol):
+        return 1.0
+
+    async def indicators(symbol, timeframe):
+        return {"status": "success", "data": {"RSI": 20}}
+
+    monkeypatch.setattr(scanner, "_batch_pre_filter", batch_pre_filter)
+    monkeypatch.setattr(async_exchange, "get_price_with_cache", price)
+    monkeypatch.setattr(async_exchange, "get_technical_indicators", indicators)
+    monkeypatch.setattr(agent, "create_holistic_analysis_prompt", lambda **kwargs: kwargs["symbol"])
+    monkeypatch.setattr(agent, "llm_invoke_with_fallback", lambda prompt, fingerprint=None: FakeResponse(prompt))
+    monkeypatch.setattr(agent, "parse_agent_response", lambda content: {"symbol": content, "recommendation": "BEKLE"})
+    return settings
+
+
+def _run_scan():
+    return asyncio.run(asyncio.wait_for(scanner.execute_single_scan_cycle(), timeout=10))
+
+
+def test_scan_analyzes_all_candidates(scan):
+    result = _run_scan()
+
+    assert result["summary"]["ai_analyzed"] == 3
+    assert sorted(r["data"]["symbol"] for r in result["details"]) == ["AAA/USDT", "BBB/USDT", "CCC/USDT"]
+
+
+def test_scan_completes_when_ranking_stage_raises(scan, monkeypatch):
+    def broken_score(candidate, config):
+        raise RuntimeError("sıralama hatası")
+    monkeypatch.setattr(candidate_ranking, "score", broken_score)
+
+    result = _run_scan()
+
+    assert result["summary"]["ai_analyzed"] == 0
+
+
+def test_scan_completes_when_discovery_raises(scan, monkeypatch):
+    async def broken_discovery(config, on_batch):
+        await on_batch([{"symbol": "AAA/USDT", "source": "Whitelist"}])
+        raise RuntimeError("keşif hatası")
+    monkeypatch.setattr(scanner, "_discover_candidates", broken_discovery)
+
+    result = _run_scan()
+
+    # Hata öncesinde keşfedilen aday yine de analiz edilir.
+    assert [r["data"]["symbol"] for r in result["details"]] == ["AAA/USDT"]
+
+
+def _prefilter_with_rsi(rsi_by_symbol):
+    async def batch_pre_filter(candidates, config):
+        passed = [{**c, "indicators": {"RSI": rsi_by_symbol[c["symbol"]], "ADX": 30, "ATR_PERCENT": 1.0, "volume": 1, "VOLUME_EMA": 1}}
+                  for c in candidates]
+        return passed, {c["symbol"] for c in candidates}
+    return batch_pre_filter
+
+
+def test_budget_goes_to_best_ranked_candidates(scan, monkeypatch):
+    scan.update({"PROACTIVE_SCAN_MAX_LLM_CANDIDATES": 1, "PROACTIVE_SCAN_RANK_ADMIT_SCORE": 2.0, "PROACTIVE_SCAN_RANK_WINDOW_SECONDS": 60})
+    monkeypatch.setattr(scanner, "_batch_pre_filter", _prefilter_with_rsi({"AAA/USDT": 30, "BBB/USDT": 5, "CCC/USDT": 45}))
+
+    result = _run_scan()
+
+    assert [r["data"]["symbol"] for r in result["details"]] == ["BBB/USDT"]
+    assert result["summary"]["skipped_by_budget"] == 2
+
+
+def test_ranking_dispatches_before_discovery_finishes(scan, monkeypatch):
+    # Keşif, ilk aday analiz edilene kadar yeni aday göndermez; sıralama aşaması tüm
+    # adayları beklerse tarama ilerleyemez.
+    scan.update({"PROACTIVE_SCAN_WHITELIST": [], "PROACTIVE_SCAN_RANK_ADMIT_SCORE": 2.0, "PROACTIVE_SCAN_RANK_WINDOW_SECONDS": 0.05})
+    monkeypatch.setattr(scanner, "_batch_pre_filter", _prefilter_with_rsi({"AAA/USDT": 20, "BBB/USDT": 20}))
+    analyzed = []
+    monkeypatch.setattr(agent, "llm_invoke_with_fallback", lambda prompt, fingerprint=None: analyzed.append(prompt) or FakeResponse(prompt))
+    analyzed_before_discovery_ended = []
+
+    async def slow_discovery(config, on_batch):
+        await on_batch([{"symbol": "AAA/USDT", "source": "Whitelist"}])
+        for _ in range(100):
+            if analyzed:
+                break
+            await asyncio.sleep(0.02)
+        analyzed_before_discovery_ended.extend(analyzed)
+        await on_batch([{"symbol": "BBB/USDT", "source": "Whitelist"}])
+        return 2
+    monkeypatch.setattr(scanner, "_discover_candidates", slow_discovery)
+
+    result = _run_scan()
+
+    assert analyzed_before_discovery_ended == ["AAA/USDT"]
+    assert result["summary"]["ai_analyzed"] == 2
+
+
+def test_high_score_candidate_skips_the_window(scan, monkeypatch):
+    scan.update({"PROACTIVE_SCAN_RANK_ADMIT_SCORE": 0.0, "PROACTIVE_SCAN_RANK_WINDOW_SECONDS": 60})
+    started, started_before_discovery_ended = [], []
+
+    async def discovery(config, on_batch):
+        await on_batch([{"symbol": "AAA/USDT", "source": "Whitelist"}])
+        for _ in range(50):
+            if started:
+                break
+            await asyncio.sleep(0.02)
+        started_before_discovery_ended.extend(started)
+        return 1
+
+    async def indicators(symbol, timeframe):
+        started.append(symbol)
+        return {"status": "success", "data": {"RSI": 20}}
+    monkeypatch.setattr(scanner, "_discover_candidates", discovery)
+    monkeypatch.setattr(async_exchange, "get_technical_indicators", indicators)
+
+    result = _run_scan()
+
+    assert started_before_discovery_ended == ["AAA/USDT"]
+    assert result["summary"]["ai_analyzed"] == 1
+
+
+def test_auto_opened_trade_is_not_reopened_on_the_same_bar(scan, monkeypatch):
+    scan.update({"PROACTIVE_SCAN_AUTO_CONFIRM": True, "PROACTIVE_SCAN_WHITELIST": ["AAA"]})
+    opened = []
+    monkeypatch.setattr(scan_state, "current_bar", lambda timeframe: 1_700_000_100_000)
+    monkeypatch.setattr(agent, "parse_agent_response", lambda content: {"symbol": content, "recommendation": "AL"})
+    monkeypatch.setattr(scanner, "open_new_trade", lambda **kwargs: opened.append(kwargs["symbol"]))
+
+    first = _run_scan()
+    second = _run_scan()
+
+    assert opened == ["AAA/USDT"]
+    assert first["summary"]["auto_trades_opened"] == 1
+    assert second["summary"]["reused_verdicts"] == 1 and second["summary"]["auto_trades_opened"] == 0
+    assert second["details"][0]["type"] == "neutral" and second["details"][0]["reused"]
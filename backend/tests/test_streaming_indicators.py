@@ -0,0 +1,77 @@
+# backend/tests/test_streaming_indicators.py
+# @author: Memba Co.
+# Artımlı (streaming) göstergelerin her mumda pandas / pandas_ta ile aynı sonucu verdiğini doğrular.
+
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from tools.streaming_indicators import IndicatorState
+
+PARAMS = (14, 14, 14, 20)
+BAR_COUNT = 600
+TOLERANCE = 1e-6
+
+
+def synthetic_bars(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    bars, price, ts = [], 100.0, 1_700_000_000_000
+    for i in range(count):
+        open_ = price
+        close = max(0.01, open_ * (1 + rng.gauss(0, 0.01)))
+        high = max(open_, close) * (1 + abs(rng.gauss(0, 0.004)))
+        low = min(open_, close) * (1 - abs(rng.gauss(0, 0.004)))
+        volume = abs(rng.gauss(1000, 300))
+        bars.append([ts + i * 60_000, open_, high, low, close, volume])
+        price = close
+    return bars
+
+
+def streamed_values(bars: list) -> pd.DataFrame:
+    state = IndicatorState(PARAMS)
+    rows = []
+    for bar in bars:
+        state.update(bar)
+        rows.append({"RSI": state.rsi.value, "ADX": state.adx.value, "ATR": state.atr.value, "VOLUME_EMA": state.volume_ema.value})
+    return pd.DataFrame(rows)
+
+
+def assert_matches(streamed: pd.Series, reference: pd.Series):
+    # Her mumda hazır olma durumu (NaN) aynı olmalı, hazır değerler toleransı aşmamalı.
+    assert (streamed.isna() == reference.isna()).all(), f"{streamed.name}: hazır olma durumu farklı"
+    max_diff = (streamed - reference).abs().max()
+    assert max_diff <= TOLERANCE, f"{streamed.name}: en büyük fark {max_diff:.3e}"
+
+
+def test_volume_ema_matches_pandas():
+    bars = synthetic_bars(BAR_COUNT)
+    volume = pd.Series([b[5] for b in bars])
+
+    assert_matches(streamed_values(bars)["VOLUME_EMA"], volume.ewm(span=PARAMS[3], adjust=False).mean().rename("VOLUME_EMA"))
+
+
+def test_indicators_match_pandas_ta():
+    ta = pytest.importorskip("pandas_ta")
+    rsi_period, adx_period, atr_period, _ = PARAMS
+    bars = synthetic_bars(BAR_COUNT)
+    df = pd.DataFrame(bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    streamed = streamed_values(bars)
+
+    assert_matches(streamed["RSI"], ta.rsi(df['close'], length=rsi_period).rename("RSI"))
+    assert_matches(streamed["ADX"], ta.adx(df['high'], df['low'], df['close'], length=adx_period)[f"ADX_{adx_period}"].rename("ADX"))
+    assert_matches(streamed["ATR"], ta.atr(df['high'], df['low'], df['close'], length=atr_period).rename("ATR"))
+
+
+def test_snapshot_is_none_until_all_indicators_are_ready():
+    state = IndicatorState(PARAMS)
+    bars = synthetic_bars(60)
+    for bar in bars[:5]:
+        state.update(bar)
+    assert state.snapshot() is None
+
+    for bar in bars[5:]:
+        state.update(bar)
+    snapshot = state.snapshot()
+    assert snapshot is not None and not any(math.isnan(v) for v in snapshot.values() if isinstance(v, float))
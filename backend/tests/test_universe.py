@@ -0,0 +1,97 @@
+# backend/tests/test_universe.py
+# @author: Memba Co.
+
+import asyncio
+import time
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+
+import database
+from core import scanner, universe
+from tools import async_exchange, indicator_engine
+from tools.utils import last_closed_bar_open_ms
+
+TIMEFRAME = "15m"
+PARAMS = indicator_engine.DEFAULT_PARAMS
+
+
+def _entry(symbol, quote_volume=5e6, change=0.0, spike=None, bar_ts=None, **indicators):
+    values = {"RSI": 50.0, "ADX": 10.0, "ATR": 1.0, "ATR_PERCENT": 1.0, "VOLUME_EMA": 1.0, "close": 100.0, "volume": 1.0, **indicators}
+    if bar_ts is None:
+        bar_ts = last_closed_bar_open_ms(TIMEFRAME, int(time.time() * 1000))
+    return {"symbol": symbol, "quote_volume": quote_volume, "price_change_percent": change, "last_price": 100.0,
+            "volume_spike_ratio": spike, "indicator_key": (TIMEFRAME, PARAMS, bar_ts), **values}
+
+
+@pytest.fixture
+def index(monkeypatch, settings):
+    entries = {}
+    monkeypatch.setattr(universe, "_index", entries)
+    monkeypatch.setattr(universe, "_sources", {})
+    monkeypatch.setattr(universe, "_meta", {"refreshed_at": time.time()})
+    return entries
+
+
+def _fill(index, *entries):
+    index.update({e["symbol"]: e for e in entries})
+
+
+def test_top_gainers_losers_filters_by_volume(index):
+    _fill(index, _entry("A/USDT", change=12), _entry("B/USDT", change=5), _entry("C/USDT", change=-3),
+          _entry("D/USDT", change=-9), _entry("E/USDT", change=40, quote_volume=10))
+
+    assert universe.top_gainers_losers(1, 1e6) == ["A/USDT", "D/USDT"]
+
+
+def test_volume_spikes_sorted_by_ratio(index):
+    _fill(index, _entry("A/USDT", spike=6), _entry("B/USDT", spike=9), _entry("C/USDT", spike=2),
+          _entry("D/USDT", spike=None), _entry("E/USDT", spike=20, quote_volume=10))
+
+    assert universe.volume_spikes(5.0, 1e6) == ["B/USDT", "A/USDT"]
+
+
+def test_indicators_are_only_served_for_the_last_closed_bar(index):
+    previous_bar = last_closed_bar_open_ms(TIMEFRAME, int(time.time() * 1000)) - 15 * 60_000
+    _fill(index, _entry("A/USDT"), _entry("B/USDT", bar_ts=previous_bar), _entry("C/USDT", RSI=None))
+
+    assert universe.indicators("A/USDT", TIMEFRAME, PARAMS)["RSI"] == 50.0
+    assert universe.indicators("B/USDT", TIMEFRAME, PARAMS) is None
+    assert universe.indicators("C/USDT", TIMEFRAME, PARAMS) is None
+    assert universe.indicators("A/USDT", TIMEFRAME, (7, 14, 14, 20)) is None
+    assert universe.indicators("Z/USDT", TIMEFRAME, PARAMS) is None
+
+
+def test_batch_prefilter_merges_indexed_rows(index, monkeypatch):
+    _fill(index, _entry("A/USDT", RSI=20.0, ADX=35.0, volume=3.0), _entry("C/USDT"))
+    requested = []
+
+    async def get_closed_bars(symbols, timeframe, length):
+        requested.extend(symbols)
+        return {symbol: [] for symbol in symbols}, 0
+    monkeypatch.setattr(async_exchange, "get_closed_bars", get_closed_bars)
+    monkeypatch.setattr(database, "log_event", lambda *args: None)
+    candidates = [{"symbol": s, "source": "Whitelist"} for s in ("A/USDT", "B/USDT", "C/USDT")]
+
+    passed, evaluated = asyncio.run(scanner._batch_pre_filter(candidates, {}))
+
+    # Göstergesi dizinde olan semboller için mum okunmaz.
+    assert requested == ["B/USDT"]
+    assert [c["symbol"] for c in passed] == ["A/USDT"]
+    assert passed[0]["indicators"]["RSI"] == 20.0
+    assert evaluated == {"A/USDT", "C/USDT"}
+
+
+def test_refresh_job_follows_the_scanner_setting(settings):
+    scheduler = BackgroundScheduler()
+    settings.update({"UNIVERSE_INDEX_ENABLED": True, "PROACTIVE_SCAN_ENABLED": False})
+    universe.schedule_refresh_job(scheduler)
+    assert scheduler.get_job("universe_refresh_job") is None
+
+    settings["PROACTIVE_SCAN_ENABLED"] = True
+    universe.schedule_refresh_job(scheduler)
+    assert scheduler.get_job("universe_refresh_job") is not None
+
+    settings["PROACTIVE_SCAN_ENABLED"] = False
+    universe.schedule_refresh_job(scheduler)
+    assert scheduler.get_job("universe_refresh_job") is None
@@ -8,9 +8,14 @@
 from .exchange import (
     initialize_exchange,
     get_price_with_cache,
+    get_ticker_24h_index,
+    get_price_index,
     get_wallet_balance,
+    get_ohlcv_with_store,
+    get_ohlcv_range,
     get_market_price,
     get_technical_indicators,
+    get_indicator_set,
     _get_technical_indicators_logic, # HATA GİDERİLDİ: Bu satır eklendi
     get_atr_value,
     get_top_gainers_losers,
@@ -22,6 +27,9 @@ from .exchange import (
     fetch_open_orders,
 )
 
+# Asenkron borsa katmanı modül olarak sunulur: 'from tools import async_exchange'
+from . import async_exchange
+
 from .utils import (
     str_to_bool,
     _get_unified_symbol,
@@ -0,0 +1,337 @@
+# backend/tools/async_exchange.py
+# @author: Memba Co.
+# Bu modül, 'tools/exchange.py' içindeki okuma fonksiyonlarının ccxt.async_support
+# üzerine kurulu asenkron karşılıklarını sağlar. Tüm istekler tek bir paylaşılan
+# aiohttp oturumu ve bağlantı havuzu üzerinden olay döngüsünde (event loop) yürütülür;
+# böylece tarama ve pozisyon akışı thread havuzuna bağlı kalmaz, eşzamanlılık sadece
+# borsanın istek limitleriyle sınırlanır. Piyasa verileri senkron bağlantıdan kopyalanır,
+# mum deposu ve toplu piyasa anlık görüntüsü senkron katmanla ortak kullanılır.
+# Mum deposu (SQLite) okuma/yazmaları olay döngüsünü bloklamasın diye 'asyncio.to_thread' ile yürütülür.
+# Emir gönderme gibi durum değiştiren işlemler senkron katmanda kalır.
+
+import os
+import asyncio
+import logging
+
+import aiohttp
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from core import cache_manager
+from . import exchange as exchange_tools, indicator_engine, price_feed, rate_limiter, resampler, symbol_registry
+from .utils import _get_unified_symbol, str_to_bool, timeframe_to_ms, last_closed_bar_open_ms
+
+# Paylaşılan bağlantı havuzundaki en fazla eşzamanlı TCP bağlantısı sayısı.
+MAX_CONNECTIONS = 50
+
+exchange = None
+_session = None
+
+_ticker_snapshot_lock = asyncio.Lock()
+_price_snapshot_lock = asyncio.Lock()
+
+# 'exchange._single_flight' ile aynı mantığın olay döngüsü karşılığı.
+_inflight_tasks: dict[tuple, asyncio.Task] = {}
+
+
+async def _single_flight(key: tuple, coro_func, *args, **kwargs):
+    """
+    Aynı anahtar için devam eden bir istek varsa ona katılır, yoksa yenisini başlatır.
+    Paylaşılan görev 'shield' ile korunur; bekleyenlerden birinin iptal edilmesi
+    diğerlerinin isteğini iptal etmez.
+    """
+    task = _inflight_tasks.get(key)
+    if task is None:
+        task = asyncio.ensure_future(coro_func(*args, **kwargs))
+        _inflight_tasks[key] = task
+        task.add_done_callback(lambda _t, k=key: _inflight_tasks.pop(k, None))
+    else:
+        logging.debug(f"Tekil uçuş: devam eden istek paylaşılıyor {key}")
+    return await asyncio.shield(task)
+
+
+def _is_futures_exchange() -> bool:
+    return bool(exchange) and exchange.id == 'binance' and exchange.options.get('defaultType') == 'future'
+
+
+def _request_symbol(unified_symbol: str) -> str:
+    return symbol_registry.exchange_id(unified_symbol) if _is_futures_exchange() else unified_symbol
+
+
+async def initialize_async_exchange(market_type: str):
+    """
+    Asenkron borsa bağlantısını paylaşılan aiohttp oturumu ile başlatır.
+    Senkron bağlantının önceden başlatılmış olması gerekir; piyasa verileri ondan kopyalanır.
+    """
+    global exchange, _session
+    if exchange:
+        return
+    if not exchange_tools.exchange:
+        logging.error("Asenkron borsa bağlantısı başlatılamadı: Senkron borsa bağlantısı mevcut değil.")
+        return
+
+    use_testnet = str_to_bool(os.getenv("USE_TESTNET", "False"))
+    _session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300))
+
+    config_data = {
+        "apiKey": os.getenv("BINANCE_API_KEY"), "secret": os.getenv("BINANCE_SECRET_KEY"),
+        "options": {
+            "defaultType": market_type.lower(),
+            "warnOnFetchOpenOrdersWithoutSymbol": False,
+            "adjustForTime": True,
+            "timeDifference": exchange_tools.exchange.options.get('timeDifference', 0),
+        },
+        "enableRateLimit": False,
+        'timeout': 30000,
+        'session': _session,
+    }
+    exchange = rate_limiter.AsyncGovernedBinance(config_data)
+
+    if use_testnet and market_type.lower() == 'future':
+        exchange.set_sandbox_mode(True)
+
+    # Piyasaları tekrar indirmek yerine senkron bağlantıdaki verileri kullan.
+    exchange.set_markets(exchange_tools.exchange.markets, exchange_tools.exchange.currencies)
+    logging.info(f"--- Asenkron borsa bağlantısı AKTİF (bağlantı havuzu: {MAX_CONNECTIONS}). ---")
+
+
+async def close_async_exchange():
+    """Asenkron borsa bağlantısını ve paylaşılan aiohttp oturumunu kapatır."""
+    global exchange, _session
+    if exchange:
+        try:
+            await exchange.close()
+        except Exception as e:
+            logging.warning(f"Asenkron borsa bağlantısı kapatılırken hata: {e}")
+    if _session and not _session.closed:
+        await _session.close()
+    exchange, _session = None, None
+    logging.info("Asenkron borsa bağlantısı kapatıldı.")
+
+
+async def get_ohlcv_with_store(symbol: str, timeframe: str, limit: int = 500) -> list:
+    """'exchange.get_ohlcv_with_store' fonksiyonunun asenkron karşılığı."""
+    if not exchange:
+        return []
+    unified_symbol = _get_unified_symbol(symbol)
+
+    stored, fetch_params, current_open = await asyncio.to_thread(
+        exchange_tools._plan_store_fetch, unified_symbol, timeframe, limit, exchange.milliseconds())
+    request_symbol = _request_symbol(unified_symbol)
+    flight_key = ("ohlcv", request_symbol, timeframe, fetch_params.get("since"), fetch_params["limit"])
+    fetched = await _single_flight(flight_key, exchange.fetch_ohlcv, request_symbol, timeframe=timeframe, **fetch_params)
+    return await asyncio.to_thread(exchange_tools._merge_store_fetch, unified_symbol, timeframe, limit, stored, fetched, current_open)
+
+
+async def _load_closed_bars(unified_symbol: str, timeframe: str, limit: int, last_closed_open: int) -> list:
+    """'exchange._load_closed_bars' fonksiyonunun asenkron karşılığı."""
+    bars = await asyncio.to_thread(resampler.local_closed_bars, unified_symbol, timeframe, limit - 1, last_closed_open)
+    if bars is None:
+        bars = exchange_tools._split_closed_bars(await get_ohlcv_with_store(unified_symbol, timeframe, limit=limit), last_closed_open)
+    return bars
+
+
+async def get_indicator_set(symbol: str, timeframe: str, params: tuple = indicator_engine.DEFAULT_PARAMS) -> dict:
+    """'exchange.get_indicator_set' fonksiyonunun asenkron karşılığı; aynı hafızayı paylaşır."""
+    if not exchange:
+        return {"status": "error", "message": "Borsa bağlantısı başlatılmamış."}
+
+    unified_symbol = _get_unified_symbol(symbol)
+    known_failure = cache_manager.get_negative(f"indicators_{unified_symbol}_{timeframe}")
+    if known_failure:
+        return known_failure
+    if not symbol_registry.is_listed(unified_symbol):
+        return exchange_tools._remember_indicator_failure(unified_symbol, timeframe, {"status": "error", "reason": "not_listed", "message": f"Sembol borsada listelenmiyor: {unified_symbol}"})
+    last_closed_open = last_closed_bar_open_ms(timeframe, exchange.milliseconds())
+    cached = indicator_engine.lookup(unified_symbol, timeframe, params, last_closed_open)
+    if cached:
+        return cached
+
+    try:
+        limit = indicator_engine.bars_needed(unified_symbol, timeframe, params, last_closed_open, timeframe_to_ms(timeframe))
+        bars = await _load_closed_bars(unified_symbol, timeframe, limit, last_closed_open)
+        result = indicator_engine.update(unified_symbol, timeframe, bars, params)
+        if result is None:
+            if limit <= indicator_engine.HISTORY_BARS:
+                bars = await _load_closed_bars(unified_symbol, timeframe, indicator_engine.HISTORY_BARS + 1, last_closed_open)
+            result = indicator_engine.rebuild(unified_symbol, timeframe, bars, params)
+    except Exception as e:
+        logging.error(f"Teknik gösterge alınırken genel hata ({unified_symbol}, {timeframe}): {e}", exc_info=True)
+        result = exchange_tools._indicator_error(e)
+    return exchange_tools._remember_indicator_failure(unified_symbol, timeframe, result)
+
+
+async def get_closed_bars(symbols: list[str], timeframe: str, length: int) -> tuple[dict, int]:
+    """
+    Birden çok sembolün son 'length' kapanmış mumunu eşzamanlı okur. Toplu gösterge
+    hesaplaması için (sembol -> mumlar, son kapanmış mumun açılış zamanı) döndürür.
+    Verisi okunamayan semboller boş liste ile döner.
+    """
+    last_closed_open = last_closed_bar_open_ms(timeframe, exchange.milliseconds()) if exchange else 0
+
+    async def load(symbol):
+        try:
+            bars = await get_ohlcv_with_store(symbol, timeframe, limit=length + 1)
+            return exchange_tools._split_closed_bars(bars, last_closed_open)
+        except Exception as e:
+            logging.debug(f"Toplu mum okuma hatası ({symbol}, {timeframe}): {e}")
+            return []
+
+    results = await asyncio.gather(*(load(s) for s in symbols))
+    return dict(zip(symbols, results)), last_closed_open
+
+
+async def get_technical_indicators(symbol: str, timeframe: str) -> dict:
+    """'exchange._get_technical_indicators_logic' fonksiyonunun asenkron karşılığı."""
+    return indicator_engine.prompt_view(await get_indicator_set(symbol, timeframe))
+
+
+async def get_atr_value(symbol: str, timeframe: str, atr_period: int = 14) -> dict:
+    rsi_period, adx_period, _, volume_avg_period = indicator_engine.DEFAULT_PARAMS
+    result = await get_indicator_set(symbol, timeframe, (rsi_period, adx_period, atr_period, volume_avg_period))
+    if result.get("status") != "success":
+        return {"status": "error", "message": result.get("message", "ATR hesaplanamadı")}
+    return {"status": "success", "value": result["data"]["ATR"]}
+
+
+async def get_ticker_24h_index() -> dict[str, dict]:
+    """
+    'exchange.get_ticker_24h_index' fonksiyonunun asenkron karşılığı. Anlık görüntü
+    senkron katmanla ortaktır; hangi taraf yenilerse diğeri de aynı veriyi okur.
+    """
+    if not _is_futures_exchange():
+        return {}
+    async with _ticker_snapshot_lock:
+        if exchange_tools._snapshot_needs_refresh("tickers", exchange_tools.MARKET_SNAPSHOT_TICKER_TTL):
+            try:
+                rows = await exchange.fapiPublicGetTicker24hr()
+                exchange_tools._store_snapshot("tickers", {row['symbol']: row for row in rows if row.get('symbol')})
+            except Exception as e:
+                exchange_tools._snapshot_failed("tickers", e)
+        return exchange_tools._usable_snapshot("tickers", exchange_tools.MARKET_SNAPSHOT_TICKER_TTL)
+
+
+async def get_price_index() -> dict[str, float]:
+    """'exchange.get_price_index' fonksiyonunun asenkron karşılığı."""
+    if not _is_futures_exchange():
+        return {}
+    async with _price_snapshot_lock:
+        if exchange_tools._snapshot_needs_refresh("prices", exchange_tools.MARKET_SNAPSHOT_PRICE_TTL):
+            try:
+                rows = await exchange.fapiPublicGetTickerPrice()
+                exchange_tools._store_snapshot("prices", {row['symbol']: float(row['price']) for row in rows if row.get('symbol') and row.get('price') is not None})
+            except Exception as e:
+                exchange_tools._snapshot_failed("prices", e)
+        return exchange_tools._usable_snapshot("prices", exchange_tools.MARKET_SNAPSHOT_PRICE_TTL)
+
+
+async def get_snapshot_price(symbol: str) -> float | None:
+    return (await get_price_index()).get(symbol_registry.exchange_id(_get_unified_symbol(symbol)))
+
+
+@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
+async def _fetch_price_natively(symbol: str) -> float | None:
+    if not exchange: return None
+    try:
+        ticker = await exchange.fetch_ticker(_request_symbol(_get_unified_symbol(symbol)))
+        return float(ticker["last"]) if ticker and ticker.get("last") is not None else None
+    except Exception as e:
+        logging.warning(f"{symbol} için fiyat çekilirken yeniden denenecek hata: {e}")
+        raise
+
+
+async def get_price_with_cache(symbol: str) -> float | None:
+    """
+    'exchange.get_price_with_cache' fonksiyonunun asenkron karşılığı. Sıralama aynıdır:
+    WebSocket fiyat defteri, önbellek, toplu fiyat indeksi ve son olarak sembol bazlı REST isteği.
+    """
+    streamed_price = price_feed.get_price(symbol)
+    if streamed_price is not None:
+        return streamed_price
+
+    async def load_price():
+        price = await get_snapshot_price(symbol)
+        if price is None:
+            price = await _single_flight(("ticker", symbol), _fetch_price_natively, symbol)
+        return price
+
+    return await cache_manager.get_or_refresh_async(f"price_{symbol}", load_price)
+
+
+async def get_prices(symbols: list[str]) -> dict[str, float | None]:
+    """Birden fazla sembolün fiyatını eşzamanlı olarak alır. Hata alan semboller için None döner."""
+    results = await asyncio.gather(*(get_price_with_cache(s) for s in symbols), return_exceptions=True)
+    prices = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logging.warning(f"{symbol} için fiyat alınamadı: {result}")
+            result = None
+        prices[symbol] = result
+    return prices
+
+
+async def get_top_gainers_losers(top_n: int, min_volume_usdt: int) -> list:
+    from core import app_config
+    if not exchange or app_config.settings.get('DEFAULT_MARKET_TYPE') != 'future': return []
+    try:
+        return exchange_tools._select_gainers_losers(list((await get_ticker_24h_index()).values()), top_n, min_volume_usdt)
+    except Exception as e:
+        logging.error(f"Gainer/Loser listesi alınırken hata: {e}", exc_info=True)
+        return []
+
+
+async def get_volume_spikes(timeframe: str, period: int, multiplier: float, min_volume_usdt: int) -> list:
+    """
+    'exchange.get_volume_spikes' fonksiyonunun asenkron karşılığı. Semboller sınırlı
+    eşzamanlılıkla işlenir; istek hızı merkezi ağırlık sınırlayıcısı tarafından düzenlenir.
+    """
+    from core import app_config
+    if not exchange or app_config.settings.get('DEFAULT_MARKET_TYPE') != 'future': return []
+    logging.info(f"Hacim patlaması taraması başlatıldı: Zaman Aralığı={timeframe}, Periyot={period}, Çarpan={multiplier}")
+    try:
+        filtered_tickers = exchange_tools._filter_usdt_tickers(list((await get_ticker_24h_index()).values()), min_volume_usdt)
+        now_ms = exchange.milliseconds()
+        # Erken eleme her sembol için mum deposunu okur; olay döngüsü bloklanmasın diye thread'de yapılır.
+        candidates = await asyncio.to_thread(
+            lambda: [t for t in filtered_tickers if not exchange_tools._volume_spike_ruled_out(t, timeframe, period, multiplier, now_ms)])
+        logging.info(f"Hacim analizi için {len(filtered_tickers)} adet sembol ön filtreden geçti, {len(filtered_tickers) - len(candidates)} tanesi 24s verisiyle erkenden elendi.")
+        pool = asyncio.Semaphore(exchange_tools.VOLUME_SPIKE_CONCURRENCY)
+
+        async def check_symbol(symbol):
+            try:
+                async with pool:
+                    bars = await get_ohlcv_with_store(symbol, timeframe, limit=period + 1)
+                return exchange_tools._volume_spike_from_bars(symbol, bars, period, multiplier)
+            except Exception:
+                return None
+
+        results = await asyncio.gather(*(check_symbol(t['symbol']) for t in candidates))
+        volume_spikes = [r for r in results if r]
+        volume_spikes.sort(key=lambda x: x['spike_ratio'], reverse=True)
+        return volume_spikes
+    except Exception as e:
+        logging.error(f"Hacim patlaması listesi alınırken genel hata: {e}", exc_info=True)
+        return []
+
+
+async def fetch_open_orders(symbol: str = None) -> list:
+    if not exchange:
+        logging.error("Borsa bağlantısı başlatılmadığı için açık emirler alınamıyor.")
+        return []
+    try:
+        request_symbol = _request_symbol(_get_unified_symbol(symbol)) if symbol else None
+        return await _single_flight(("open_orders", request_symbol), exchange.fetch_open_orders, request_symbol)
+    except Exception as e:
+        logging.error(f"Açık emirler alınırken hata: {e}", exc_info=True)
+        return []
+
+
+async def get_open_positions_from_exchange() -> list:
+    from core import app_config
+    if not exchange or app_config.settings.get('DEFAULT_MARKET_TYPE') != 'future':
+        return []
+    try:
+        positions = await _single_flight(("positions",), exchange.fetch_positions)
+        return [p for p in positions if p.get('contracts') and float(p['contracts']) != 0]
+    except Exception as e:
+        logging.error(f"Borsadan pozisyonlar alınırken hata: {e}", exc_info=True)
+        return []
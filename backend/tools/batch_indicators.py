@@ -0,0 +1,144 @@
+# backend/tools/batch_indicators.py
+# @author: Memba Co.
+# Bu modül, çok sayıda sembolün göstergelerini (RSI, ADX, ATR, ATR%, hacim EMA) tek
+# seferde hesaplar. Semboller aynı zaman ızgarasına hizalanıp (N, T) boyutlu numpy
+# dizilerine yerleştirilir; her zaman adımı tüm semboller için tek bir vektör
+# işlemiyle ilerletilir. Böylece yüzlerce sembolün ön filtrelemesi, sembol başına ayrı
+# bir DataFrame/pandas_ta hattı yerine birkaç milisaniyelik tek bir geçişe iner.
+# Formüller 'streaming_indicators' (ve dolayısıyla pandas_ta) ile aynıdır.
+
+import numpy as np
+
+from .indicator_engine import MIN_BARS
+
+
+def stack_bars(bars_by_symbol: dict, last_closed_open: int, tf_ms: int, length: int) -> tuple[list, dict]:
+    """
+    Her sembolün kapanmış mumlarını, 'last_closed_open' ile biten ortak zaman ızgarasına
+    hizalar. Eksik mumlar NaN olarak kalır. (semboller, {open/high/low/close/volume: (N, T)}) döner.
+    """
+    symbols = list(bars_by_symbol)
+    first_open = last_closed_open - (length - 1) * tf_ms
+    arrays = {key: np.full((len(symbols), length), np.nan) for key in ("open", "high", "low", "close", "volume")}
+    for row, symbol in enumerate(symbols):
+        bars = np.asarray([b[:6] for b in bars_by_symbol[symbol] if b and all(v is not None for v in b[:6])], dtype=float)
+        if bars.size == 0:
+            continue
+        columns = (bars[:, 0] - first_open) // tf_ms
+        inside = (columns >= 0) & (columns < length)
+        columns = columns[inside].astype(int)
+        for index, key in enumerate(("open", "high", "low", "close", "volume"), start=1):
+            arrays[key][row, columns] = bars[inside, index]
+    return symbols, arrays
+
+
+class _BatchEWM:
+    """'streaming_indicators.AdjustedEWM' hesabının (N,) boyutlu vektör hali."""
+
+    def __init__(self, size: int, alpha: float, min_periods: int):
+        self.decay = 1.0 - alpha
+        self.min_periods = max(min_periods, 1)
+        self.num = np.zeros(size)
+        self.den = np.zeros(size)
+        self.count = np.zeros(size, dtype=int)
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        valid = ~np.isnan(values)
+        self.num = np.where(valid, np.nan_to_num(values) + self.decay * self.num, self.decay * self.num)
+        self.den = np.where(valid, 1.0 + self.decay * self.den, self.decay * self.den)
+        self.count += valid
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where((self.count >= self.min_periods) & (self.den != 0), self.num / self.den, np.nan)
+
+
+def _rma(size: int, length: int) -> _BatchEWM:
+    return _BatchEWM(size, 1.0 / length, length)
+
+
+def compute_batch(arrays: dict, params: tuple) -> dict:
+    """
+    (N, T) dizilerinden son zaman adımındaki gösterge değerlerini (N,) dizileri olarak
+    döndürür. Yeterli geçmişi olmayan veya son mumu eksik olan sembollerde değerler NaN olur.
+    İlk mumundan sonra penceresinde eksik mum olan semboller de NaN döner: burada eksik
+    mum zamanı ilerletip ortalamaları söndürür (pandas 'ignore_na=False'), artımlı motor
+    ise mumları aradaki boşluğu bilmeden art arda işler; iki sonuç tutarlı olmaz.
+    """
+    rsi_period, adx_period, atr_period, volume_avg_period = params
+    high, low, close, volume = arrays["high"], arrays["low"], arrays["close"], arrays["volume"]
+    size, length = close.shape
+
+    gain, loss = _rma(size, rsi_period), _rma(size, rsi_period)
+    atr, adx_atr = _rma(size, atr_period), _rma(size, adx_period)
+    pos_dm, neg_dm, dx_rma = _rma(size, adx_period), _rma(size, adx_period), _rma(size, adx_period)
+    volume_alpha = 2.0 / (volume_avg_period + 1)
+    volume_ema = np.full(size, np.nan)
+    rsi = atr_value = adx = np.full(size, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for t in range(length):
+            v = volume[:, t]
+            volume_ema = np.where(np.isnan(v), volume_ema,
+                                  np.where(np.isnan(volume_ema), v, volume_alpha * v + (1.0 - volume_alpha) * volume_ema))
+            if t == 0:
+                continue
+
+            change = close[:, t] - close[:, t - 1]
+            gain_avg = gain.update(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)))
+            loss_avg = loss.update(np.where(np.isnan(change), np.nan, np.minimum(change, 0.0)))
+            denominator = gain_avg + np.abs(loss_avg)
+            rsi = np.where(denominator != 0, 100.0 * gain_avg / denominator, np.nan)
+
+            prev_close = close[:, t - 1]
+            true_range = np.maximum.reduce([np.abs(high[:, t] - low[:, t]), np.abs(high[:, t] - prev_close), np.abs(prev_close - low[:, t])])
+            atr_value = atr.update(true_range)
+            adx_atr_value = adx_atr.update(true_range)
+
+            up = high[:, t] - high[:, t - 1]
+            down = low[:, t - 1] - low[:, t]
+            missing = np.isnan(up) | np.isnan(down)
+            pos = np.where(missing, np.nan, np.where((up > down) & (up > 0), up, 0.0))
+            neg = np.where(missing, np.nan, np.where((down > up) & (down > 0), down, 0.0))
+            dmp = 100.0 / adx_atr_value * pos_dm.update(pos)
+            dmn = 100.0 / adx_atr_value * neg_dm.update(neg)
+            dx = np.where((adx_atr_value != 0) & (dmp + dmn != 0), 100.0 * np.abs(dmp - dmn) / (dmp + dmn), np.nan)
+            adx = dx_rma.update(dx)
+
+        last_close = close[:, -1]
+        atr_percent = np.where(last_close > 0, atr_value / last_close * 100, np.nan)
+
+    observed = ~np.isnan(close)
+    gapped = (np.logical_or.accumulate(observed, axis=1) & ~observed).any(axis=1)
+    rsi, adx, atr_value, atr_percent, volume_ema = (
+        np.where(gapped, np.nan, values) for values in (rsi, adx, atr_value, atr_percent, volume_ema))
+
+    return {
+        "RSI": rsi,
+        "ADX": adx,
+        "ATR": atr_value,
+        "ATR_PERCENT": atr_percent,
+        "VOLUME_EMA": volume_ema,
+        "close": last_close,
+        "volume": volume[:, -1],
+        "bar_count": observed.sum(axis=1),
+    }
+
+
+def prefilter_mask(indicators: dict, config: dict) -> np.ndarray:
+    """'PROACTIVE_SCAN_*' eşiklerini dizi maskeleri olarak uygular; (N,) boyutlu bool dizi döner."""
+    rsi, adx = indicators["RSI"], indicators["ADX"]
+    rsi_lower = config.get('PROACTIVE_SCAN_RSI_LOWER', 35)
+    rsi_upper = config.get('PROACTIVE_SCAN_RSI_UPPER', 65)
+    adx_threshold = config.get('PROACTIVE_SCAN_ADX_THRESHOLD', 20)
+
+    mask = indicators["bar_count"] >= MIN_BARS
+    mask &= ~np.isnan(rsi) & ~np.isnan(adx) & ~np.isnan(indicators["close"])
+    mask &= ((rsi < rsi_lower) | (rsi > rsi_upper)) & (adx > adx_threshold)
+
+    if config.get('PROACTIVE_SCAN_USE_VOLATILITY_FILTER', True):
+        mask &= indicators["ATR_PERCENT"] >= config.get('PROACTIVE_SCAN_ATR_THRESHOLD_PERCENT', 0.5)
+
+    if config.get('PROACTIVE_SCAN_USE_VOLUME_FILTER', True):
+        volume_multiplier = config.get('PROACTIVE_SCAN_VOLUME_CONFIRM_MULTIPLIER', 1.2)
+        mask &= indicators["volume"] >= indicators["VOLUME_EMA"] * volume_multiplier
+
+    return mask
@@ -0,0 +1,115 @@
+# backend/tools/candle_store.py
+# @author: Memba Co.
+# Bu modül, borsadan çekilen kapanmış OHLCV mumlarını (sembol, zaman aralığı)
+# anahtarıyla yerel bir SQLite deposunda (data/candles.db) saklar.
+# Böylece her tüketici aynı mumları tekrar tekrar borsadan indirmek yerine
+# sadece yeni kapanan mumları ekler ve aralık sorgularını yerelden yanıtlar.
+
+import os
+import sqlite3
+import logging
+import threading
+
+from database.database import DATA_DIR
+
+CANDLE_DB_FILE = os.path.join(DATA_DIR, "candles.db")
+
+# Her iş parçacığı (thread) kendi bağlantısını kullanır; SQLite bağlantıları
+# thread'ler arasında güvenli bir şekilde paylaşılamaz.
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Mevcut thread için depo bağlantısını döndürür, gerekirse tabloyu oluşturur."""
+    global _initialized
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(CANDLE_DB_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if not _initialized:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ohlcv (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume REAL NOT NULL,
+                    PRIMARY KEY (symbol, timeframe, ts)
+                ) WITHOUT ROWID
+            ''')
+            conn.commit()
+            _initialized = True
+            logging.info(f"Yerel mum deposu hazır. Yol: {CANDLE_DB_FILE}")
+    _local.conn = conn
+    return conn
+
+
+def upsert_bars(symbol: str, timeframe: str, bars: list) -> int:
+    """
+    Kapanmış mumları depoya yazar. Aynı zaman damgasına sahip mevcut mumlar güncellenir.
+    Yazılan mum sayısını döndürür.
+    """
+    rows = [
+        (symbol, timeframe, int(b[0]), float(b[1]), float(b[2]), float(b[3]), float(b[4]), float(b[5] or 0.0))
+        for b in bars
+        if b and all(v is not None for v in b[:5])
+    ]
+    if not rows:
+        return 0
+    conn = _get_connection()
+    try:
+        conn.executemany('INSERT OR REPLACE INTO ohlcv (symbol, timeframe, ts, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logging.error(f"Mum deposuna yazılırken hata ({symbol}, {timeframe}): {e}")
+        return 0
+    return len(rows)
+
+
+def get_last_timestamp(symbol: str, timeframe: str) -> int | None:
+    """Depodaki en son mumun açılış zamanını (ms) döndürür."""
+    row = _get_connection().execute('SELECT MAX(ts) FROM ohlcv WHERE symbol = ? AND timeframe = ?', (symbol, timeframe)).fetchone()
+    return row[0] if row and row[0] is not None else None
+
+
+def get_first_timestamp(symbol: str, timeframe: str) -> int | None:
+    """Depodaki en eski mumun açılış zamanını (ms) döndürür."""
+    row = _get_connection().execute('SELECT MIN(ts) FROM ohlcv WHERE symbol = ? AND timeframe = ?', (symbol, timeframe)).fetchone()
+    return row[0] if row and row[0] is not None else None
+
+
+def get_bars(symbol: str, timeframe: str, limit: int = None, since: int = None, until: int = None) -> list[list]:
+    """
+    Depodan mumları artan zaman sırasıyla döndürür.
+    'since' ve 'until' (ms, dahil) verilirse aralık sorgusu yapılır; 'limit' verilirse
+    aralıktaki en son 'limit' adet mum döndürülür.
+    """
+    query = 'SELECT ts, open, high, low, close, volume FROM ohlcv WHERE symbol = ? AND timeframe = ?'
+    params = [symbol, timeframe]
+    if since is not None:
+        query += ' AND ts >= ?'
+        params.append(int(since))
+    if until is not None:
+        query += ' AND ts <= ?'
+        params.append(int(until))
+
+    if limit is not None:
+        query += ' ORDER BY ts DESC LIMIT ?'
+        params.append(int(limit))
+        rows = _get_connection().execute(query, params).fetchall()
+        rows.reverse()
+    else:
+        query += ' ORDER BY ts ASC'
+        rows = _get_connection().execute(query, params).fetchall()
+    return [list(r) for r in rows]
@@ -4,8 +4,10 @@
 import os
 import ccxt
 import time
-import pandas as pd
-import pandas_ta as ta
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
 import logging
 from dotenv import load_dotenv
 from langchain.tools import tool
@@ -15,13 +17,46 @@ import requests
 from requests.adapters import HTTPAdapter
 
 from core import cache_manager 
-from .utils import _get_unified_symbol, _parse_symbol_timeframe_input, str_to_bool
+from . import candle_store, indicator_engine, market_cache, price_feed, rate_limiter, resampler, symbol_registry
+from .utils import _get_unified_symbol, _parse_symbol_timeframe_input, str_to_bool, timeframe_to_ms, current_bar_open_ms, last_closed_bar_open_ms, next_bar_open_ms, bars_are_contiguous
 
 dotenv_path = Path(__file__).resolve().parent.parent / '.env'
 load_dotenv(dotenv_path=dotenv_path)
 
 exchange = None
 
+# --- Tekil Uçuş (Single-Flight) İstek Birleştirme ---
+# Aynı anahtar için eşzamanlı gelen istekler borsaya tek bir kez gider; ilk çağıran
+# (lider) isteği yapar, diğerleri aynı sonucu (veya hatayı) bekleyip paylaşır.
+# Sonuç saklanmaz, istek tamamlanınca anahtar serbest bırakılır; kalıcılık için
+# önbellek katmanı kullanılır.
+_inflight_calls: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(key: tuple, func, *args, **kwargs):
+    """'func' çağrısını 'key' için devam eden bir çağrı varsa onunla birleştirir."""
+    with _inflight_lock:
+        future = _inflight_calls.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _inflight_calls[key] = future
+
+    if not is_leader:
+        logging.debug(f"Tekil uçuş: devam eden istek paylaşılıyor {key}")
+        return future.result()
+
+    try:
+        result = func(*args, **kwargs)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight_calls.pop(key, None)
+
 @retry(wait=wait_exponential(multiplier=2, min=4, max=30), stop=stop_after_attempt(3))
 def _load_markets_with_retry(exchange_instance):
     logging.info("Borsa piyasa verileri yükleniyor (deneniyor)...")
@@ -56,17 +91,28 @@ def initialize_exchange(market_type: str):
             "warnOnFetchOpenOrdersWithoutSymbol": False,
             "adjustForTime": True,
         },
-        "enableRateLimit": True, 
+        # Hız sınırlaması ccxt yerine merkezi ağırlık sınırlayıcısı (rate_limiter) tarafından yapılır.
+        "enableRateLimit": False,
         'timeout': 30000,
         'session': session,
     }
 
-    exchange = ccxt.binance(config_data)
+    exchange = rate_limiter.GovernedBinance(config_data)
     
     if use_testnet and market_type.lower() == 'future':
         exchange.set_sandbox_mode(True)
         logging.info("Binance Testnet modu etkinleştirildi.")
 
+    cached = market_cache.load(market_type, use_testnet)
+    if cached:
+        # Katalog diskten anında yüklenir; eskiyse açılışı bekletmeden arka planda yenilenir.
+        market_cache.apply(exchange, cached["markets"], cached.get("currencies"))
+        symbol_registry.rebuild(exchange.markets, market_type)
+        logging.info(f"--- Piyasalar, '{market_type.upper()}' pazarı için disk önbelleğinden yüklendi ({len(exchange.markets)} piyasa). Borsa bağlantısı AKTİF. ---")
+        if market_cache.is_stale(cached):
+            threading.Thread(target=refresh_markets, name="market-refresh", daemon=True).start()
+        return
+
     try:
         _load_markets_with_retry(exchange)
         logging.info(f"--- Piyasalar, '{market_type.upper()}' pazarı için başarıyla yüklendi. Borsa bağlantısı AKTİF. ---")
@@ -74,56 +120,217 @@ def initialize_exchange(market_type: str):
         logging.critical(f"!!! KRİTİK HATA: Borsa piyasaları yüklenemedi. Bu genellikle geçersiz API anahtarlarından veya Binance bağlantı sorunlarından kaynaklanır. Hata: {e}", exc_info=True)
         exchange = None
         raise e
+    symbol_registry.rebuild(exchange.markets, market_type)
+    _save_market_cache(exchange)
 
-def _get_technical_indicators_logic(symbol: str, timeframe: str) -> dict:
+def _save_market_cache(exchange_instance):
+    try:
+        market_cache.save(exchange_instance.options.get('defaultType', 'future'), exchange_instance.isSandboxModeEnabled, exchange_instance.markets, exchange_instance.currencies)
+    except Exception as e:
+        logging.warning(f"Piyasa kataloğu diske yazılamadı: {e}")
+
+def refresh_markets():
     """
-    Teknik göstergeleri hesaplayan ana mantık fonksiyonu.
-    Bu fonksiyon LangChain @tool dekoratörünü içermez.
+    Piyasa kataloğunu borsadan ayrı bir bağlantı ile yeniden indirir, diske yazar ve
+    senkron/asenkron bağlantılardaki kataloğu atomik olarak değiştirir. İndirme
+    sürerken mevcut katalog kullanılmaya devam eder.
     """
     if not exchange:
-        return {"status": "error", "message": "Borsa bağlantısı başlatılmamış."}
-    
-    unified_symbol = _get_unified_symbol(symbol)
-    request_symbol = unified_symbol.replace('/', '') if exchange.id == 'binance' and exchange.options.get('defaultType') == 'future' else unified_symbol
-
+        return
+    loader = rate_limiter.GovernedBinance({
+        "apiKey": exchange.apiKey, "secret": exchange.secret,
+        "options": {"defaultType": exchange.options.get('defaultType')},
+        "enableRateLimit": False,
+        'timeout': 30000,
+    })
+    if exchange.isSandboxModeEnabled:
+        loader.set_sandbox_mode(True)
     try:
-        bars = exchange.fetch_ohlcv(request_symbol, timeframe=timeframe, limit=500)
+        _load_markets_with_retry(loader)
+    except Exception as e:
+        logging.warning(f"Piyasa kataloğu arka planda yenilenemedi, mevcut katalog kullanılmaya devam ediliyor: {e}")
+        return
+
+    market_cache.apply(exchange, loader.markets, loader.currencies)
+    symbol_registry.rebuild(loader.markets, exchange.options.get('defaultType', 'future'))
+    from . import async_exchange
+    if async_exchange.exchange:
+        market_cache.apply(async_exchange.exchange, loader.markets, loader.currencies)
+    _save_market_cache(loader)
+    logging.info(f"Piyasa kataloğu yenilendi ({len(loader.markets)} piyasa).")
+
+# Binance vadeli piyasasında tek bir kline isteğinde alınabilecek en fazla mum sayısı.
+MAX_OHLCV_PER_REQUEST = 1000
+
+def _fetch_ohlcv_paginated(request_symbol: str, timeframe: str, since: int, until: int) -> list:
+    """[since, until] aralığındaki mumları, gerekirse birden fazla istekle borsadan çeker."""
+    all_bars = []
+    while since <= until:
+        bars = exchange.fetch_ohlcv(request_symbol, timeframe=timeframe, since=since, limit=MAX_OHLCV_PER_REQUEST)
         if not bars:
-            return {"status": "error", "message": f"Geçmiş veri bulunamadı: {unified_symbol}."}
-        
-        df = pd.DataFrame(bars, columns=["timestamp", "open", "high", "low", "close", "volume"])
-        
-        required_data_points = 100 
-        if len(df) < required_data_points:
-            return {"status": "error", "message": f"Teknik analiz için yetersiz veri: {len(df)}/{required_data_points} mum çubuğu bulundu."}
-        
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        df.dropna(subset=['open', 'high', 'low', 'close', 'volume'], inplace=True)
-        
-        if len(df) < required_data_points:
-            return {"status": "error", "message": f"Veri temizliğinden sonra yetersiz veri: {len(df)}/{required_data_points} mum çubuğu kaldı."}
+            break
+        all_bars.extend(b for b in bars if b[0] <= until)
+        if len(bars) < MAX_OHLCV_PER_REQUEST or bars[-1][0] >= until:
+            break
+        since = bars[-1][0] + 1
+    return all_bars
+
+def _plan_store_fetch(unified_symbol: str, timeframe: str, limit: int, now_ms: int) -> tuple[list, dict, int]:
+    """
+    Depodaki kapanmış mumları okur ve eksik kısmı tamamlamak için gereken borsa isteğinin
+    parametrelerini belirler. (depodaki_mumlar, fetch_ohlcv_parametreleri, güncel_mum_açılışı) döndürür.
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    current_open = current_bar_open_ms(timeframe, now_ms)
 
-        df.ta.rsi(length=14, append=True)
-        df.ta.adx(length=14, append=True)
-        df.dropna(inplace=True)
+    stored = candle_store.get_bars(unified_symbol, timeframe, limit=limit, until=current_open - 1)
+    missing_bars = (current_open - stored[-1][0]) // tf_ms if stored else None
 
-        if df.empty:
-            return {"status": "error", "message": f"Hesaplama sonrası geçerli veri kalmadı. Sembol: {unified_symbol}"}
+    if (not stored or missing_bars >= MAX_OHLCV_PER_REQUEST or len(stored) + missing_bars < limit
+            or not bars_are_contiguous(stored, timeframe)):
+        # Depo boş, çok eski, istenen geçmişi karşılamıyor veya arada eksik mum var: tam çekim yapılır.
+        return stored, {"limit": limit}, current_open
+    return stored, {"since": stored[-1][0] + 1, "limit": missing_bars + 1}, current_open
 
-        last = df.iloc[-1]
-        rsi_val = last.get('RSI_14')
-        adx_val = last.get('ADX_14')
+def _merge_store_fetch(unified_symbol: str, timeframe: str, limit: int, stored: list, fetched: list, current_open: int) -> list:
+    """Borsadan gelen yeni kapanmış mumları depoya yazar ve depodaki mumlarla birleştirir."""
+    if not fetched:
+        return stored[-limit:]
 
-        if rsi_val is None or pd.isna(rsi_val) or adx_val is None or pd.isna(adx_val):
-            return {"status": "error", "message": f"Hesaplama sonrası geçersiz gösterge değeri. Sembol: {unified_symbol}"}
+    closed = [b for b in fetched if b[0] < current_open]
+    if closed:
+        candle_store.upsert_bars(unified_symbol, timeframe, closed)
 
-        indicators = {"RSI": float(rsi_val), "ADX": float(adx_val)}
-        return {"status": "success", "data": indicators}
-        
+    merged = {b[0]: b for b in stored}
+    merged.update({b[0]: list(b) for b in fetched})
+    return [merged[ts] for ts in sorted(merged)][-limit:]
+
+def get_ohlcv_with_store(symbol: str, timeframe: str, limit: int = 500) -> list:
+    """
+    Bir sembolün son 'limit' adet mumunu (oluşmakta olan mum dahil) döndürür.
+    Kapanmış mumlar yerel mum deposundan okunur; borsadan sadece depoda olmayan
+    yeni mumlar çekilir ve kapananlar depoya eklenir.
+    """
+    if not exchange:
+        return []
+    unified_symbol = _get_unified_symbol(symbol)
+    request_symbol = _request_symbol(unified_symbol)
+
+    stored, fetch_params, current_open = _plan_store_fetch(unified_symbol, timeframe, limit, exchange.milliseconds())
+    flight_key = ("ohlcv", request_symbol, timeframe, fetch_params.get("since"), fetch_params["limit"])
+    fetched = _single_flight(flight_key, exchange.fetch_ohlcv, request_symbol, timeframe=timeframe, **fetch_params)
+    return _merge_store_fetch(unified_symbol, timeframe, limit, stored, fetched, current_open)
+
+def _missing_segments(stored_ts: set, timeframe: str, since: int, until: int) -> list[tuple[int, int]]:
+    """
+    [since, until] aralığında beklenen mum açılışlarından depoda olmayanları bulur ve
+    ardışık eksik mumları (ilk_açılış, son_açılış) aralıkları halinde döndürür.
+    """
+    segments, prev = [], None
+    ts = current_bar_open_ms(timeframe, since)
+    if ts < since:
+        ts = next_bar_open_ms(timeframe, ts)
+    while ts <= until:
+        if ts not in stored_ts:
+            if segments and segments[-1][1] == prev:
+                segments[-1][1] = ts
+            else:
+                segments.append([ts, ts])
+        prev = ts
+        ts = next_bar_open_ms(timeframe, ts)
+    return [(first, last) for first, last in segments]
+
+def get_ohlcv_range(symbol: str, timeframe: str, since: int, until: int) -> list:
+    """
+    [since, until] (ms) aralığındaki mumları döndürür. Depoda zaten bulunan mumlar
+    yerelden okunur; borsadan yalnızca depoda eksik olan aralıklar çekilir.
+    """
+    if not exchange:
+        return []
+    unified_symbol = _get_unified_symbol(symbol)
+    request_symbol = _request_symbol(unified_symbol)
+    current_open = current_bar_open_ms(timeframe, exchange.milliseconds())
+
+    # Depo, 'limit' ile yapılan tam çekimlerden dolayı aralarda boşluk içerebilir; bu yüzden
+    # sadece uçlar değil, aralıktaki her beklenen mumun depoda olup olmadığı kontrol edilir.
+    stored = candle_store.get_bars(unified_symbol, timeframe, since=since, until=until)
+    fetched = []
+    for segment_since, segment_until in _missing_segments({b[0] for b in stored}, timeframe, since, until):
+        fetched.extend(_fetch_ohlcv_paginated(request_symbol, timeframe, segment_since, segment_until))
+
+    closed = [b for b in fetched if b[0] < current_open]
+    if closed:
+        candle_store.upsert_bars(unified_symbol, timeframe, closed)
+
+    merged = {b[0]: b for b in stored}
+    merged.update({b[0]: list(b) for b in fetched if since <= b[0] <= until})
+    bars = [merged[ts] for ts in sorted(merged)]
+    if not bars_are_contiguous(bars, timeframe):
+        logging.warning(f"{unified_symbol} {timeframe} mumlarında borsadan da tamamlanamayan boşluklar var.")
+    return bars
+
+def _split_closed_bars(bars: list, last_closed_open: int) -> list:
+    return [b for b in bars if b[0] <= last_closed_open]
+
+def _load_closed_bars(unified_symbol: str, timeframe: str, limit: int, last_closed_open: int) -> list:
+    """
+    Gösterge hesabı için 'limit' mumluk (oluşmakta olan mum dahil) isteğin kapanmış kısmını döndürür.
+    Mumlar mümkünse depodaki alt zaman dilimi mumlarından üretilir; yoksa borsadan çekilir.
+    """
+    bars = resampler.local_closed_bars(unified_symbol, timeframe, limit - 1, last_closed_open)
+    if bars is None:
+        bars = _split_closed_bars(get_ohlcv_with_store(unified_symbol, timeframe, limit=limit), last_closed_open)
+    return bars
+
+def get_indicator_set(symbol: str, timeframe: str, params: tuple = indicator_engine.DEFAULT_PARAMS) -> dict:
+    """
+    Sembolün son kapanmış mumuna ait tüm gösterge setini döndürür. Aynı mum için daha önce
+    hesaplanmış sonuç varsa borsaya hiç gidilmeden o kullanılır; yoksa sadece son
+    hesaplamadan bu yana kapanan mumlar okunup artımlı olarak işlenir.
+    """
+    if not exchange:
+        return {"status": "error", "message": "Borsa bağlantısı başlatılmamış."}
+
+    unified_symbol = _get_unified_symbol(symbol)
+    known_failure = cache_manager.get_negative(f"indicators_{unified_symbol}_{timeframe}")
+    if known_failure:
+        return known_failure
+    if not symbol_registry.is_listed(unified_symbol):
+        return _remember_indicator_failure(unified_symbol, timeframe, {"status": "error", "reason": "not_listed", "message": f"Sembol borsada listelenmiyor: {unified_symbol}"})
+    last_closed_open = last_closed_bar_open_ms(timeframe, exchange.milliseconds())
+    cached = indicator_engine.lookup(unified_symbol, timeframe, params, last_closed_open)
+    if cached:
+        return cached
+
+    try:
+        limit = indicator_engine.bars_needed(unified_symbol, timeframe, params, last_closed_open, timeframe_to_ms(timeframe))
+        bars = _load_closed_bars(unified_symbol, timeframe, limit, last_closed_open)
+        result = indicator_engine.update(unified_symbol, timeframe, bars, params)
+        if result is None:
+            if limit <= indicator_engine.HISTORY_BARS:
+                bars = _load_closed_bars(unified_symbol, timeframe, indicator_engine.HISTORY_BARS + 1, last_closed_open)
+            result = indicator_engine.rebuild(unified_symbol, timeframe, bars, params)
     except Exception as e:
         logging.error(f"Teknik gösterge alınırken genel hata ({unified_symbol}, {timeframe}): {e}", exc_info=True)
-        return {"status": "error", "message": f"Beklenmedik bir hata oluştu: {str(e)}"}
+        result = _indicator_error(e)
+    return _remember_indicator_failure(unified_symbol, timeframe, result)
+
+def _indicator_error(e: Exception) -> dict:
+    reason = "not_listed" if isinstance(e, ccxt.BadSymbol) else "error"
+    return {"status": "error", "reason": reason, "message": f"Beklenmedik bir hata oluştu: {str(e)}"}
+
+def _remember_indicator_failure(unified_symbol: str, timeframe: str, result: dict) -> dict:
+    """Türü bilinen hataları kısa süreli önbelleğe alır; aynı sembol her döngüde tekrar denenmez."""
+    if result.get("status") != "success" and result.get("reason"):
+        cache_manager.set_negative(f"indicators_{unified_symbol}_{timeframe}", result, result["reason"])
+    return result
+
+def _get_technical_indicators_logic(symbol: str, timeframe: str) -> dict:
+    """
+    Teknik göstergeleri hesaplayan ana mantık fonksiyonu.
+    Bu fonksiyon LangChain @tool dekoratörünü içermez.
+    """
+    return indicator_engine.prompt_view(get_indicator_set(symbol, timeframe))
 
 @tool
 def get_technical_indicators(symbol: str, timeframe: str) -> dict:
@@ -132,16 +339,11 @@ def get_technical_indicators(symbol: str, timeframe: str) -> dict:
     Bu fonksiyon önbelleği yönetir ve LangChain aracı olarak kullanılır.
     """
     cache_key = f"indicators_{symbol}_{timeframe}"
-    cached_result = cache_manager.get(cache_key)
-    if cached_result:
-        return cached_result
-
-    result = _get_technical_indicators_logic(symbol, timeframe)
-
-    if result.get("status") == "success":
-        cache_manager.set(cache_key, result, ttl=180)
-        
-    return result
+    return cache_manager.get_or_refresh(
+        cache_key,
+        lambda: _get_technical_indicators_logic(symbol, timeframe),
+        cacheable=lambda result: result.get("status") == "success",
+    )
 
 def fetch_open_orders(symbol: str = None) -> list:
     """Borsadaki tüm açık emirleri veya belirtilen sembol için olanları çeker."""
@@ -152,22 +354,104 @@ def fetch_open_orders(symbol: str = None) -> list:
         request_symbol = None
         if symbol:
             unified_symbol = _get_unified_symbol(symbol)
-            request_symbol = unified_symbol.replace('/', '') if exchange.id == 'binance' and exchange.options.get('defaultType') == 'future' else unified_symbol
+            request_symbol = _request_symbol(unified_symbol)
         
-        open_orders = exchange.fetch_open_orders(request_symbol)
+        open_orders = _single_flight(("open_orders", request_symbol), exchange.fetch_open_orders, request_symbol)
         return open_orders
     except Exception as e:
         logging.error(f"Açık emirler alınırken hata: {e}", exc_info=True)
         return []
 
+# --- Toplu Piyasa Anlık Görüntüsü (Market Snapshot) ---
+# Tüm vadeli semboller için 24 saatlik ticker ve son fiyatlar, yenileme aralığı başına
+# tek bir toplu istekle çekilir ve 'BTCUSDT' -> satır şeklinde indekslenir. Aynı tarama
+# döngüsündeki tüm tüketiciler (gainers/losers, hacim patlaması, fiyat sorguları) bu
+# indeksi paylaşır; böylece istek sayısı sembol sayısından bağımsız hale gelir.
+MARKET_SNAPSHOT_TICKER_TTL = 30
+MARKET_SNAPSHOT_PRICE_TTL = 5
+# Yenileme başarısız olduğunda anlık görüntü en fazla TTL'in bu katı yaşa kadar kullanılır;
+# daha eskiyse boş döner ve fiyatlar sembol bazlı isteklere düşer.
+MARKET_SNAPSHOT_MAX_AGE_FACTOR = 3
+# Başarısız bir toplu yenilemeden sonra tekrar denemeden önce beklenen süre (sn).
+MARKET_SNAPSHOT_RETRY_BACKOFF = 5
+
+_market_snapshot = {
+    "tickers": {}, "tickers_ts": 0.0, "tickers_retry_at": 0.0,
+    "prices": {}, "prices_ts": 0.0, "prices_retry_at": 0.0,
+}
+_ticker_snapshot_lock = threading.Lock()
+_price_snapshot_lock = threading.Lock()
+
+def _snapshot_needs_refresh(kind: str, ttl: float) -> bool:
+    now = time.time()
+    return now - _market_snapshot[f"{kind}_ts"] > ttl and now >= _market_snapshot[f"{kind}_retry_at"]
+
+def _store_snapshot(kind: str, data: dict):
+    _market_snapshot[kind] = data
+    _market_snapshot[f"{kind}_ts"] = time.time()
+    _market_snapshot[f"{kind}_retry_at"] = 0.0
+
+def _snapshot_failed(kind: str, e: Exception):
+    """Yenileme hatasını kaydeder; bekleme süresi boyunca her çağıran ayrıca yeniden denemez."""
+    _market_snapshot[f"{kind}_retry_at"] = time.time() + MARKET_SNAPSHOT_RETRY_BACKOFF
+    logging.error(f"Toplu piyasa verisi ({kind}) alınamadı, {MARKET_SNAPSHOT_RETRY_BACKOFF} sn sonra tekrar denenecek: {e}")
+
+def _usable_snapshot(kind: str, ttl: float) -> dict:
+    """Anlık görüntüyü yaş sınırı içindeyse döndürür; çok eskiyse boş sözlük döner."""
+    if time.time() - _market_snapshot[f"{kind}_ts"] > ttl * MARKET_SNAPSHOT_MAX_AGE_FACTOR:
+        return {}
+    return _market_snapshot[kind]
+
+def _is_futures_exchange() -> bool:
+    return bool(exchange) and exchange.id == 'binance' and exchange.options.get('defaultType') == 'future'
+
+def _request_symbol(unified_symbol: str) -> str:
+    """Borsa isteğinde kullanılacak sembolü sembol dizininden döndürür."""
+    return symbol_registry.exchange_id(unified_symbol) if _is_futures_exchange() else unified_symbol
+
+def get_ticker_24h_index() -> dict[str, dict]:
+    """
+    Tüm vadeli sembollerin 24 saatlik ticker verisini 'BTCUSDT' -> satır sözlüğü olarak döndürür.
+    Veri MARKET_SNAPSHOT_TICKER_TTL saniyeden eskiyse tek bir toplu istekle yenilenir;
+    eşzamanlı çağıranlar aynı yenilemeyi bekler ve sonucunu paylaşır.
+    """
+    if not _is_futures_exchange():
+        return {}
+    with _ticker_snapshot_lock:
+        if _snapshot_needs_refresh("tickers", MARKET_SNAPSHOT_TICKER_TTL):
+            try:
+                rows = exchange.fapiPublicGetTicker24hr()
+                _store_snapshot("tickers", {row['symbol']: row for row in rows if row.get('symbol')})
+            except Exception as e:
+                _snapshot_failed("tickers", e)
+        return _usable_snapshot("tickers", MARKET_SNAPSHOT_TICKER_TTL)
+
+def get_price_index() -> dict[str, float]:
+    """
+    Tüm vadeli sembollerin son fiyatlarını 'BTCUSDT' -> fiyat sözlüğü olarak döndürür.
+    Veri MARKET_SNAPSHOT_PRICE_TTL saniyeden eskiyse tek bir toplu istekle yenilenir.
+    """
+    if not _is_futures_exchange():
+        return {}
+    with _price_snapshot_lock:
+        if _snapshot_needs_refresh("prices", MARKET_SNAPSHOT_PRICE_TTL):
+            try:
+                rows = exchange.fapiPublicGetTickerPrice()
+                _store_snapshot("prices", {row['symbol']: float(row['price']) for row in rows if row.get('symbol') and row.get('price') is not None})
+            except Exception as e:
+                _snapshot_failed("prices", e)
+        return _usable_snapshot("prices", MARKET_SNAPSHOT_PRICE_TTL)
+
+def get_snapshot_price(symbol: str) -> float | None:
+    """Bir sembolün fiyatını toplu fiyat indeksinden okur."""
+    return get_price_index().get(symbol_registry.exchange_id(_get_unified_symbol(symbol)))
+
 @retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def _fetch_price_natively(symbol: str) -> float | None:
     """Borsadan anlık fiyatı çeker (yeniden deneme mekanizması ile)."""
     if not exchange: return None
     try:
-        request_symbol = symbol
-        if exchange.id == 'binance' and exchange.options.get('defaultType') == 'future':
-            request_symbol = symbol.replace('/', '')
+        request_symbol = _request_symbol(symbol)
         ticker = exchange.fetch_ticker(request_symbol)
         return float(ticker["last"]) if ticker and ticker.get("last") is not None else None
     except Exception as e:
@@ -176,21 +460,22 @@ def _fetch_price_natively(symbol: str) -> float | None:
 
 def get_price_with_cache(symbol: str) -> float | None:
     """
-    Bir sembolün fiyatını önbellekten alır. Önbellekte yoksa veya süresi dolmuşsa,
-    borsadan çeker ve önbelleği günceller.
+    Bir sembolün fiyatını önce WebSocket fiyat defterinden, sonra önbellekten alır.
+    İkisinde de yoksa toplu fiyat indeksine, o da yoksa sembol bazlı REST isteğine düşer
+    ve önbelleği günceller.
     """
-    cache_key = f"price_{symbol}"
-    
-    cached_price = cache_manager.get(cache_key)
-    if cached_price is not None:
-        return cached_price
+    streamed_price = price_feed.get_price(symbol)
+    if streamed_price is not None:
+        return streamed_price
 
-    price = _fetch_price_natively(symbol)
-    
-    if price is not None:
-        cache_manager.set(cache_key, price, ttl=5)
-        
-    return price
+    def load_price():
+        price = get_snapshot_price(symbol)
+        if price is None:
+            price = _single_flight(("ticker", symbol), _fetch_price_natively, symbol)
+        return price
+
+    # 'price' ad alanı katı sürelidir; süresi dolan fiyat bayat olarak sunulmaz.
+    return cache_manager.get_or_refresh(f"price_{symbol}", load_price)
 
 def get_wallet_balance(quote_currency: str = "USDT") -> dict:
     """Cüzdan bakiyesini alır."""
@@ -222,7 +507,9 @@ def execute_trade_order(symbol: str, side: str, amount: float, price: float = No
         return {"status": "error", "message": "Borsa bağlantısı başlatılmamış."}
     
     unified_symbol = _get_unified_symbol(symbol)
-    request_symbol = unified_symbol.replace('/', '') if exchange.id == 'binance' and exchange.options.get('defaultType') == 'future' else unified_symbol
+    if not symbol_registry.is_listed(unified_symbol):
+        return {"status": "error", "message": f"HATA ({unified_symbol}): Sembol borsada listelenmiyor veya işleme kapalı."}
+    request_symbol = _request_symbol(unified_symbol)
 
     try:
         formatted_amount = exchange.amount_to_precision(request_symbol, amount)
@@ -287,7 +574,7 @@ def execute_trade_order(symbol: str, side: str, amount: float, price: float = No
 def get_symbols_from_exchange(exchange_instance, quote_currency: str) -> list:
     if not exchange_instance: logging.error("Borsa bağlantısı başlatılmadığı için semboller alınamıyor."); return []
     try:
-        markets = exchange_instance.load_markets()
+        markets = exchange_instance.markets or exchange_instance.load_markets()
         symbols = [market_info['symbol'] for market_id, market_info in markets.items() if market_info.get('active', False) and market_info.get('quote') == quote_currency.upper() and market_info.get('type') == exchange_instance.options.get('defaultType')]
         logging.info(f"{quote_currency} cinsinden {len(symbols)} adet {exchange_instance.options.get('defaultType')} sembolü borsadan çekildi.")
         return symbols
@@ -295,59 +582,99 @@ def get_symbols_from_exchange(exchange_instance, quote_currency: str) -> list:
         logging.error(f"Borsadan semboller alınırken hata oluştu: {e}", exc_info=True)
         return []
 
+# Hacim patlaması taramasında eşzamanlı olarak mum çekilen en fazla sembol sayısı.
+VOLUME_SPIKE_CONCURRENCY = 16
+DAY_MS = 86_400_000
+
+def _filter_usdt_tickers(tickers: list, min_volume_usdt: int) -> list:
+    """24 saatlik ticker listesinden minimum hacmi geçen USDT paritelerini seçer."""
+    return [t for t in tickers if t.get('symbol', '').endswith('USDT') and float(t.get('quoteVolume', 0)) > min_volume_usdt]
+
+def _volume_spike_from_bars(symbol: str, bars: list, period: int, multiplier: float) -> dict | None:
+    """Son mumun hacmi, önceki 'period' mumun ortalamasının 'multiplier' katını aşıyorsa sonucu döndürür."""
+    if len(bars) < period + 1: return None
+    volumes = np.asarray([b[5] for b in bars[-(period + 1):]], dtype=float)
+    if np.isnan(volumes).any(): return None
+    last_volume = volumes[-1]
+    average_volume = volumes[:-1].mean()
+    if average_volume == 0: return None
+    if last_volume > average_volume * multiplier:
+        return {"symbol": _get_unified_symbol(symbol), "spike_ratio": float(last_volume / average_volume), "last_volume": float(last_volume), "average_volume": float(average_volume)}
+    return None
+
+def _volume_spike_ruled_out(ticker: dict, timeframe: str, period: int, multiplier: float, now_ms: int) -> bool:
+    """
+    Borsaya istek atmadan, 24 saatlik ticker hacmi ve depodaki kapanmış mumlarla sembolün
+    hacim patlaması olamayacağını kanıtlamaya çalışır. Önceki 'period' mum depoda eksiksizse
+    ortalama kesin olarak bilinir; oluşmakta olan mumun hacmi de 24s hacminden, son 24 saat
+    içinde kalan kapanmış mumların hacmi çıkarılarak yukarıdan sınırlanır. Bu üst sınır bile
+    eşiği geçemiyorsa sembol elenir. Kanıt yoksa False döner ve sembol normal şekilde kontrol edilir.
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    if tf_ms >= DAY_MS or ticker.get('volume') is None:
+        return False
+
+    unified_symbol = _get_unified_symbol(ticker['symbol'])
+    current_open = current_bar_open_ms(timeframe, now_ms)
+    window_start = now_ms - DAY_MS
+    period_start = current_open - period * tf_ms
+    stored = candle_store.get_bars(unified_symbol, timeframe, since=min(window_start, period_start), until=current_open - 1)
+
+    previous_volumes = [b[5] for b in stored if b[0] >= period_start]
+    if len(previous_volumes) < period:
+        return False
+    average_volume = sum(previous_volumes) / period
+    if average_volume == 0:
+        return True
+
+    in_window_closed_volume = sum(b[5] for b in stored if b[0] >= window_start)
+    max_last_volume = float(ticker['volume']) - in_window_closed_volume
+    return max_last_volume <= average_volume * multiplier
+
+def _select_gainers_losers(tickers: list, top_n: int, min_volume_usdt: int) -> list:
+    filtered = _filter_usdt_tickers(tickers, min_volume_usdt)
+    filtered.sort(key=lambda x: float(x.get('priceChangePercent', 0)), reverse=True)
+    return [{**item, 'symbol': _get_unified_symbol(item['symbol'])} for item in (filtered[:top_n] + filtered[-top_n:])]
+
 def get_volume_spikes(timeframe: str, period: int, multiplier: float, min_volume_usdt: int) -> list:
     from core import app_config
     if not exchange or app_config.settings.get('DEFAULT_MARKET_TYPE') != 'future': return []
     logging.info(f"Hacim patlaması taraması başlatıldı: Zaman Aralığı={timeframe}, Periyot={period}, Çarpan={multiplier}")
     try:
-        all_tickers = exchange.fapiPublicGetTicker24hr()
-        filtered_tickers = [t for t in all_tickers if t.get('symbol', '').endswith('USDT') and float(t.get('quoteVolume', 0)) > min_volume_usdt]
-        logging.info(f"Hacim analizi için {len(filtered_tickers)} adet sembol ön filtreden geçti.")
-        volume_spikes = []
-        for ticker in filtered_tickers:
-            symbol = ticker['symbol']
+        filtered_tickers = _filter_usdt_tickers(list(get_ticker_24h_index().values()), min_volume_usdt)
+        now_ms = exchange.milliseconds()
+        candidates = [t for t in filtered_tickers if not _volume_spike_ruled_out(t, timeframe, period, multiplier, now_ms)]
+        logging.info(f"Hacim analizi için {len(filtered_tickers)} adet sembol ön filtreden geçti, {len(filtered_tickers) - len(candidates)} tanesi 24s verisiyle erkenden elendi.")
+
+        def check_symbol(symbol):
             try:
-                bars = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=period + 1)
-                if len(bars) < period + 1: continue
-                df = pd.DataFrame(bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                df['volume'] = pd.to_numeric(df['volume'], errors='coerce').dropna()
-                if len(df) < period + 1: continue
-                last_volume = df['volume'].iloc[-1]
-                average_volume = df['volume'].iloc[-period-1:-1].mean()
-                if pd.isna(last_volume) or pd.isna(average_volume) or average_volume == 0: continue
-                if last_volume > average_volume * multiplier:
-                    volume_spikes.append({"symbol": _get_unified_symbol(symbol), "spike_ratio": last_volume / average_volume, "last_volume": last_volume, "average_volume": average_volume})
-                time.sleep(exchange.rateLimit / 1000)
-            except Exception: continue
+                return _volume_spike_from_bars(symbol, get_ohlcv_with_store(symbol, timeframe, limit=period + 1), period, multiplier)
+            except Exception:
+                return None
+
+        # Her görev, çağıranın bağlamıyla (örn. istek sınırlayıcı önceliği) çalıştırılır.
+        with ThreadPoolExecutor(max_workers=VOLUME_SPIKE_CONCURRENCY) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, check_symbol, t['symbol']) for t in candidates]
+            volume_spikes = [spike for f in futures if (spike := f.result())]
         volume_spikes.sort(key=lambda x: x['spike_ratio'], reverse=True)
         return volume_spikes
     except Exception as e:
         logging.error(f"Hacim patlaması listesi alınırken genel hata: {e}", exc_info=True)
         return []
 
-def get_atr_value(symbol: str, timeframe: str) -> dict:
-    if not exchange: return {"status": "error", "message": "Borsa bağlantısı başlatılmamış."}
-    try:
-        unified_symbol = _get_unified_symbol(symbol)
-        request_symbol = unified_symbol.replace('/', '') if exchange.id == 'binance' and exchange.options.get('defaultType') == 'future' else unified_symbol
-        bars = exchange.fetch_ohlcv(request_symbol, timeframe=timeframe, limit=200)
-        if not bars or len(bars) < 20: return {"status": "error", "message": "Yetersiz veri"}
-        df = pd.DataFrame(bars, columns=["timestamp", "open", "high", "low", "close", "volume"])
-        atr = df.ta.atr()
-        if atr is None or atr.empty or pd.isna(atr.iloc[-1]): return {"status": "error", "message": "ATR hesaplanamadı veya NaN"}
-        return {"status": "success", "value": atr.iloc[-1]}
-    except Exception as e:
-        logging.error(f"ATR alınırken hata: {e}", exc_info=True)
-        return {"status": "error", "message": str(e)}
+def get_atr_value(symbol: str, timeframe: str, atr_period: int = 14) -> dict:
+    """Sembolün son kapanmış mumuna ait ATR değerini (fiyat biriminde) gösterge motorundan okur."""
+    rsi_period, adx_period, _, volume_avg_period = indicator_engine.DEFAULT_PARAMS
+    result = get_indicator_set(symbol, timeframe, (rsi_period, adx_period, atr_period, volume_avg_period))
+    if result.get("status") != "success":
+        return {"status": "error", "message": result.get("message", "ATR hesaplanamadı")}
+    return {"status": "success", "value": result["data"]["ATR"]}
 
 def get_top_gainers_losers(top_n: int, min_volume_usdt: int) -> list:
     from core import app_config
     if not exchange or app_config.settings.get('DEFAULT_MARKET_TYPE') != 'future': return []
     try:
-        tickers = exchange.fapiPublicGetTicker24hr()
-        filtered = [t for t in tickers if t.get('symbol', '').endswith('USDT') and float(t.get('quoteVolume', 0)) > min_volume_usdt]
-        filtered.sort(key=lambda x: float(x.get('priceChangePercent', 0)), reverse=True)
-        return [{**item, 'symbol': _get_unified_symbol(item['symbol'])} for item in (filtered[:top_n] + filtered[-top_n:])]
+        return _select_gainers_losers(list(get_ticker_24h_index().values()), top_n, min_volume_usdt)
     except Exception as e:
         logging.error(f"Gainer/Loser listesi alınırken hata: {e}", exc_info=True)
         return []
@@ -358,7 +685,7 @@ def get_open_positions_from_exchange() -> list:
     if not exchange or app_config.settings.get('DEFAULT_MARKET_TYPE') != 'future':
         return []
     try:
-        positions = exchange.fetch_positions()
+        positions = _single_flight(("positions",), exchange.fetch_positions)
         return [p for p in positions if p.get('contracts') and float(p['contracts']) != 0]
     except Exception as e:
         logging.error(f"Borsadan pozisyonlar alınırken hata: {e}", exc_info=True)
@@ -371,7 +698,7 @@ def update_stop_loss_order(symbol: str, side: str, amount: float, new_stop_price
     if exchange.options.get('defaultType') != 'future': return f"Hata: SL güncelleme sadece vadeli piyasada desteklenir."
     
     unified_symbol = _get_unified_symbol(symbol)
-    request_symbol = unified_symbol.replace('/', '') if exchange.id == 'binance' else unified_symbol
+    request_symbol = _request_symbol(unified_symbol)
     try:
         open_orders = exchange.fetch_open_orders(request_symbol)
         stop_orders_to_cancel = [o for o in open_orders if 'stop' in o.get('type','').lower() and o.get('reduceOnly')]
@@ -394,7 +721,7 @@ def cancel_all_open_orders(symbol: str) -> str:
     if not app_config.settings.get('LIVE_TRADING'): return f"Simülasyon: {symbol} için tüm açık emirler iptal edildi."
     
     unified_symbol = _get_unified_symbol(symbol)
-    request_symbol = unified_symbol.replace('/', '') if exchange.id == 'binance' and exchange.options.get('defaultType') == 'future' else unified_symbol
+    request_symbol = _request_symbol(unified_symbol)
     try:
         exchange.cancel_all_orders(request_symbol)
         logging.info(f"İPTAL: {unified_symbol} için tüm açık emirler başarıyla iptal edildi.")
@@ -0,0 +1,114 @@
+# backend/tools/indicator_engine.py
+# @author: Memba Co.
+# Bu modül, bir sembolün tüm gösterge setini (RSI, ADX, ATR, ATR%, hacim EMA) kapanmış
+# mumlar üzerinden hesaplar ve durumu (sembol, zaman aralığı, parametreler) anahtarıyla,
+# son işlenen kapanmış mumun açılış zamanına bağlı olarak hafızada tutar.
+# Aynı mum kapanana kadar ön filtre, AI prompt'ları, pozisyon boyutlandırma ve Telegram
+# aynı sonucu okur. Yeni bir mum kapandığında göstergeler 'streaming_indicators'
+# durumları üzerinden sadece o mum işlenerek güncellenir.
+
+import threading
+from collections import OrderedDict
+
+from .streaming_indicators import IndicatorState
+
+# (RSI, ADX, ATR, hacim EMA) periyotları. Prompt'lar ve pozisyon boyutlandırma bu
+# varsayılanları kullanır; tarayıcı ayarlarındaki periyotlar farklıysa ayrı bir set hesaplanır.
+DEFAULT_PARAMS = (14, 14, 14, 20)
+# Gösterge hesaplaması için gereken en az kapanmış mum sayısı.
+MIN_BARS = 100
+# Bir durum ilk kez oluşturulurken (veya seri koptuğunda) işlenen kapanmış mum geçmişi.
+HISTORY_BARS = 500
+# Hafızada tutulacak en fazla (sembol, zaman aralığı, parametre) durumu.
+MAX_MEMO_ENTRIES = 2000
+# AI prompt'larına aktarılan göstergeler.
+PROMPT_INDICATOR_KEYS = ("RSI", "ADX")
+
+# Her (sembol, zaman aralığı, parametreler) için artımlı gösterge durumu. Yeni bir mum
+# kapandığında sadece o mum işlenir (O(1)); seri koparsa durum geçmişten yeniden kurulur.
+_states: "OrderedDict[tuple, IndicatorState]" = OrderedDict()
+_states_lock = threading.Lock()
+
+
+def params_from_config(config: dict) -> tuple:
+    """Tarayıcı ayarlarındaki gösterge periyotlarından parametre demetini oluşturur."""
+    return (
+        config.get('PROACTIVE_SCAN_RSI_PERIOD', 14),
+        config.get('PROACTIVE_SCAN_ADX_PERIOD', 14),
+        config.get('PROACTIVE_SCAN_ATR_PERIOD', 14),
+        config.get('PROACTIVE_SCAN_VOLUME_AVG_PERIOD', 20),
+    )
+
+
+def _result(symbol: str, state: IndicatorState) -> dict:
+    if state.bar_count < MIN_BARS:
+        return {"status": "error", "reason": "insufficient_data", "message": f"Teknik analiz için yetersiz veri: {state.bar_count}/{MIN_BARS} mum çubuğu bulundu."}
+    data = state.snapshot()
+    if data is None:
+        return {"status": "error", "message": f"Hesaplama sonrası geçersiz gösterge değeri. Sembol: {symbol}"}
+    return {"status": "success", "data": data}
+
+
+def _valid_bars(bars: list) -> list:
+    return [b for b in bars if b and all(v is not None and v == v for v in b[:6])]
+
+
+def lookup(symbol: str, timeframe: str, params: tuple, bar_ts: int) -> dict | None:
+    """Durum verilen kapanmış muma kadar güncelse sonucu borsaya gitmeden döndürür."""
+    with _states_lock:
+        state = _states.get((symbol, timeframe, params))
+        if state and state.last_ts == bar_ts:
+            _states.move_to_end((symbol, timeframe, params))
+            return _result(symbol, state)
+    return None
+
+
+def bars_needed(symbol: str, timeframe: str, params: tuple, last_closed_open: int, tf_ms: int) -> int:
+    """Durumu güncellemek için okunması gereken mum sayısını (oluşmakta olan mum dahil) döndürür."""
+    with _states_lock:
+        state = _states.get((symbol, timeframe, params))
+    if not state or state.last_ts is None or state.last_ts > last_closed_open:
+        return HISTORY_BARS + 1
+    return min(HISTORY_BARS + 1, (last_closed_open - state.last_ts) // tf_ms + 3)
+
+
+def update(symbol: str, timeframe: str, closed_bars: list, params: tuple = DEFAULT_PARAMS) -> dict | None:
+    """
+    Mevcut duruma sadece yeni kapanan mumları işler. Durum yoksa veya verilen mumlar
+    durumun son mumuyla bağlantılı değilse None döner; çağıran taraf 'rebuild' kullanmalıdır.
+    """
+    key = (symbol, timeframe, params)
+    with _states_lock:
+        state = _states.get(key)
+        if not state or state.last_ts is None:
+            return None
+        timestamps = [int(b[0]) for b in closed_bars]
+        if state.last_ts not in timestamps:
+            return None
+        for bar in _valid_bars(closed_bars[timestamps.index(state.last_ts) + 1:]):
+            state.update(bar)
+        _states.move_to_end(key)
+        return _result(symbol, state)
+
+
+def rebuild(symbol: str, timeframe: str, closed_bars: list, params: tuple = DEFAULT_PARAMS) -> dict:
+    """Durumu verilen kapanmış mum geçmişinden sıfırdan kurar ve sonucu döndürür."""
+    if not closed_bars:
+        return {"status": "error", "reason": "no_data", "message": f"Geçmiş veri bulunamadı: {symbol}."}
+    state = IndicatorState(params)
+    for bar in _valid_bars(closed_bars):
+        state.update(bar)
+    key = (symbol, timeframe, params)
+    with _states_lock:
+        _states[key] = state
+        _states.move_to_end(key)
+        while len(_states) > MAX_MEMO_ENTRIES:
+            _states.popitem(last=False)
+    return _result(symbol, state)
+
+
+def prompt_view(result: dict) -> dict:
+    """Gösterge setinden sadece AI prompt'larında kullanılan alanları içeren sonucu döndürür."""
+    if result.get("status") != "success":
+        return result
+    return {"status": "success", "data": {key: result["data"][key] for key in PROMPT_INDICATOR_KEYS}}
@@ -0,0 +1,75 @@
+# backend/tools/market_cache.py
+# @author: Memba Co.
+# Bu modül, borsanın piyasa kataloğunu (markets/currencies) data/ klasöründe bir JSON
+# dosyasında saklar. Uygulama açılışında katalog diskten anında yüklenir; dosya
+# MARKET_CACHE_TTL_SECONDS süresinden eskiyse arka planda borsadan yenilenir.
+# Yeni katalog ayrı bir nesnede hazırlanır ve çalışan bağlantıya tek adımda aktarılır;
+# böylece okuyucular hiçbir zaman yarım güncellenmiş bir katalog görmez.
+
+import os
+import json
+import time
+import logging
+import tempfile
+
+import ccxt
+
+from database.database import DATA_DIR
+
+# Disk önbelleğindeki kataloğun geçerli sayıldığı süre (sn).
+MARKET_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# ccxt 'set_markets' tarafından doldurulan ve katalog değişiminde birlikte aktarılan öznitelikler.
+_MARKET_ATTRIBUTES = ("markets", "markets_by_id", "symbols", "ids", "currencies", "currencies_by_id",
+                      "codes", "baseCurrencies", "quoteCurrencies", "precisionMode")
+
+
+def _cache_file(market_type: str, testnet: bool) -> str:
+    suffix = "_testnet" if testnet else ""
+    return os.path.join(DATA_DIR, f"markets_{market_type.lower()}{suffix}.json")
+
+
+def load(market_type: str, testnet: bool) -> dict | None:
+    """Diskteki kataloğu {'markets', 'currencies', 'saved_at'} olarak döndürür; yoksa veya bozuksa None."""
+    path = _cache_file(market_type, testnet)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if not cached.get("markets"):
+            return None
+        return cached
+    except (OSError, ValueError) as e:
+        logging.warning(f"Piyasa kataloğu önbelleği okunamadı ({path}): {e}")
+        return None
+
+
+def save(market_type: str, testnet: bool, markets: dict, currencies: dict | None):
+    """Kataloğu önce geçici bir dosyaya yazar, ardından 'os.replace' ile atomik olarak yerine koyar."""
+    path = _cache_file(market_type, testnet)
+    os.makedirs(DATA_DIR, exist_ok=True)
+    payload = {"saved_at": time.time(), "markets": list(markets.values()), "currencies": currencies or {}}
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix=".markets_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, default=str)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def is_stale(cached: dict) -> bool:
+    return time.time() - cached.get("saved_at", 0) > MARKET_CACHE_TTL_SECONDS
+
+
+def apply(exchange_instance, markets, currencies=None):
+    """
+    Kataloğu ayrı bir nesnede hazırlar ve tüm ilgili öznitelikleri hedef bağlantıya
+    tek bir sözlük güncellemesiyle aktarır.
+    """
+    staging = ccxt.binance({"options": {"defaultType": exchange_instance.options.get('defaultType')}})
+    staging.set_markets(markets, currencies or None)
+    exchange_instance.__dict__.update({attr: getattr(staging, attr) for attr in _MARKET_ATTRIBUTES})
@@ -9,6 +9,10 @@ from tools.utils import _get_unified_symbol
 
 TAAPI_API_KEY = os.getenv("TAAPI_API_KEY")
 
+def _failure_reason(e: requests.RequestException) -> str:
+    """Hatalı yanıtın negatif önbellek türünü belirler (429 -> 'rate_limited')."""
+    return "rate_limited" if getattr(e.response, "status_code", None) == 429 else "error"
+
 def get_technical_screener_results() -> list[str]:
     """
     TAAPI.io kullanarak belirli teknik kriterlere uyan coin'leri tarar.
@@ -21,9 +25,11 @@ def get_technical_screener_results() -> list[str]:
 
     cache_key = "screener_taapi_rsi_oversold_bulk"
     cached_result = cache_manager.get(cache_key)
-    if cached_result:
+    if cached_result is not None:
         logging.info("Teknik tarama sonuçları önbellekten okundu.")
         return cached_result
+    if cache_manager.get_negative(cache_key) is not None:
+        return []
 
     logging.info("TAAPI.io üzerinden toplu teknik sorgulama (bulk) yapılıyor...")
     try:
@@ -53,11 +59,12 @@ def get_technical_screener_results() -> list[str]:
         ]
         
         logging.info(f"TAAPI.io taraması sonucu {len(symbols)} adet RSI'ı {rsi_oversold_threshold} altında olan sembol bulundu.")
-        cache_manager.set(cache_key, symbols, ttl=900)
+        cache_manager.set(cache_key, symbols)
         return symbols
 
     except requests.RequestException as e:
         logging.error(f"TAAPI.io teknik tarama sırasında hata: {e}")
+        cache_manager.set_negative(cache_key, [], _failure_reason(e))
         return []
 
 def get_socially_trending_coins() -> list[str]:
@@ -69,9 +76,11 @@ def get_socially_trending_coins() -> list[str]:
         
     cache_key = "trending_coingecko_search"
     cached_result = cache_manager.get(cache_key)
-    if cached_result:
+    if cached_result is not None:
         logging.info("Sosyal trend verileri (CoinGecko) önbellekten okundu.")
         return cached_result
+    if cache_manager.get_negative(cache_key) is not None:
+        return []
 
     logging.info("CoinGecko üzerinden trend verileri çekiliyor...")
     try:
@@ -86,9 +95,10 @@ def get_socially_trending_coins() -> list[str]:
         ]
         
         logging.info(f"CoinGecko'dan {len(symbols)} adet trend coini bulundu.")
-        cache_manager.set(cache_key, symbols, ttl=1800)
+        cache_manager.set(cache_key, symbols)
         return symbols
         
     except requests.RequestException as e:
         logging.error(f"CoinGecko trend verisi alınırken hata: {e}")
+        cache_manager.set_negative(cache_key, [], _failure_reason(e))
         return []
\ No newline at end of file
@@ -40,6 +40,7 @@ except Exception as e:
 def get_newsapi_headlines(symbol: str, limit: int = 5) -> list[str]:
     """NewsAPI kullanarak haber başlıklarını çeker."""
     if not newsapi_client: return []
+    if cache_manager.get_negative(f"news_newsapi_{symbol}") is not None: return []
     try:
         base_symbol = symbol.split('/')[0]
         q = f'"{base_symbol}" OR "{symbol}" AND (crypto OR cryptocurrency OR bitcoin OR blockchain)'
@@ -48,15 +49,18 @@ def get_newsapi_headlines(symbol: str, limit: int = 5) -> list[str]:
             titles = [article['title'] for article in response['articles']]
             logging.info(f"NewsAPI'dan {symbol} için {len(titles)} adet haber başlığı başarıyla çekildi.")
             return titles
+        cache_manager.set_negative(f"news_newsapi_{symbol}", [], "empty")
         return []
     except Exception as e:
         logging.error(f"NewsAPI'dan {symbol} için haberler alınırken hata: {e}")
+        cache_manager.set_negative(f"news_newsapi_{symbol}", [], "error")
         return []
 
 # --- YENİ: CryptoPanic Haber Fonksiyonu ---
 def get_cryptopanic_headlines(symbol: str, limit: int = 5) -> list[str]:
     """CryptoPanic API'sini kullanarak haber başlıklarını çeker."""
     if not CRYPTOPANIC_API_KEY: return []
+    if cache_manager.get_negative(f"news_cryptopanic_{symbol}") is not None: return []
     try:
         base_symbol = symbol.split('/')[0]
         url = f"https://cryptopanic.com/api/v1/posts/?auth_token={CRYPTOPANIC_API_KEY}&currencies={base_symbol}&public=true"
@@ -67,9 +71,12 @@ def get_cryptopanic_headlines(symbol: str, limit: int = 5) -> list[str]:
             titles = [item['title'] for item in data['results'][:limit]]
             logging.info(f"CryptoPanic'ten {symbol} için {len(titles)} adet haber başlığı çekildi.")
             return titles
+        cache_manager.set_negative(f"news_cryptopanic_{symbol}", [], "empty")
         return []
     except requests.exceptions.RequestException as e:
         logging.error(f"{symbol} için CryptoPanic haberleri alınırken hata oluştu: {e}")
+        reason = "rate_limited" if getattr(e.response, "status_code", None) == 429 else "error"
+        cache_manager.set_negative(f"news_cryptopanic_{symbol}", [], reason)
         return []
 
 # --- GÜNCELLENDİ: Ana fonksiyon artık ayarları kontrol ediyor ---
@@ -96,13 +103,19 @@ def get_twitter_sentiment(symbol: str, tweet_count: int = 30) -> dict:
     if not app_config.settings.get("PROACTIVE_SCAN_USE_SENTIMENT"):
         return {"score": 0.0, "subjectivity": 0.0}
     
-    # YENİ: Önbellek kontrolü eklendi
+    # Süresi dolmuş sonuç tolerans penceresi içindeyse hemen döndürülür ve arka planda yenilenir.
+    # Yakın zamanda alınan bir hata (örn. kota aşımı) varsa istek tekrarlanmaz.
+    cache_key = f"sentiment_{symbol}"
+    return cache_manager.get_or_refresh(
+        cache_key,
+        lambda: cache_manager.get_negative(cache_key) or _fetch_twitter_sentiment(symbol, tweet_count),
+        cacheable=lambda result: "error" not in result,
+    )
+
+
+def _fetch_twitter_sentiment(symbol: str, tweet_count: int) -> dict:
+    """Tweet duyarlılığını hesaplar. Hataları, türüne göre kısa süreli olarak önbelleğe yazar."""
     cache_key = f"sentiment_{symbol}"
-    cached_result = cache_manager.get(cache_key)
-    if cached_result:
-        logging.info(f"{symbol} için Twitter duyarlılık verisi önbellekten okundu.")
-        return cached_result
-        
     if not twitter_client:
         return {"score": 0.0, "subjectivity": 0.0, "error": "Twitter istemcisi yapılandırılmamış."}
 
@@ -119,10 +132,7 @@ def get_twitter_sentiment(symbol: str, tweet_count: int = 30) -> dict:
         tweets = response.data if response and hasattr(response, 'data') and response.data else []
         if not tweets:
             logging.warning(f"{symbol} için Twitter'da ilgili tweet bulunamadı.")
-            result = {"score": 0.0, "subjectivity": 0.0}
-            # YENİ: Sonucu önbelleğe kaydet
-            cache_manager.set(cache_key, result, ttl=600) # 10 dakika
-            return result
+            return {"score": 0.0, "subjectivity": 0.0}
 
         total_polarity = 0
         total_subjectivity = 0
@@ -137,17 +147,16 @@ def get_twitter_sentiment(symbol: str, tweet_count: int = 30) -> dict:
         
         logging.info(f"{symbol} için {len(tweets)} tweet analiz edildi. Ortalama Duyarlılık: {avg_polarity:.2f}")
         
-        result = {"score": round(avg_polarity, 2), "subjectivity": round(avg_subjectivity, 2)}
-        # YENİ: Sonucu önbelleğe kaydet
-        cache_manager.set(cache_key, result, ttl=600) # 10 dakika
-        return result
+        return {"score": round(avg_polarity, 2), "subjectivity": round(avg_subjectivity, 2)}
 
     except tweepy.errors.TooManyRequests as e:
-        # YENİ: Rate limit hatasını yakala ve sonucu daha kısa süreliğine önbelleğe al
+        # Rate limit hatasında sonuç kısa süreliğine önbelleğe alınır
         logging.error(f"Twitter API kota limiti aşıldı ({symbol}): {e}")
         result = {"score": 0.0, "subjectivity": 0.0, "error": "Twitter API kota limiti aşıldı."}
-        cache_manager.set(cache_key, result, ttl=120) # Hata durumunda 2 dakika bekle
+        cache_manager.set_negative(cache_key, result, "rate_limited")
         return result
     except Exception as e:
         logging.error(f"{symbol} için duyarlılık analizi sırasında genel hata: {e}")
-        return {"score": 0.0, "subjectivity": 0.0, "error": str(e)}
\ No newline at end of file
+        result = {"score": 0.0, "subjectivity": 0.0, "error": str(e)}
+        cache_manager.set_negative(cache_key, result, "error")
+        return result
\ No newline at end of file
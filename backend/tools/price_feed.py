@@ -0,0 +1,211 @@
+# backend/tools/price_feed.py
+# @author: Memba Co.
+# Bu modül, Binance vadeli piyasasının birleşik (combined) WebSocket akışından
+# beslenen, süreç içi bir fiyat defteri (price book) sağlar. Fiyatı istenen
+# semboller otomatik olarak akışa abone edilir, bir süre kullanılmayanların
+# aboneliği kaldırılır. Akıştan taze bir fiyat yoksa çağıran taraf REST'e düşer.
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+
+import websockets
+
+from .utils import _get_unified_symbol
+from . import symbol_registry
+
+MAINNET_WS_URL = "wss://fstream.binance.com/stream"
+TESTNET_WS_URL = "wss://stream.binancefuture.com/stream"
+
+# Bu süreden eski fiyatlar bayat kabul edilir ve REST yedeğine düşülür.
+PRICE_STALE_AFTER_SECONDS = 5
+# Bu süre boyunca fiyatı istenmeyen sembollerin aboneliği kaldırılır.
+IDLE_UNSUBSCRIBE_SECONDS = 300
+# Binance, tek bir bağlantı üzerinde en fazla 200 akışa izin verir (sembol başına 2 akış).
+MAX_STREAMS = 200
+# Abonelik değişiklikleri bu aralıklarla tek bir mesajda toplanarak gönderilir.
+SUBSCRIPTION_FLUSH_INTERVAL = 0.5
+
+_book = {}              # 'btcusdt' -> {"last": float, "mark": float, "last_ts": float, "mark_ts": float}
+_last_access = {}       # 'btcusdt' -> son erişim zamanı
+_wanted = set()         # Abone olunması istenen semboller
+_subscribed = set()     # Bağlantı üzerinde aktif olarak abone olunan semboller
+_lock = threading.Lock()
+
+_thread = None
+_loop = None
+_stop_event = None
+_ws_url = None
+_request_id = 0
+
+
+def _stream_symbol(symbol: str) -> str:
+    return symbol_registry.exchange_id(_get_unified_symbol(symbol)).lower()
+
+
+def _streams_for(stream_symbols) -> list[str]:
+    streams = []
+    for s in stream_symbols:
+        streams.extend([f"{s}@ticker", f"{s}@markPrice@1s"])
+    return streams
+
+
+def is_running() -> bool:
+    return _thread is not None and _thread.is_alive()
+
+
+def get_price(symbol: str) -> float | None:
+    """
+    Fiyat defterinden sembolün taze fiyatını döndürür. Sembol henüz akışta değilse
+    abonelik kuyruğuna eklenir ve None döner; çağıran taraf REST'e düşmelidir.
+    Son işlem fiyatı (ticker) tercih edilir, yoksa işaret fiyatı (mark price) kullanılır.
+    """
+    if not is_running():
+        return None
+
+    s = _stream_symbol(symbol)
+    now = time.time()
+    with _lock:
+        _last_access[s] = now
+        if s not in _wanted:
+            if len(_wanted) * 2 >= MAX_STREAMS:
+                return None
+            _wanted.add(s)
+        entry = _book.get(s)
+
+    if not entry:
+        return None
+    if entry.get("last") is not None and now - entry["last_ts"] <= PRICE_STALE_AFTER_SECONDS:
+        return entry["last"]
+    if entry.get("mark") is not None and now - entry["mark_ts"] <= PRICE_STALE_AFTER_SECONDS:
+        return entry["mark"]
+    return None
+
+
+def _handle_message(raw: str):
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        return
+    data = message.get("data") if isinstance(message, dict) else None
+    if not isinstance(data, dict):
+        return
+
+    s = str(data.get("s", "")).lower()
+    event = data.get("e")
+    now = time.time()
+    with _lock:
+        entry = _book.setdefault(s, {"last": None, "mark": None, "last_ts": 0.0, "mark_ts": 0.0})
+        if event == "24hrTicker" and data.get("c") is not None:
+            entry["last"], entry["last_ts"] = float(data["c"]), now
+        elif event == "markPriceUpdate" and data.get("p") is not None:
+            entry["mark"], entry["mark_ts"] = float(data["p"]), now
+
+
+async def _send_subscription(ws, method: str, stream_symbols) -> None:
+    global _request_id
+    if not stream_symbols:
+        return
+    _request_id += 1
+    await ws.send(json.dumps({"method": method, "params": _streams_for(stream_symbols), "id": _request_id}))
+    logging.debug(f"Fiyat akışı: {method} {len(stream_symbols)} sembol")
+
+
+async def _sync_subscriptions(ws):
+    """İstenen sembollerle aktif abonelikleri karşılaştırır, farkları tek mesajda gönderir."""
+    while not _stop_event.is_set():
+        now = time.time()
+        with _lock:
+            idle = {s for s in _wanted if now - _last_access.get(s, 0) > IDLE_UNSUBSCRIBE_SECONDS}
+            for s in idle:
+                _wanted.discard(s)
+                _book.pop(s, None)
+            to_subscribe = _wanted - _subscribed
+            to_unsubscribe = _subscribed - _wanted
+
+        await _send_subscription(ws, "UNSUBSCRIBE", sorted(to_unsubscribe))
+        await _send_subscription(ws, "SUBSCRIBE", sorted(to_subscribe))
+        with _lock:
+            _subscribed.difference_update(to_unsubscribe)
+            _subscribed.update(to_subscribe)
+        await asyncio.sleep(SUBSCRIPTION_FLUSH_INTERVAL)
+
+
+async def _run():
+    backoff = 1
+    while not _stop_event.is_set():
+        try:
+            async with websockets.connect(_ws_url, ping_interval=20, ping_timeout=20, max_queue=None) as ws:
+                logging.info(f"Fiyat akışı WebSocket bağlantısı kuruldu: {_ws_url}")
+                backoff = 1
+                with _lock:
+                    _subscribed.clear()
+                sync_task = asyncio.create_task(_sync_subscriptions(ws))
+                try:
+                    async for raw in ws:
+                        _handle_message(raw)
+                        if _stop_event.is_set():
+                            break
+                finally:
+                    sync_task.cancel()
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            if _stop_event.is_set():
+                break
+            logging.warning(f"Fiyat akışı bağlantısı koptu, {backoff} sn sonra yeniden denenecek: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+    logging.info("Fiyat akışı durduruldu.")
+
+
+def _cancel_all_tasks():
+    for task in asyncio.all_tasks():
+        task.cancel()
+
+
+def _thread_main():
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    try:
+        _loop.run_until_complete(_run())
+    finally:
+        _loop.close()
+        _loop = None
+
+
+def start(use_testnet: bool = False):
+    """Fiyat akışını ayrı bir arka plan thread'inde başlatır."""
+    global _thread, _stop_event, _ws_url
+    if is_running():
+        return
+    _ws_url = os.getenv("BINANCE_FUTURES_WS_URL") or (TESTNET_WS_URL if use_testnet else MAINNET_WS_URL)
+    _stop_event = threading.Event()
+    _thread = threading.Thread(target=_thread_main, name="price-feed", daemon=True)
+    _thread.start()
+    logging.info("WebSocket fiyat akışı başlatıldı.")
+
+
+def stop(timeout: float = 5.0):
+    """Fiyat akışını durdurur ve fiyat defterini temizler."""
+    global _thread
+    if not is_running():
+        return
+    _stop_event.set()
+    loop = _loop
+    if loop is not None:
+        try:
+            loop.call_soon_threadsafe(_cancel_all_tasks)
+        except RuntimeError:
+            pass  # Döngü zaten kapanmış
+    _thread.join(timeout=timeout)
+    _thread = None
+    with _lock:
+        _book.clear()
+        _wanted.clear()
+        _subscribed.clear()
+        _last_access.clear()
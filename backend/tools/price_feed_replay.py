@@ -0,0 +1,152 @@
+# backend/tools/price_feed_replay.py
+# @author: Memba Co.
+# Binance birleşik WebSocket akışını taklit eden yerel bir tekrar oynatma (replay)
+# sunucusu. Testlerde ve geliştirme ortamında gerçek borsaya bağlanmadan
+# 'price_feed' modülünü çalıştırmak için kullanılır.
+#
+# Kullanım (backend klasöründen):
+#   python -m tools.price_feed_replay --file kayit.jsonl --port 9001
+#   python -m tools.price_feed_replay --synthetic BTCUSDT,ETHUSDT --port 9001
+# Ardından uygulamayı şu ortam değişkeniyle başlatın:
+#   BINANCE_FUTURES_WS_URL=ws://127.0.0.1:9001/stream
+#
+# Kayıt dosyasındaki her satır, Binance'in birleşik akış formatında bir JSON mesajıdır:
+#   {"stream": "btcusdt@ticker", "data": {"e": "24hrTicker", "s": "BTCUSDT", "c": "65000.1", ...}}
+
+import json
+import random
+import asyncio
+import argparse
+import logging
+
+import websockets
+
+
+def load_recording(path: str) -> list[dict]:
+    """JSONL formatındaki kayıt dosyasını okur."""
+    frames = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                frames.append(json.loads(line))
+    return frames
+
+
+def synthetic_frames(symbols: list[str], start_price: float = 100.0):
+    """Verilen semboller için rastgele yürüyüş (random walk) fiyat mesajları üretir."""
+    prices = {s.lower(): start_price for s in symbols}
+    while True:
+        for s in prices:
+            prices[s] *= 1 + random.uniform(-0.001, 0.001)
+            price = f"{prices[s]:.4f}"
+            yield {"stream": f"{s}@ticker", "data": {"e": "24hrTicker", "s": s.upper(), "c": price}}
+            yield {"stream": f"{s}@markPrice@1s", "data": {"e": "markPriceUpdate", "s": s.upper(), "p": price}}
+
+
+class ReplayServer:
+    """
+    Abone olunan akışlara, kayıtlı veya sentetik mesajları belirli aralıklarla gönderir.
+    Gönderilecek mesaj yokken (abonelik yok veya kayıtta abone olunan akış geçmiyor) döngü
+    dönmez; bir sonraki abonelik değişikliği beklenir. Kayıt bittiğinde bağlantı açık kalır.
+    """
+
+    def __init__(self, frames=None, symbols=None, interval: float = 0.2, loop_forever: bool = True):
+        self.frames = frames or []
+        self.symbols = symbols or []
+        self.interval = interval
+        self.loop_forever = loop_forever
+
+    def _frame_source(self):
+        if self.symbols:
+            yield from synthetic_frames(self.symbols)
+            return
+        if not self.frames:
+            return
+        while True:
+            yield from self.frames
+            if not self.loop_forever:
+                return
+
+    def _pass_length(self) -> int:
+        """Kaynaktaki her akışın bir kez geçtiği mesaj sayısı."""
+        return 2 * len(self.symbols) if self.symbols else len(self.frames)
+
+    async def handler(self, websocket, path=None):
+        subscribed = set()
+        subscriptions_changed = asyncio.Event()
+
+        async def receive_commands():
+            async for raw in websocket:
+                try:
+                    command = json.loads(raw)
+                except ValueError:
+                    continue
+                params = set(command.get("params", []))
+                if command.get("method") == "SUBSCRIBE":
+                    subscribed.update(params)
+                elif command.get("method") == "UNSUBSCRIBE":
+                    subscribed.difference_update(params)
+                subscriptions_changed.set()
+                await websocket.send(json.dumps({"result": None, "id": command.get("id")}))
+
+        async def wait_for_subscriptions():
+            waiter = asyncio.create_task(subscriptions_changed.wait())
+            try:
+                await asyncio.wait({waiter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+
+        receiver = asyncio.create_task(receive_commands())
+        try:
+            # Art arda gönderilmeden geçilen mesaj sayısı; bir tam geçişe ulaşınca beklenir.
+            skipped = 0
+            for frame in self._frame_source():
+                if receiver.done():
+                    break
+                if frame.get("stream") in subscribed:
+                    skipped = 0
+                    await websocket.send(json.dumps(frame))
+                    await asyncio.sleep(self.interval)
+                    continue
+                skipped += 1
+                if skipped >= self._pass_length():
+                    if not subscriptions_changed.is_set():
+                        await wait_for_subscriptions()
+                    subscriptions_changed.clear()
+                    skipped = 0
+                else:
+                    await asyncio.sleep(0)
+            # Kayıt bitti veya boş; istemci bağlantıyı kapatana kadar sadece komutlar yanıtlanır.
+            await receiver
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            receiver.cancel()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 9001):
+        async with websockets.serve(self.handler, host, port):
+            logging.info(f"Fiyat akışı replay sunucusu dinlemede: ws://{host}:{port}/stream")
+            await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binance WebSocket fiyat akışı replay sunucusu")
+    parser.add_argument("--file", help="Tekrar oynatılacak JSONL kayıt dosyası")
+    parser.add_argument("--synthetic", help="Sentetik fiyat üretilecek semboller (örn: BTCUSDT,ETHUSDT)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--interval", type=float, default=0.2, help="Mesajlar arası bekleme süresi (sn)")
+    args = parser.parse_args()
+
+    if not args.file and not args.synthetic:
+        parser.error("--file veya --synthetic parametrelerinden biri gereklidir.")
+
+    logging.basicConfig(level=logging.INFO)
+    frames = load_recording(args.file) if args.file else None
+    symbols = [s.strip() for s in args.synthetic.split(',')] if args.synthetic else None
+    asyncio.run(ReplayServer(frames=frames, symbols=symbols, interval=args.interval).serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
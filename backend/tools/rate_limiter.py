@@ -0,0 +1,207 @@
+# backend/tools/rate_limiter.py
+# @author: Memba Co.
+# Bu modül, tüm Binance REST çağrılarının paylaştığı merkezi, ağırlık (weight) bazlı
+# bir istek sınırlayıcı sağlar. Senkron ve asenkron borsa istemcileri aynı jeton
+# kovasını (token bucket) kullanır. Her isteğin ağırlığı ccxt'nin uç nokta maliyet
+# tablosundan (örn. sembolsüz 'ticker/24hr' = 40, 'klines' limite göre 1-10) hesaplanır;
+# her yanıttaki 'X-MBX-USED-WEIGHT-1M' başlığı ile kova borsanın gerçek sayacına
+# eşitlenir. 429/418 yanıtlarında tüm istekler 'Retry-After' süresi kadar bekletilir.
+#
+# Öncelikler: Düşük öncelikli çağıranlar kovanın belirli bir kısmını daha yüksek
+# öncelikler için boş bırakmak zorundadır. Böylece tarama veya backtest yoğunken bile
+# pozisyon güvenliği (SL/TP, emir, senkronizasyon) çağrıları her zaman bütçe bulur.
+
+import time
+import asyncio
+import logging
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+import ccxt
+import ccxt.async_support as ccxt_async
+
+# Binance USDⓈ-M vadeli piyasası için dakikalık istek ağırlığı limiti.
+WEIGHT_LIMIT_PER_MINUTE = 2400
+# Borsanın limitine tam dayanmamak için kullanılan pay.
+SAFETY_RATIO = 0.9
+# 429/418 yanıtında 'Retry-After' başlığı yoksa beklenecek süre (sn).
+DEFAULT_BACKOFF_SECONDS = 60
+
+PRIORITY_POSITION = 0
+PRIORITY_API = 1
+PRIORITY_SCANNER = 2
+PRIORITY_BACKTEST = 3
+
+# Her önceliğin dokunamayacağı, kova kapasitesine oranla ayrılmış rezerv.
+PRIORITY_RESERVE_RATIO = {
+    PRIORITY_POSITION: 0.0,
+    PRIORITY_API: 0.10,
+    PRIORITY_SCANNER: 0.25,
+    PRIORITY_BACKTEST: 0.40,
+}
+
+_current_priority = contextvars.ContextVar("rate_limit_priority", default=PRIORITY_API)
+
+_capacity = WEIGHT_LIMIT_PER_MINUTE * SAFETY_RATIO
+_refill_per_second = _capacity / 60.0
+_tokens = _capacity
+_last_refill = time.monotonic()
+_paused_until = 0.0
+_lock = threading.Lock()
+
+_stats = {
+    "last_used_weight_header": None,
+    "throttled_waits": {p: 0 for p in PRIORITY_RESERVE_RATIO},
+    "rate_limit_responses": 0,
+}
+
+
+@contextmanager
+def priority(level: int):
+    """
+    Bu blok içinde (ve buradan başlatılan thread/görevlerde) yapılan borsa
+    çağrılarının önceliğini belirler.
+    """
+    token = _current_priority.set(level)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def with_priority(level: int):
+    """Fonksiyonun (senkron veya asenkron) tamamını verilen öncelikle çalıştıran dekoratör."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with priority(level):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with priority(level):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _refill(now: float):
+    global _tokens, _last_refill
+    _tokens = min(_capacity, _tokens + (now - _last_refill) * _refill_per_second)
+    _last_refill = now
+
+
+def _try_consume(weight: float, level: int) -> float:
+    """Jeton yeterliyse tüketir ve 0 döner; değilse beklenmesi gereken süreyi döndürür."""
+    global _tokens
+    with _lock:
+        now = time.monotonic()
+        _refill(now)
+        if now < _paused_until:
+            return _paused_until - now
+        floor = _capacity * PRIORITY_RESERVE_RATIO.get(level, 0.0)
+        # Rezerv ile birlikte kovaya sığmayan ağır istekler kova dolunca geçirilir; aksi halde hiç geçemezler.
+        required = min(weight + floor, _capacity)
+        if _tokens >= required:
+            _tokens -= weight
+            return 0.0
+        _stats["throttled_waits"][level] = _stats["throttled_waits"].get(level, 0) + 1
+        return (required - _tokens) / _refill_per_second
+
+
+def acquire(weight: float, level: int = None):
+    """Gerekli ağırlık için bütçe açılana kadar çağıran thread'i bekletir."""
+    level = _current_priority.get() if level is None else level
+    while (wait := _try_consume(weight, level)) > 0:
+        time.sleep(wait)
+
+
+async def acquire_async(weight: float, level: int = None):
+    """'acquire' fonksiyonunun olay döngüsünü bloklamayan karşılığı."""
+    level = _current_priority.get() if level is None else level
+    while (wait := _try_consume(weight, level)) > 0:
+        await asyncio.sleep(wait)
+
+
+def _header(headers, name: str):
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        value = next((v for k, v in headers.items() if str(k).lower() == lowered), None)
+    return value
+
+
+def record_response(status_code: int, headers):
+    """
+    Borsa yanıtının başlıklarına göre kovayı günceller: kullanılan ağırlık başlığı
+    yerel sayaçtan yüksekse kova ona eşitlenir, 429/418 durumunda tüm istekler durdurulur.
+    """
+    global _tokens, _paused_until
+    used = _header(headers, "X-MBX-USED-WEIGHT-1M")
+    with _lock:
+        if used is not None:
+            try:
+                used = int(used)
+                _stats["last_used_weight_header"] = used
+                _tokens = min(_tokens, _capacity - used)
+            except (TypeError, ValueError):
+                pass
+        if status_code in (418, 429):
+            retry_after = _header(headers, "Retry-After")
+            try:
+                backoff = float(retry_after) if retry_after is not None else DEFAULT_BACKOFF_SECONDS
+            except (TypeError, ValueError):
+                backoff = DEFAULT_BACKOFF_SECONDS
+            _paused_until = max(_paused_until, time.monotonic() + backoff)
+            _tokens = 0.0
+            _stats["rate_limit_responses"] += 1
+            logging.warning(f"Binance istek limiti yanıtı ({status_code}) alındı. Tüm istekler {backoff:.0f} sn bekletilecek.")
+
+
+def get_stats() -> dict:
+    with _lock:
+        _refill(time.monotonic())
+        return {
+            "capacity": _capacity,
+            "available_weight": round(_tokens, 1),
+            "paused_for_seconds": round(max(0.0, _paused_until - time.monotonic()), 1),
+            **_stats,
+        }
+
+
+def _request_priority(api, method: str) -> int:
+    """Durum değiştiren özel (emir) çağrıları her zaman pozisyon önceliğiyle çalışır."""
+    api_name = api if isinstance(api, str) else "".join(api)
+    if "private" in api_name.lower() and method.upper() in ("POST", "PUT", "DELETE"):
+        return PRIORITY_POSITION
+    return _current_priority.get()
+
+
+class GovernedBinance(ccxt.binance):
+    """İstekleri merkezi ağırlık sınırlayıcısından geçiren senkron Binance istemcisi."""
+
+    def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        acquire(self.calculate_rate_limiter_cost(api, method, path, params, config), _request_priority(api, method))
+        return super().fetch2(path, api, method, params, headers, body, config)
+
+    def handle_errors(self, code, reason, url, method, headers, body, response, requestHeaders, requestBody):
+        record_response(code, headers)
+        return super().handle_errors(code, reason, url, method, headers, body, response, requestHeaders, requestBody)
+
+
+class AsyncGovernedBinance(ccxt_async.binance):
+    """İstekleri merkezi ağırlık sınırlayıcısından geçiren asenkron Binance istemcisi."""
+
+    async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        await acquire_async(self.calculate_rate_limiter_cost(api, method, path, params, config), _request_priority(api, method))
+        return await super().fetch2(path, api, method, params, headers, body, config)
+
+    def handle_errors(self, code, reason, url, method, headers, body, response, requestHeaders, requestBody):
+        record_response(code, headers)
+        return super().handle_errors(code, reason, url, method, headers, body, response, requestHeaders, requestBody)
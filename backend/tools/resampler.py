@@ -0,0 +1,86 @@
+# backend/tools/resampler.py
+# @author: Memba Co.
+# Bu modül, yerel mum deposundaki (candle_store) alt zaman dilimi mumlarından üst zaman
+# dilimi mumları üretir. Örneğin MTA analizindeki 4 saatlik trend mumları, giriş zaman
+# dilimi için zaten depoda tutulan 15 dakikalık mumlardan oluşturulur; böylece trend
+# göstergeleri için borsaya ikinci bir 'fetch_ohlcv' isteği gönderilmez.
+#
+# Kova (bucket) sınırları borsanın mum hizalamasıyla aynıdır ('utils.current_bar_open_ms'):
+# dakika/saat/gün mumları epoch'a, haftalık mumlar Pazartesiye, aylık mumlar ayın ilk
+# gününe hizalıdır. Sadece tüm alt mumları depoda bulunan (tamamlanmış) kovalar üretilir;
+# istenen geçmiş yerelde yoksa None döner ve çağıran taraf borsadan çeker.
+
+from . import candle_store
+from .utils import timeframe_to_ms, current_bar_open_ms, next_bar_open_ms, bars_are_contiguous
+
+# Kaynak olarak denenebilecek zaman dilimleri; daha az satır okumak için büyükten küçüğe.
+SOURCE_TIMEFRAMES = ("1d", "12h", "8h", "6h", "4h", "2h", "1h", "30m", "15m", "5m", "3m", "1m")
+DAY_MS = 86_400_000
+
+
+def is_enabled() -> bool:
+    from core import app_config
+    return app_config.settings.get('MTA_LOCAL_RESAMPLE_ENABLED', True)
+
+
+def _source_candidates(target_timeframe: str) -> list[str]:
+    """Kovaları tam olarak bölen, hedeften küçük kaynak zaman dilimlerini döndürür."""
+    # Aylık kovalar günlük ve daha küçük mumlardan oluşturulabilir.
+    target_ms = DAY_MS if target_timeframe.endswith('M') else timeframe_to_ms(target_timeframe)
+    return [tf for tf in SOURCE_TIMEFRAMES
+            if timeframe_to_ms(tf) < target_ms and target_ms % timeframe_to_ms(tf) == 0
+            or target_timeframe.endswith('M') and timeframe_to_ms(tf) == target_ms]
+
+
+def resample(bars: list, source_timeframe: str, target_timeframe: str) -> list:
+    """
+    Artan zaman sıralı alt zaman dilimi mumlarını üst zaman dilimi mumlarına dönüştürür.
+    Alt mumları eksik olan kovalar atlanır. [ts, open, high, low, close, volume] listesi döner.
+    """
+    source_ms = timeframe_to_ms(source_timeframe)
+    result, bucket, bucket_open, expected = [], None, None, 0
+    for ts, open_, high, low, close, volume in (b[:6] for b in bars):
+        ts = int(ts)
+        if bucket is None or ts >= bucket_open + expected * source_ms:
+            if bucket is not None and bucket[-1] == expected:
+                result.append(bucket[:6])
+            bucket_open = current_bar_open_ms(target_timeframe, ts)
+            expected = (next_bar_open_ms(target_timeframe, bucket_open) - bucket_open) // source_ms
+            # Son eleman kovaya eklenen alt mum sayısıdır.
+            bucket = [bucket_open, open_, high, low, close, volume, 1] if ts == bucket_open else None
+            continue
+        if bucket is not None and ts == bucket_open + bucket[-1] * source_ms:
+            bucket[2] = max(bucket[2], high)
+            bucket[3] = min(bucket[3], low)
+            bucket[4] = close
+            bucket[5] += volume
+            bucket[-1] += 1
+        else:
+            # Kovada boşluk var; bu kova tamamlanamaz.
+            bucket = None
+    if bucket is not None and bucket[-1] == expected:
+        result.append(bucket[:6])
+    return result
+
+
+def local_closed_bars(symbol: str, timeframe: str, limit: int, last_closed_open: int) -> list | None:
+    """
+    Hedef zaman diliminin 'last_closed_open' ile biten son 'limit' kapanmış mumunu depodaki
+    alt zaman dilimi mumlarından üretir. Yeterli ve kesintisiz yerel geçmiş yoksa None döner.
+    """
+    if not is_enabled() or limit <= 0:
+        return None
+    bucket_end = next_bar_open_ms(timeframe, last_closed_open)
+    longest_bar_ms = 31 * DAY_MS if timeframe.endswith('M') else timeframe_to_ms(timeframe)
+    since = current_bar_open_ms(timeframe, last_closed_open - (limit - 1) * longest_bar_ms)
+    for source_timeframe in _source_candidates(timeframe):
+        # Satırları okumadan önce deponun istenen aralığı kapsayıp kapsamadığı indeksten kontrol edilir.
+        first_ts = candle_store.get_first_timestamp(symbol, source_timeframe)
+        last_ts = candle_store.get_last_timestamp(symbol, source_timeframe)
+        if first_ts is None or first_ts > since or last_ts < bucket_end - timeframe_to_ms(source_timeframe):
+            continue
+        source_bars = candle_store.get_bars(symbol, source_timeframe, since=since, until=bucket_end - 1)
+        bars = resample(source_bars, source_timeframe, timeframe)[-limit:]
+        if len(bars) == limit and bars[-1][0] == last_closed_open and bars_are_contiguous(bars, timeframe):
+            return bars
+    return None
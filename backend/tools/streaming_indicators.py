@@ -0,0 +1,209 @@
+# backend/tools/streaming_indicators.py
+# @author: Memba Co.
+# Bu modül, RSI, ATR, ADX ve EMA göstergelerinin her yeni mumda sabit zamanda (O(1))
+# güncellenen artımlı (streaming) hesaplamalarını içerir. Formüller pandas_ta ile
+# birebir aynıdır: Wilder yumuşatması (rma), pandas'ın 'ewm(alpha=1/n, adjust=True,
+# min_periods=n)' hesabının artımlı karşılığıdır. Böylece 500 mumluk bir seri her
+# seferinde baştan hesaplanmak yerine sadece yeni kapanan mumlar işlenir.
+# Doğrulama için: 'python -m pytest tests/test_streaming_indicators.py'
+
+import math
+
+NAN = float("nan")
+
+
+def _isnan(value) -> bool:
+    return value is None or value != value
+
+
+class AdjustedEWM:
+    """
+    pandas 'ewm(alpha=..., adjust=True, min_periods=...).mean()' hesabının artımlı hali.
+    Eksik (NaN) değerlerde pandas'ın varsayılanı (ignore_na=False) gibi eski ağırlıklar
+    yine de sönümlenir, ancak gözlem sayılmaz.
+    """
+    __slots__ = ("decay", "min_periods", "num", "den", "count")
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.decay = 1.0 - alpha
+        self.min_periods = min_periods
+        self.num = 0.0
+        self.den = 0.0
+        self.count = 0
+
+    def update(self, value: float) -> float:
+        if _isnan(value):
+            self.num *= self.decay
+            self.den *= self.decay
+        else:
+            self.num = value + self.decay * self.num
+            self.den = 1.0 + self.decay * self.den
+            self.count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.count < max(self.min_periods, 1) or self.den == 0:
+            return NAN
+        return self.num / self.den
+
+
+def rma(length: int) -> AdjustedEWM:
+    """pandas_ta 'rma' (Wilder) yumuşatmasının artımlı karşılığı."""
+    return AdjustedEWM(alpha=1.0 / length, min_periods=length)
+
+
+class RecursiveEMA:
+    """
+    pandas 'ewm(span=n, adjust=False).mean()' hesabının artımlı hali. 'sma_seed' True ise
+    pandas_ta 'ema' gibi ilk 'n' değerin basit ortalaması başlangıç değeri olarak kullanılır.
+    """
+    __slots__ = ("length", "alpha", "sma_seed", "value", "_seed_sum", "_seen")
+
+    def __init__(self, length: int, sma_seed: bool = False):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.sma_seed = sma_seed
+        self.value = NAN
+        self._seed_sum = 0.0
+        self._seen = 0
+
+    def update(self, value: float) -> float:
+        if _isnan(value):
+            return self.value
+        self._seen += 1
+        if self.sma_seed and self._seen <= self.length:
+            self._seed_sum += value
+            if self._seen == self.length:
+                self.value = self._seed_sum / self.length
+            return self.value
+        self.value = value if _isnan(self.value) else self.alpha * value + (1.0 - self.alpha) * self.value
+        return self.value
+
+
+class StreamingRSI:
+    """pandas_ta 'rsi': 100 * rma(pozitif fark) / (rma(pozitif fark) + |rma(negatif fark)|)."""
+    __slots__ = ("_prev_close", "_gain", "_loss", "value")
+
+    def __init__(self, length: int = 14):
+        self._prev_close = None
+        self._gain = rma(length)
+        self._loss = rma(length)
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        if self._prev_close is None:
+            self._prev_close = close
+            return self.value
+        change = close - self._prev_close
+        self._prev_close = close
+        gain = self._gain.update(max(change, 0.0))
+        loss = self._loss.update(min(change, 0.0))
+        denominator = gain + abs(loss)
+        self.value = NAN if _isnan(gain) or _isnan(loss) or denominator == 0 else 100.0 * gain / denominator
+        return self.value
+
+
+def _true_range(high: float, low: float, prev_close: float | None) -> float:
+    if prev_close is None:
+        return NAN
+    return max(abs(high - low), abs(high - prev_close), abs(prev_close - low))
+
+
+class StreamingATR:
+    """pandas_ta 'atr' (mamode='rma'): gerçek aralığın (true range) Wilder ortalaması, fiyat biriminde."""
+    __slots__ = ("_prev_close", "_rma", "value")
+
+    def __init__(self, length: int = 14):
+        self._prev_close = None
+        self._rma = rma(length)
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.value = self._rma.update(_true_range(high, low, self._prev_close))
+        self._prev_close = close
+        return self.value
+
+
+class StreamingADX:
+    """
+    pandas_ta 'adx': +DM/-DM ve ATR'nin Wilder ortalamalarından DI+/DI- hesaplanır,
+    DX = 100 * |DI+ - DI-| / (DI+ + DI-), ADX = rma(DX).
+    """
+    __slots__ = ("_atr", "_pos", "_neg", "_dx", "_prev_high", "_prev_low", "value")
+
+    def __init__(self, length: int = 14):
+        self._atr = StreamingATR(length)
+        self._pos = rma(length)
+        self._neg = rma(length)
+        self._dx = rma(length)
+        self._prev_high = None
+        self._prev_low = None
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        atr = self._atr.update(high, low, close)
+        if self._prev_high is None:
+            pos = neg = NAN
+        else:
+            up = high - self._prev_high
+            down = self._prev_low - low
+            pos = up if (up > down and up > 0) else 0.0
+            neg = down if (down > up and down > 0) else 0.0
+        self._prev_high, self._prev_low = high, low
+
+        pos_avg = self._pos.update(pos)
+        neg_avg = self._neg.update(neg)
+        dx = NAN
+        if not (_isnan(atr) or _isnan(pos_avg) or _isnan(neg_avg)) and atr != 0:
+            dmp = 100.0 / atr * pos_avg
+            dmn = 100.0 / atr * neg_avg
+            if dmp + dmn != 0:
+                dx = 100.0 * abs(dmp - dmn) / (dmp + dmn)
+        self.value = self._dx.update(dx)
+        return self.value
+
+
+class IndicatorState:
+    """
+    Bir (sembol, zaman aralığı, parametreler) için gösterge motorunun kullandığı tüm
+    göstergelerin artımlı durumu. Mumlar sırayla ve sadece bir kez verilmelidir.
+    """
+
+    def __init__(self, params: tuple):
+        rsi_period, adx_period, atr_period, volume_avg_period = params
+        self.params = params
+        self.rsi = StreamingRSI(rsi_period)
+        self.adx = StreamingADX(adx_period)
+        self.atr = StreamingATR(atr_period)
+        self.volume_ema = RecursiveEMA(volume_avg_period)
+        self.last_bar = None
+        self.bar_count = 0
+
+    @property
+    def last_ts(self) -> int | None:
+        return int(self.last_bar[0]) if self.last_bar else None
+
+    def update(self, bar: list):
+        """Yeni bir kapanmış mumu [ts, open, high, low, close, volume] işler."""
+        _, _, high, low, close, volume = (float(v) for v in bar[:6])
+        self.rsi.update(close)
+        self.adx.update(high, low, close)
+        self.atr.update(high, low, close)
+        self.volume_ema.update(volume)
+        self.last_bar = bar
+        self.bar_count += 1
+
+    def snapshot(self) -> dict | None:
+        """Son mumdaki gösterge değerlerini döndürür; herhangi biri henüz hazır değilse None."""
+        values = {"RSI": self.rsi.value, "ADX": self.adx.value, "ATR": self.atr.value, "VOLUME_EMA": self.volume_ema.value}
+        if self.last_bar is None or any(_isnan(v) or math.isinf(v) for v in values.values()):
+            return None
+        close = float(self.last_bar[4])
+        values.update({
+            "ATR_PERCENT": values["ATR"] / close * 100 if close else 0.0,
+            "timestamp": self.last_ts,
+            "close": close,
+            "volume": float(self.last_bar[5]),
+        })
+        return values
@@ -0,0 +1,99 @@
+# backend/tools/symbol_registry.py
+# @author: Memba Co.
+# Bu modül, borsanın piyasa kataloğundan işlem yapılabilir USDT paritelerinin bir
+# dizinini oluşturur. Birleşik sembol ('BTC/USDT'), borsa kimliği ('BTCUSDT') ve baz
+# varlık ('BTC') üzerinden O(1) arama, listelenme/aktiflik kontrolü ve sembol başına
+# hassasiyet/limit bilgisi sağlar. Borsada bulunmayan semboller (örn. CoinGecko
+# trendlerinden gelen coinler) ağ isteği yapılmadan önce bu dizinle elenir.
+
+import logging
+
+# Dizin tek bir sözlük olarak tutulur ve katalog yenilendiğinde tek atamayla değiştirilir.
+_index: dict = {}
+
+
+def _entry(market: dict) -> dict:
+    limits = market.get('limits') or {}
+    precision = market.get('precision') or {}
+    return {
+        "unified": f"{market['base']}/{market['quote']}",
+        "id": market['id'],
+        "market_symbol": market['symbol'],
+        "base": market['base'],
+        "quote": market['quote'],
+        "active": market.get('active') is not False,
+        "price_precision": precision.get('price'),
+        "amount_precision": precision.get('amount'),
+        "min_amount": (limits.get('amount') or {}).get('min'),
+        "max_amount": (limits.get('amount') or {}).get('max'),
+        "min_notional": (limits.get('cost') or {}).get('min'),
+    }
+
+
+def rebuild(markets: dict, market_type: str, quote: str = "USDT"):
+    """Piyasa kataloğundan dizini yeniden oluşturur ve mevcut dizinin yerine koyar."""
+    futures = market_type.lower() == 'future'
+    by_unified, by_id, by_base = {}, {}, {}
+    for market in (markets or {}).values():
+        if market.get('quote') != quote:
+            continue
+        if futures and not (market.get('swap') and market.get('linear')):
+            continue
+        if not futures and not market.get('spot'):
+            continue
+        entry = _entry(market)
+        by_unified[entry["unified"]] = entry
+        by_id[entry["id"]] = entry
+        by_base[entry["base"]] = entry
+
+    global _index
+    _index = {"unified": by_unified, "id": by_id, "base": by_base}
+    logging.info(f"Sembol dizini oluşturuldu: {len(by_unified)} adet {quote} paritesi.")
+
+
+def is_ready() -> bool:
+    return bool(_index.get("unified"))
+
+
+def resolve(symbol_input: str) -> dict | None:
+    """'BTC', 'btcusdt', 'BTC/USDT' veya 'BTC/USDT:USDT' girdisine karşılık gelen kaydı döndürür."""
+    index = _index
+    if not index or not isinstance(symbol_input, str):
+        return None
+    key = symbol_input.upper().strip().split(':')[0]
+    return index["unified"].get(key) or index["id"].get(key.replace('/', '')) or index["base"].get(key)
+
+
+def is_listed(symbol_input: str) -> bool:
+    """
+    Sembol borsada listeli ve aktifse True döner. Dizin henüz oluşturulmamışsa
+    (katalog yüklenmeden önce) hiçbir sembol engellenmez.
+    """
+    if not is_ready():
+        return True
+    entry = resolve(symbol_input)
+    return bool(entry and entry["active"])
+
+
+def exchange_id(unified_symbol: str) -> str:
+    """Sembolün borsadaki kimliğini ('BTC/USDT' -> 'BTCUSDT') döndürür."""
+    entry = resolve(unified_symbol)
+    return entry["id"] if entry else unified_symbol.replace('/', '')
+
+
+def get_filters(symbol_input: str) -> dict | None:
+    """Sembolün fiyat/miktar hassasiyeti ve minimum miktar/nominal değer limitlerini döndürür."""
+    entry = resolve(symbol_input)
+    if not entry:
+        return None
+    return {key: entry[key] for key in ("price_precision", "amount_precision", "min_amount", "max_amount", "min_notional")}
+
+
+def listed_symbols() -> list[str]:
+    """Dizindeki aktif tüm paritelerin birleşik sembollerini döndürür."""
+    return [symbol for symbol, entry in (_index.get("unified") or {}).items() if entry["active"]]
+
+
+def filter_listed(symbols: list[str]) -> list[str]:
+    """Listeden borsada bulunmayan veya aktif olmayan sembolleri çıkarır."""
+    return [s for s in symbols if is_listed(s)]
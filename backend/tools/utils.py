@@ -1,6 +1,8 @@
 # tools/utils.py
 # @author: Memba Co.
 
+from datetime import datetime, timezone
+
 def str_to_bool(val: str) -> bool:
     """Metin bir değeri boolean'a çevirir."""
     val = str(val).lower()
@@ -44,3 +46,54 @@ def _parse_symbol_timeframe_input(input_str: str) -> tuple[str, str]:
             
     # Eşleşme bulunamazsa, tüm girdiyi sembol olarak kabul et ve varsayılan zaman aralığını kullan
     return _get_unified_symbol(s), '1h'
+
+_TIMEFRAME_UNIT_MS = {
+    'm': 60 * 1000,
+    'h': 60 * 60 * 1000,
+    'd': 24 * 60 * 60 * 1000,
+    'w': 7 * 24 * 60 * 60 * 1000,
+    'M': 30 * 24 * 60 * 60 * 1000,
+}
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """
+    '15m', '4h', '1d' gibi bir zaman aralığını milisaniye cinsinden süreye çevirir.
+    '1M' (ay) için yaklaşık 30 günlük bir süre döndürülür.
+    """
+    amount, unit = int(timeframe[:-1]), timeframe[-1]
+    if unit not in _TIMEFRAME_UNIT_MS:
+        raise ValueError(f"Geçersiz zaman aralığı: {timeframe}")
+    return amount * _TIMEFRAME_UNIT_MS[unit]
+
+def current_bar_open_ms(timeframe: str, now_ms: int) -> int:
+    """
+    Verilen an için henüz kapanmamış (oluşmakta olan) mumun açılış zamanını döndürür.
+    Binance mumları dakika/saat/gün için epoch'a, haftalık mumlar için Pazartesi 00:00 UTC'ye hizalıdır.
+    """
+    if timeframe.endswith('M'):
+        now = datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc)
+        return int(datetime(now.year, now.month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    tf_ms = timeframe_to_ms(timeframe)
+    if timeframe.endswith('w'):
+        # Unix epoch bir Perşembe gününe denk gelir; Pazartesi hizalaması için 3 günlük ofset uygulanır.
+        offset = 3 * _TIMEFRAME_UNIT_MS['d']
+        return ((now_ms + offset) // tf_ms) * tf_ms - offset
+    return (now_ms // tf_ms) * tf_ms
+
+def next_bar_open_ms(timeframe: str, bar_open_ms: int) -> int:
+    """Açılış zamanı verilen mumdan sonraki mumun açılış zamanını döndürür."""
+    if timeframe.endswith('M'):
+        # Aylık mumların uzunluğu sabit değildir; bir sonraki ayın ilk günü bulunur.
+        return current_bar_open_ms(timeframe, bar_open_ms + 32 * _TIMEFRAME_UNIT_MS['d'])
+    return bar_open_ms + timeframe_to_ms(timeframe)
+
+def bars_are_contiguous(bars: list, timeframe: str) -> bool:
+    """Artan sıralı mumlar arasında eksik mum olup olmadığını kontrol eder."""
+    return all(next_bar_open_ms(timeframe, prev[0]) == bar[0] for prev, bar in zip(bars, bars[1:]))
+
+def last_closed_bar_open_ms(timeframe: str, now_ms: int) -> int:
+    """Verilen an itibarıyla kapanmış son mumun açılış zamanını döndürür."""
+    current_open = current_bar_open_ms(timeframe, now_ms)
+    if timeframe.endswith('M'):
+        return current_bar_open_ms(timeframe, current_open - 1)
+    return current_open - timeframe_to_ms(timeframe)
@@ -336,6 +336,7 @@ export const DashboardPage = () => {
         fetchEvents, 
         runAnalysis, 
         runProactiveScan, 
+        subscribeScannerEvents,
         openPosition, 
         closePosition, 
         reanalyzePosition, 
@@ -414,6 +415,15 @@ export const DashboardPage = () => {
         }
     }, [isSettingsModalVisible, settings]);
 
+    // Proaktif taramada bulunan fırsatlar, tarama bitmeden geldikçe listeye eklenir.
+    const mergeOpportunities = useCallback((opportunities) => {
+        setProactiveOpportunities(prev => [...prev.filter(p => !opportunities.some(o => o.symbol === p.symbol)), ...opportunities]);
+    }, []);
+
+    useEffect(() => subscribeScannerEvents((event, data) => {
+        if (event === 'result' && data.type === 'opportunity') mergeOpportunities([data.data]);
+    }), [subscribeScannerEvents, mergeOpportunities]);
+
     useEffect(() => {
         setFilteredHistory(tradeHistory.filter(t => t.symbol.toLowerCase().includes(searchQuery.toLowerCase())));
     }, [searchQuery, tradeHistory]);
@@ -432,7 +442,7 @@ export const DashboardPage = () => {
 
     // Callback Handler'lar
     const handleAnalysis = useCallback(async ({ symbol, timeframe }) => { setIsAnalyzing(true); showToast(`${symbol} için analiz başlatıldı...`, 'info'); try { const result = await runAnalysis({ symbol, timeframe }); setAnalysisResult(result); } catch (err) { showToast(err.message, 'error'); } finally { setIsAnalyzing(false); } }, [runAnalysis, showToast]);
-    const handleRunScan = useCallback(async () => { setIsScanning(true); showToast('Proaktif tarama tetiklendi...', 'info'); try { const result = await runProactiveScan(); const opportunities = result.details?.filter(d => d.type === 'opportunity').map(d => d.data) || []; if (opportunities.length > 0) { setProactiveOpportunities(opportunities); showToast(`${opportunities.length} yeni fırsat bulundu!`, 'success'); } else { showToast('Tarama tamamlandı, yeni fırsat bulunamadı.', 'info'); } await loadDynamicData(); } catch (err) { showToast(err.message, 'error'); } finally { setIsScanning(false); } }, [runProactiveScan, showToast, loadDynamicData]);
+    const handleRunScan = useCallback(async () => { setIsScanning(true); showToast('Proaktif tarama tetiklendi...', 'info'); try { const result = await runProactiveScan(); const opportunities = result.details?.filter(d => d.type === 'opportunity').map(d => d.data) || []; if (opportunities.length > 0) { mergeOpportunities(opportunities); showToast(`${opportunities.length} yeni fırsat bulundu!`, 'success'); } else { showToast('Tarama tamamlandı, yeni fırsat bulunamadı.', 'info'); } await loadDynamicData(); } catch (err) { showToast(err.message, 'error'); } finally { setIsScanning(false); } }, [runProactiveScan, showToast, loadDynamicData, mergeOpportunities]);
     const handleConfirmTrade = useCallback(async (tradeData) => { setOpeningTradeSymbol(tradeData.symbol); try { await openPosition({ symbol: tradeData.symbol, recommendation: tradeData.recommendation, timeframe: tradeData.timeframe, price: tradeData.data.price, reason: tradeData.reason, }); showToast('Pozisyon başarıyla açıldı!', 'success'); setAnalysisResult(null); setProactiveOpportunities(prev => prev.filter(p => p.symbol !== tradeData.symbol)); await loadDynamicData(); } catch (err) { showToast(err.message, 'error'); } finally { setOpeningTradeSymbol(null); } }, [openPosition, showToast, loadDynamicData]);
     const handleAttemptClosePosition = (symbol) => setConfirmationDetails({ title: 'Pozisyonu Kapat', message: `${symbol} pozisyonunu manuel olarak kapatmak istediğinizden emin misiniz?`, onConfirm: () => handleClosePosition(symbol) });
     const handleClosePosition = useCallback(async (symbol) => { showToast(`${symbol} kapatılıyor...`, 'info'); try { await closePosition(symbol); showToast(`${symbol} başarıyla kapatıldı.`, 'success'); await loadDynamicData(); } catch (err) { showToast(err.message, 'error'); } finally { setConfirmationDetails(null); } }, [closePosition, showToast, loadDynamicData]);
@@ -95,6 +95,52 @@ export const AuthProvider = ({ children }) => {
     const runInteractiveScan = useCallback(() => apiFetch('/scanner/run-interactive-scan', { method: 'POST' }), [apiFetch]);
     const runProactiveScan = useCallback(() => apiFetch('/scanner/run-proactive-scan', { method: 'POST' }), [apiFetch]);
     const fetchScannerCandidates = useCallback(() => apiFetch('/scanner/candidates'), [apiFetch]);
+    // Proaktif tarama olaylarını (SSE) dinler. EventSource yetkilendirme başlığı gönderemediği için
+    // akış fetch ile okunur. Akış biter veya hata verirse artan beklemeyle (1 sn'den 30 sn'ye kadar)
+    // yeniden bağlanılır. Dinlemeyi durduran bir fonksiyon döndürür.
+    const subscribeScannerEvents = useCallback((onEvent) => {
+        const controller = new AbortController();
+        let retryDelay = 1000;
+        const listen = async () => {
+            const currentToken = localStorage.getItem('authToken');
+            const response = await fetch(`${API_URL}/scanner/stream`, { headers: { 'Authorization': `Bearer ${currentToken}` }, signal: controller.signal });
+            if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+            const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+            let buffer = '';
+            for (;;) {
+                const { value, done } = await reader.read();
+                if (done) return;
+                // Veri alınan bir bağlantı koparsa bekleme süresi başa döner.
+                retryDelay = 1000;
+                buffer += value;
+                const messages = buffer.split('\n\n');
+                buffer = messages.pop();
+                for (const message of messages) {
+                    const eventLine = message.split('\n').find(line => line.startsWith('event: '));
+                    const dataLine = message.split('\n').find(line => line.startsWith('data: '));
+                    if (eventLine && dataLine) onEvent(eventLine.slice(7), JSON.parse(dataLine.slice(6)));
+                }
+            }
+        };
+        const waitBeforeRetry = (ms) => new Promise(resolve => {
+            const timer = setTimeout(resolve, ms);
+            controller.signal.addEventListener('abort', () => { clearTimeout(timer); resolve(); }, { once: true });
+        });
+        const run = async () => {
+            while (!controller.signal.aborted) {
+                try {
+                    await listen();
+                } catch (err) {
+                    if (err.name === 'AbortError') return;
+                    console.error('Tarama olay akışı kesildi, yeniden bağlanılacak:', err);
+                }
+                await waitBeforeRetry(retryDelay);
+                retryDelay = Math.min(retryDelay * 2, 30000);
+            }
+        };
+        run();
+        return () => controller.abort();
+    }, []);
     const refreshScannerCandidate = useCallback((symbol) => apiFetch(`/scanner/candidates/${encodeURIComponent(symbol)}/refresh`, { method: 'POST' }), [apiFetch]);
 
     // YENİ: Oturum açıldığında ayarları yükle
@@ -114,7 +160,7 @@ export const AuthProvider = ({ children }) => {
         closePosition, refreshPnl, reanalyzePosition, fetchEvents,
         closeAllPositions, closeProfitablePositions, closeLosingPositions, reanalyzeAllPositions,
         runBacktest, fetchChartData, fetchPresets, savePreset, deletePreset,
-        runInteractiveScan, runProactiveScan, fetchScannerCandidates, refreshScannerCandidate,
+        runInteractiveScan, runProactiveScan, fetchScannerCandidates, refreshScannerCandidate, subscribeScannerEvents,
     };
 
     return (